@@ -61,10 +61,200 @@ class GUIConfig(BaseModel):
     host: str = Field(default="localhost", description="GUIのホスト名")
 
 
-class UARTConfig(BaseModel):
+class UARTPublishFieldConfig(BaseModel):
+    model_config = {"extra": "forbid"}
+
+    deadband_abs: float = Field(
+        default=0.0, ge=0, description="この値以下の変化は配信しない（絶対値）"
+    )
+    deadband_rel: float = Field(
+        default=0.0, ge=0, description="前回値に対するこの割合以下の変化は配信しない"
+    )
+    max_rate_hz: float | None = Field(
+        default=None, gt=0, description="配信の最大レート[Hz]（未指定で制限なし）"
+    )
+
+
+class UARTPublishQosConfig(BaseModel):
+    model_config = {"extra": "forbid"}
+
+    priority: Literal[
+        "real_time",
+        "interactive_high",
+        "interactive_low",
+        "data_high",
+        "data",
+        "data_low",
+        "background",
+    ] = Field(default="data", description="配信の優先度")
+    congestion_control: Literal["drop", "block"] = Field(
+        default="drop", description="輻輳時に破棄するか、送信できるまで待つか"
+    )
+    express: bool = Field(default=False, description="バッチングせずに即座に送信する")
+
+
+class UARTZenohConfig(BaseModel):
+    model_config = {"extra": "forbid"}
+
+    mode: Literal["peer", "client", "router"] = Field(
+        default="peer", description="セッションのモード"
+    )
+    connect: list[str] = Field(
+        default_factory=list, description="接続先のエンドポイント"
+    )
+    listen: list[str] = Field(
+        default_factory=list, description="待ち受けるエンドポイント"
+    )
+    multicast_scouting: bool | None = Field(
+        default=None,
+        description="マルチキャストによる探索（未指定なら connect が空のときだけ有効）",
+    )
+
+
+class UARTSchedulingConfig(BaseModel):
+    model_config = {"extra": "forbid"}
+
+    cpu_affinity: list[int] = Field(
+        default_factory=list, description="実行する CPU の番号（空なら指定しない）"
+    )
+    sched_fifo_priority: int | None = Field(
+        default=None, ge=1, le=99, description="SCHED_FIFO の優先度（未指定なら通常）"
+    )
+    nice: int | None = Field(
+        default=None, ge=-20, le=19, description="nice 値（未指定なら変更しない）"
+    )
+
+
+class UARTTargetPredictionConfig(BaseModel):
+    model_config = {"extra": "forbid"}
+
+    enabled: bool = Field(default=False, description="照準の予測を行う")
+    alpha: float = Field(
+        default=0.85, gt=0, le=1, description="α-β フィルタの位置の補正の割合"
+    )
+    beta: float = Field(
+        default=0.3, ge=0, le=2, description="α-β フィルタの速度の補正の割合"
+    )
+    lead_ms: float = Field(
+        default=0.0, ge=0, description="送信時刻より先まで外挿する時間[ms]"
+    )
+    max_horizon_ms: float = Field(
+        default=100.0, ge=0, description="最後の認識結果から外挿する時間の上限[ms]"
+    )
+    max_jump_px: float = Field(
+        default=100.0, gt=0, description="この距離[px]以上跳んだら外挿をやり直す"
+    )
+
+
+class UARTLogConfig(BaseModel):
+    model_config = {"extra": "forbid"}
+
+    level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = Field(
+        default="INFO", description="出力するログのレベル"
+    )
+    format: Literal["text", "json"] = Field(
+        default="text", description="出力形式（json は1行1オブジェクト）"
+    )
+    rate_limit_per_sec: float = Field(
+        default=1.0,
+        ge=0,
+        description="同じメッセージを出力する上限[件/秒]（0で無制限）",
+    )
+    rate_limit_burst: int = Field(
+        default=5, ge=1, description="同じメッセージを続けて出力できる件数"
+    )
+    frame_history: int = Field(
+        default=64, ge=0, description="エラー時に書き出す直前の送受信フレーム数"
+    )
+
+
+class UARTDevice(BaseModel):
     model_config = {"extra": "forbid"}
 
     device: str = Field(..., description="UARTのデバイスパス")
+    codec: Literal["csv", "binary"] | None = Field(
+        default=None, description="通信フォーマット（未指定なら [uart] の codec）"
+    )
+    prefix: str | None = Field(
+        default=None, description="キーのプレフィックス（未指定ならデバイス名）"
+    )
+
+
+class UARTConfig(BaseModel):
+    model_config = {"extra": "forbid"}
+
+    device: str | None = Field(default=None, description="UARTのデバイスパス")
+    codec: Literal["csv", "binary"] = Field(
+        default="csv", description="マイコンとの通信フォーマット"
+    )
+    tx_mode: Literal["on_change", "periodic"] = Field(
+        default="on_change", description="コマンドの送信モード"
+    )
+    tx_rate_hz: float = Field(
+        default=100.0, gt=0, description="コマンドの周期送信のレート[Hz]"
+    )
+    tx_min_interval_ms: float = Field(
+        default=5.0, ge=0, description="変化時に送信する最小間隔[ms]"
+    )
+    tx_overrun: Literal["skip", "catch_up"] = Field(
+        default="skip", description="周期送信が1周期以上遅れた場合の動作"
+    )
+    scheduling: UARTSchedulingConfig = Field(
+        default_factory=UARTSchedulingConfig,
+        description="シリアル通信のスレッドの CPU とスケジューリングの設定",
+    )
+    target_prediction: UARTTargetPredictionConfig = Field(
+        default_factory=UARTTargetPredictionConfig,
+        description="送信のたびに照準の位置を外挿する予測の設定",
+    )
+    runtime: Literal["thread", "asyncio"] = Field(
+        default="thread", description="実行方式（スレッド or asyncio）"
+    )
+    log: UARTLogConfig = Field(
+        default_factory=UARTLogConfig, description="ログの出力の設定"
+    )
+    reconnect_max_interval_ms: float = Field(
+        default=1000.0, gt=0, description="切断時に再接続を試みる間隔の上限[ms]"
+    )
+    serial_process: bool = Field(
+        default=False, description="シリアル通信を子プロセスで行う"
+    )
+    command_timeout_ms: float = Field(
+        default=0.0,
+        ge=0,
+        description="入力が届かない場合にコマンドを既定値に戻すまでの時間[ms]（0で無効）",
+    )
+    publish_per_field: bool = Field(
+        default=True, description="robot/state/<key> へのフィールドごとの配信"
+    )
+    publish_keyframe_interval_ms: float = Field(
+        default=1000.0, ge=0, description="全フィールドを再配信する間隔[ms]（0で無効）"
+    )
+    history_size: int = Field(
+        default=0, ge=0, description="robot/history で返す状態の履歴の件数（0で無効）"
+    )
+    publish_fields: dict[str, UARTPublishFieldConfig] = Field(
+        default_factory=dict, description="フィールドごとの配信ポリシー"
+    )
+    publish_qos: dict[str, UARTPublishQosConfig] | None = Field(
+        default=None, description="キーごとの配信の QoS（既定の QoS に上書きする）"
+    )
+    zenoh: UARTZenohConfig | None = Field(
+        default=None, description="Zenoh のセッションの設定"
+    )
+    record_path: str | None = Field(
+        default=None,
+        description="送受信したバイト列を記録するファイルのパス（strftime 形式）",
+    )
+    devices: dict[str, UARTDevice] = Field(
+        default_factory=dict, description="追加のUARTデバイスの一覧"
+    )
+
+    @model_validator(mode="after")
+    def require_device(self) -> Self:
+        if self.device is None and not self.devices:
+            raise ValueError("UART requires a device or devices.")
+        return self
 
 
 class Config(BaseModel):
@@ -20,6 +20,28 @@ def test_read_sample(get_resource_path: Path) -> None:
     assert config.gui.host == "localhost"
     assert config.uart is not None
     assert config.uart.device == "/dev/ttyUSB0"
+    assert config.uart.codec == "csv"
+    assert config.uart.tx_mode == "on_change"
+    assert config.uart.tx_rate_hz == 100.0
+    assert config.uart.tx_overrun == "skip"
+    assert config.uart.scheduling.cpu_affinity == [2]
+    assert config.uart.scheduling.sched_fifo_priority == 50
+    assert config.uart.target_prediction.enabled
+    assert config.uart.target_prediction.lead_ms == 50.0
+    assert config.uart.log.format == "json"
+    assert config.uart.log.frame_history == 64
+    assert config.uart.reconnect_max_interval_ms == 2000.0
+    assert config.uart.serial_process
+    assert config.uart.history_size == 6000
+    assert config.uart.publish_fields["pitch_deg"].deadband_abs == 0.1
+    assert config.uart.command_timeout_ms == 500
+    assert config.uart.publish_qos is not None
+    assert config.uart.publish_qos["robot/state/state_id"].express
+    assert config.uart.zenoh is not None
+    assert config.uart.zenoh.connect == ["tcp/127.0.0.1:7447"]
+    assert config.uart.record_path == "/var/log/roboapp/uart-%Y%m%d-%H%M%S.ublog"
+    assert config.uart.devices["turret"].device == "/dev/ttyACM0"
+    assert config.uart.devices["turret"].codec == "binary"
     assert config.camera is not None
     assert not config.camera.zenoh
     assert config.camera.websocket
@@ -90,6 +112,13 @@ def test_read_uart_config(get_resource_path: Path) -> None:
     assert config.uart.device == "/tmp/roboapp_test_uart"
 
 
+def test_uart_config_no_device(get_resource_path: Path) -> None:
+    config_file = get_resource_path / "uart_no_device.toml"
+    with open(config_file, "rb") as f:
+        with pytest.raises(ValidationError):
+            Config.model_validate(tomllib.load(f))
+
+
 def test_camera_config_no_dev(get_resource_path: Path) -> None:
     config_file = get_resource_path / "camera_config_no_dev.toml"
     with open(config_file, "rb") as f:
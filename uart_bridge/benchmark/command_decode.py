@@ -0,0 +1,161 @@
+"""コマンド入力（damagepanel, lidar/force_vector）の1メッセージの処理時間を計測する
+
+`ZenohTransmitter` の入力元にエンコーディングごとのサンプルを直接渡し、
+以下を計測する。
+
+- callback: zenoh の配送スレッドを占有する時間（コールバック）
+- total: コールバックと、メインループでのデコード・コマンドの生成（`subscribe()`）
+
+比較のため、以前のコールバック内で `model_validate_json(payload.to_string())` して
+コマンドを書き換える方式も計測する（コールバックで全て処理するので callback = total）。
+値が毎回変化するよう、2つのサンプルを交互に渡す。
+
+    uv run python3 benchmark/command_decode.py --count 100000
+"""
+
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from itertools import cycle
+from typing import Callable
+
+import zenoh
+
+from uart_bridge.domain.config import ZenohSessionConfig
+from uart_bridge.domain.messages import (
+    DamagePanelRecognition,
+    LiDARMessage,
+    RobotCommand,
+)
+from uart_bridge.infra.command_intake import CommandSource
+from uart_bridge.infra.command_payload import (
+    MSGPACK_ENCODING,
+    STRUCT_ENCODING,
+    encode_damagepanel,
+    encode_force_vector,
+)
+from uart_bridge.infra.zenoh_transmitter import ZenohTransmitter
+
+ENCODINGS = {
+    "json": zenoh.Encoding.APPLICATION_JSON,
+    "msgpack": MSGPACK_ENCODING,
+    "struct": STRUCT_ENCODING,
+}
+
+
+@dataclass
+class FakeSample:
+    """デコードで参照する属性だけを持つサンプル"""
+
+    payload: zenoh.ZBytes
+    encoding: zenoh.Encoding
+
+
+def measure(func: Callable[[], object], count: int) -> float:
+    """1回あたりの処理時間[µs]を返す"""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def legacy_damagepanel(command: RobotCommand, sample: FakeSample) -> None:
+    """以前の実装と同じコールバック"""
+    d = DamagePanelRecognition.model_validate_json(sample.payload.to_string())
+    command.target_x = d.target_x
+    command.target_y = d.target_y
+    command.target_distance = d.target_distance
+
+
+def legacy_lidar(command: RobotCommand, sample: FakeSample) -> None:
+    """以前の実装と同じコールバック"""
+    m = LiDARMessage.model_validate_json(sample.payload.to_string())
+    command.force_linear = int(m.linear)
+    command.force_angular = int(m.angular * 10)
+
+
+def measure_source(
+    transmitter: ZenohTransmitter,
+    source: CommandSource[object],
+    samples: list[FakeSample],
+    count: int,
+) -> dict[str, float]:
+    """入力元にサンプルを1つ渡すごとの処理時間を計測する"""
+    it = cycle(samples)
+    callback = measure(lambda: source.on_sample(next(it)), count)  # type: ignore[arg-type]
+    source.poll(time.monotonic())  # 溜まったサンプルを捨てる
+
+    def receive_and_subscribe() -> None:
+        source.on_sample(next(it))  # type: ignore[arg-type]
+        transmitter.subscribe()
+
+    return {"callback": callback, "total": measure(receive_and_subscribe, count)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100000, help="計測回数")
+    parser.add_argument("--json", action="store_true", help="JSONで出力する")
+    args = parser.parse_args()
+
+    transmitter = ZenohTransmitter(
+        per_field=False, session_config=ZenohSessionConfig(multicast_scouting=False)
+    )
+    damagepanel = DamagePanelRecognition(
+        target_x=640, target_y=360, target_distance=120
+    )
+    lidar = LiDARMessage(linear=12.5, angular=-0.25)
+    command = RobotCommand()
+
+    results: dict[str, dict[str, dict[str, float]]] = {
+        "damagepanel": {},
+        "force_vector": {},
+    }
+    encoding = ENCODINGS["json"]
+    sample = FakeSample(
+        zenoh.ZBytes(encode_damagepanel(damagepanel, encoding)), encoding
+    )
+    legacy = measure(lambda: legacy_damagepanel(command, sample), args.count)
+    results["damagepanel"]["legacy"] = {"callback": legacy, "total": legacy}
+    sample = FakeSample(zenoh.ZBytes(encode_force_vector(lidar, encoding)), encoding)
+    legacy = measure(lambda: legacy_lidar(command, sample), args.count)
+    results["force_vector"]["legacy"] = {"callback": legacy, "total": legacy}
+
+    damagepanels = [damagepanel, damagepanel.model_copy(update={"target_x": 320})]
+    lidars = [lidar, lidar.model_copy(update={"linear": -12.5})]
+    for name, encoding in ENCODINGS.items():
+        results["damagepanel"][name] = measure_source(
+            transmitter,
+            transmitter.damagepanel,  # type: ignore[arg-type]
+            [
+                FakeSample(zenoh.ZBytes(encode_damagepanel(d, encoding)), encoding)
+                for d in damagepanels
+            ],
+            args.count,
+        )
+        results["force_vector"][name] = measure_source(
+            transmitter,
+            transmitter.force_vector,  # type: ignore[arg-type]
+            [
+                FakeSample(zenoh.ZBytes(encode_force_vector(m, encoding)), encoding)
+                for m in lidars
+            ],
+            args.count,
+        )
+    transmitter.close()
+
+    if args.json:
+        print(json.dumps(results))
+        return
+    for key, values in results.items():
+        print(key)
+        for name, usec in values.items():
+            print(
+                f"  {name:8s}: callback {usec['callback']:.2f} us/msg,"
+                f" total {usec['total']:.2f} us/msg"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""受信から状態反映までのレイテンシを計測する
+
+疑似端末(pty)にマイコンのふりをして状態を書き込み、
+`SerialRobotDriver.get_robot_state()` に反映されるまでの時間を計測する。
+比較のため、以前の readline(timeout=10ms) + sleep(10ms) 方式も同条件で計測する。
+selector+stats は `BridgeStats` による区間ごとの計測を有効にした場合で、
+計測自体のオーバーヘッドの確認に使う。
+
+    uv run python3 benchmark/rx_latency.py --rate 100 --count 500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+import tty
+from typing import Callable
+
+import serial
+
+from uart_bridge.infra.serial_robot_driver import SerialRobotDriver
+from uart_bridge.infra.stats import BridgeStats
+
+
+class LegacyPollingReader:
+    """以前の実装と同じ readline + sleep による受信ループ"""
+
+    def __init__(self, port: str) -> None:
+        self._serial = serial.Serial(port=port, timeout=0.01)
+        self.reserved = -1
+        self._is_closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._is_closed:
+            line = self._serial.readline()
+            if line.endswith(b"\n"):
+                self.reserved = int(line.decode("ascii").strip().split(",")[7])
+            self._serial.write(b"640,360,0,0,0,0\n")
+            time.sleep(0.01)
+
+    def close(self) -> None:
+        self._is_closed = True
+        self._thread.join()
+        self._serial.close()
+
+
+def _drain(fd: int, stop: threading.Event) -> None:
+    """ドライバが送信したコマンドを読み捨てる"""
+    while not stop.is_set():
+        try:
+            os.read(fd, 4096)
+        except OSError:
+            return
+
+
+def measure(
+    master: int, get_reserved: Callable[[], int], rate: float, count: int
+) -> list[float]:
+    """状態を書き込み、反映されるまでの時間[秒]のリストを返す"""
+    latencies: list[float] = []
+    period = 1.0 / rate
+    next_time = time.monotonic()
+
+    for i in range(count):
+        next_time += period
+        while time.monotonic() < next_time:
+            time.sleep(0.0005)
+
+        os.write(master, f"2,0,0,0,0,0,0,{i}\n".encode("ascii"))
+        start = time.perf_counter()
+        deadline = start + 0.1
+        while get_reserved() != i:
+            if time.perf_counter() > deadline:
+                break
+            # 計測側がGILを握り続けないよう細かく手放す
+            time.sleep(0.0001)
+        else:
+            latencies.append(time.perf_counter() - start)
+
+    return latencies
+
+
+def summarize(name: str, latencies: list[float], count: int) -> dict[str, object]:
+    ms = sorted(v * 1000 for v in latencies)
+    if not ms:
+        return {"name": name, "received": 0, "count": count}
+    return {
+        "name": name,
+        "received": len(ms),
+        "count": count,
+        "p50_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(ms[int(len(ms) * 0.95) - 1], 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=float, default=100.0, help="送信レート[Hz]")
+    parser.add_argument("--count", type=int, default=300, help="送信回数")
+    parser.add_argument("--json", action="store_true", help="JSONで出力する")
+    args = parser.parse_args()
+
+    results = []
+    for name in ("legacy", "selector", "selector+stats"):
+        master, slave = os.openpty()
+        tty.setraw(master)
+        stop = threading.Event()
+        drainer = threading.Thread(target=_drain, args=(master, stop), daemon=True)
+        drainer.start()
+
+        if name == "legacy":
+            legacy = LegacyPollingReader(os.ttyname(slave))
+            latencies = measure(master, lambda: legacy.reserved, args.rate, args.count)
+            legacy.close()
+        else:
+            stats = BridgeStats() if name == "selector+stats" else None
+            with SerialRobotDriver(os.ttyname(slave), stats=stats) as driver:
+                latencies = measure(
+                    master,
+                    lambda: driver.get_state_snapshot().reserved,
+                    args.rate,
+                    args.count,
+                )
+
+        stop.set()
+        os.close(slave)
+        os.close(master)
+        drainer.join()
+        results.append(summarize(name, latencies, args.count))
+
+    if args.json:
+        print(json.dumps(results))
+    else:
+        for r in results:
+            print(r)
+
+
+if __name__ == "__main__":
+    main()
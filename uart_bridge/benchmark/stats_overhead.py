@@ -0,0 +1,72 @@
+"""レイテンシの計測（`BridgeStats`）自体のオーバーヘッドを計測する
+
+受信・配信・コマンドの取り込み・送信の各経路で1メッセージごとに追加される
+処理（`time.monotonic()` とヒストグラムへの記録）を同じ順序で呼び出し、
+1メッセージあたりの時間を計測する。比較のため、CSV の1フレームの
+デコードにかかる時間も計測する。
+
+    uv run python3 benchmark/stats_overhead.py --count 200000
+"""
+
+import argparse
+import json
+import time
+from time import monotonic
+from typing import Callable
+
+from uart_bridge.infra.codec import CsvCodec
+from uart_bridge.infra.stats import BridgeStats
+
+
+def measure(func: Callable[[], object], count: int) -> float:
+    """1回あたりの処理時間[µs]を返す"""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=200000, help="計測回数")
+    parser.add_argument("--json", action="store_true", help="JSONで出力する")
+    args = parser.parse_args()
+
+    stats = BridgeStats()
+
+    def rx_path() -> None:
+        # SerialRobotDriver._receive と ZenohTransmitter.publish で追加される処理
+        received_at = monotonic()
+        stats.record("rx_parse", received_at, monotonic())
+        stats.mark_state_received(received_at)
+        stats.record("rx_swap", received_at, monotonic())
+        stats.record_publish(monotonic())
+
+    def tx_path() -> None:
+        # ZenohTransmitter.subscribe と SerialRobotDriver._transmit で追加される処理
+        now = monotonic()
+        stats.record("cmd_intake", now, monotonic())
+        stats.mark_command_received(now)
+        sent_at = monotonic()
+        stats.record("tx_write", now, sent_at)
+        stats.record_command_sent(sent_at)
+
+    codec = CsvCodec()
+    frame = b"2,100,2000,1,2,0,1,5\n"
+
+    results = {
+        "rx_path_us": measure(rx_path, args.count),
+        "tx_path_us": measure(tx_path, args.count),
+        "summary_us": measure(stats.summary, args.count // 100),
+        "csv_decode_us": measure(lambda: codec.feed(frame), args.count),
+    }
+
+    if args.json:
+        print(json.dumps(results))
+        return
+    for name, usec in results.items():
+        print(f"{name:14s}: {usec:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
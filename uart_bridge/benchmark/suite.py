@@ -0,0 +1,356 @@
+"""uart_bridge の処理経路のベンチマークをまとめて実行し、コミット間で比較する
+
+以下を計測し、結果をコミットや実行環境の情報と一緒に JSON で保存する。
+値はすべて小さいほど良く、`--compare` で保存した結果と比べて
+`--threshold` を超えて遅くなったケースがあれば終了コード 1 で終わる。
+
+- parse.*: 受信したバイト列から状態をデコードする1フレームあたりの時間[µs]
+- encode.*: RobotCommand を送信するバイト列にする時間[µs]
+- publish.*: `ZenohTransmitter.publish` の1回あたりの時間[µs]
+  （changed: 1フィールドだけ変化, force: 全フィールドを再配信, unchanged: 変化なし）
+- command.*: damagepanel の受信コールバックと `subscribe()` の1メッセージの時間[µs]
+- loop.latency: 疑似端末に状態を書き込んでから、別の Zenoh セッションで
+  `robot/state` を受信するまでの時間[µs]（p50 を比較に使う）
+
+    uv run task bench --output before.json
+    uv run task bench --compare before.json
+"""
+
+import argparse
+import gc
+import importlib.metadata
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tty
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from itertools import cycle
+from typing import Any
+
+import zenoh
+
+from uart_bridge.application.application import Application
+from uart_bridge.domain.config import ZenohSessionConfig
+from uart_bridge.domain.messages import (
+    DamagePanelRecognition,
+    RobotCommand,
+    RobotStateSnapshot,
+)
+from uart_bridge.infra.codec import BinaryCodec, CsvCodec, RobotCodec
+from uart_bridge.infra.command_payload import (
+    MSGPACK_ENCODING,
+    STRUCT_ENCODING,
+    encode_damagepanel,
+)
+from uart_bridge.infra.serial_robot_driver import SerialRobotDriver
+from uart_bridge.infra.state_payload import unpack_state
+from uart_bridge.infra.zenoh_transmitter import ZenohTransmitter
+
+PREFIX = "benchmark_suite"
+
+Result = dict[str, Any]
+
+
+@dataclass
+class FakeSample:
+    """デコードで参照する属性だけを持つサンプル"""
+
+    payload: zenoh.ZBytes
+    encoding: zenoh.Encoding
+
+
+def measure(func: Callable[[], object], count: int, rounds: int) -> Result:
+    """`func` を count 回呼ぶのを rounds 回繰り返し、1回あたりの時間[µs]を返す
+
+    timeit と同様に GC を止めて計測し、他の処理の影響が最も少ない
+    最速の回の値を比較に使う。
+    """
+    func()  # 初回だけのコストを除く
+    per_call = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(count):
+                func()
+            per_call.append((time.perf_counter() - start) / count * 1e6)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {
+        "unit": "us",
+        "value": min(per_call),
+        "median": statistics.median(per_call),
+        "rounds": rounds,
+        "count": count,
+    }
+
+
+def make_states(n: int) -> list[RobotStateSnapshot]:
+    """ピッチ角だけが変化する状態の列を作る"""
+    return [
+        RobotStateSnapshot(state_id=2, pitch_deg=float(i % 300), reserved=i & 0xFF)
+        for i in range(n)
+    ]
+
+
+def bench_parse(codec: RobotCodec, count: int, rounds: int) -> Result:
+    frames = 100
+    chunk = b"".join(
+        codec.pack_state(state, seq) for seq, state in enumerate(make_states(frames))
+    )
+    result = measure(lambda: codec.feed(chunk), max(count // frames, 1), rounds)
+    # 1フレームあたりに直す
+    result["value"] /= frames
+    result["median"] /= frames
+    assert codec.corrupt_frames == 0
+    return result
+
+
+def bench_encode(codec: RobotCodec, count: int, rounds: int) -> Result:
+    command = RobotCommand(target_x=640, target_y=360, target_distance=120)
+    return measure(lambda: codec.encode(command), count, rounds)
+
+
+def create_transmitter(per_field: bool = True) -> ZenohTransmitter:
+    """他のプロセスとつながらない Zenoh の送受信クラスを作る"""
+    return ZenohTransmitter(
+        prefix=PREFIX,
+        per_field=per_field,
+        session_config=ZenohSessionConfig(multicast_scouting=False),
+    )
+
+
+def bench_publish(mode: str, count: int, rounds: int) -> Result:
+    with create_transmitter() as transmitter:
+        states = cycle(make_states(2))
+        if mode == "changed":
+            return measure(lambda: transmitter.publish(next(states)), count, rounds)
+        state = next(states)
+        force = mode == "force"
+        return measure(lambda: transmitter.publish(state, force), count, rounds)
+
+
+def bench_command(encoding: zenoh.Encoding, count: int, rounds: int) -> Result:
+    with create_transmitter(per_field=False) as transmitter:
+        samples = cycle(
+            FakeSample(zenoh.ZBytes(encode_damagepanel(d, encoding)), encoding)
+            for d in (
+                DamagePanelRecognition(target_x=640, target_y=360, target_distance=1),
+                DamagePanelRecognition(target_x=320, target_y=360, target_distance=1),
+            )
+        )
+        source = transmitter.damagepanel
+
+        def receive_and_subscribe() -> None:
+            source.on_sample(next(samples))  # type: ignore[arg-type]
+            transmitter.subscribe()
+
+        return measure(receive_and_subscribe, count, rounds)
+
+
+def _drain(fd: int, stop: threading.Event) -> None:
+    """ドライバが送信したコマンドを読み捨てる"""
+    while not stop.is_set():
+        try:
+            os.read(fd, 4096)
+        except OSError:
+            return
+
+
+def bench_loop(count: int, rate: float = 200.0) -> Result:
+    """疑似端末 → ドライバ → Application → Zenoh → 購読側 のレイテンシ"""
+    written: dict[int, float] = {}
+    latencies: list[float] = []
+
+    def on_state(sample: zenoh.Sample) -> None:
+        state, _, _ = unpack_state(sample.payload.to_bytes())
+        sent_at = written.pop(state.reserved, None)
+        if sent_at is not None:
+            latencies.append(time.monotonic() - sent_at)
+
+    master, slave = os.openpty()
+    tty.setraw(master)
+    stop = threading.Event()
+    drainer = threading.Thread(target=_drain, args=(master, stop), daemon=True)
+    drainer.start()
+    session = zenoh.open(zenoh.Config())
+    try:
+        with (
+            SerialRobotDriver(os.ttyname(slave)) as driver,
+            ZenohTransmitter(prefix=PREFIX, per_field=False) as transmitter,
+        ):
+            session.declare_subscriber(f"{PREFIX}/robot/state", on_state)
+            app = Application(driver, transmitter)
+
+            def spin() -> None:
+                while not stop.is_set():
+                    app.spin_once(timeout=0.1)
+
+            spinner = threading.Thread(target=spin, daemon=True)
+            spinner.start()
+
+            def write(i: int) -> None:
+                written[i & 0xFF] = time.monotonic()
+                os.write(master, f"2,{i % 300},0,0,0,0,0,{i & 0xFF}\n".encode())
+
+            # セッション同士が見つかるまで待つ
+            deadline = time.monotonic() + 5.0
+            i = 0
+            while not latencies and time.monotonic() < deadline:
+                write(i)
+                i += 1
+                time.sleep(0.05)
+            latencies.clear()
+
+            next_time = time.monotonic()
+            for _ in range(count):
+                next_time += 1.0 / rate
+                time.sleep(max(next_time - time.monotonic(), 0.0))
+                i += 1
+                write(i)
+            time.sleep(0.1)
+            stop.set()
+            spinner.join()
+    finally:
+        stop.set()
+        session.close()  # type: ignore
+        os.close(slave)
+        os.close(master)
+        drainer.join()
+
+    us = sorted(v * 1e6 for v in latencies)
+    if not us:
+        return {"unit": "us", "value": None, "received": 0, "count": count}
+    return {
+        "unit": "us",
+        "value": statistics.median(us),
+        "p99": us[max(int(len(us) * 0.99) - 1, 0)],
+        "max": us[-1],
+        "received": len(us),
+        "count": count,
+    }
+
+
+def cases(scale: float) -> dict[str, Callable[[], Result]]:
+    """ケース名と計測する関数"""
+    n = int(20000 * scale)
+    r = 7
+    return {
+        "parse.csv": lambda: bench_parse(CsvCodec(), n, r),
+        "parse.binary": lambda: bench_parse(BinaryCodec(), n, r),
+        "encode.csv": lambda: bench_encode(CsvCodec(), n, r),
+        "encode.binary": lambda: bench_encode(BinaryCodec(), n, r),
+        "publish.changed": lambda: bench_publish("changed", n // 4, r),
+        "publish.force": lambda: bench_publish("force", n // 20, r),
+        "publish.unchanged": lambda: bench_publish("unchanged", n, r),
+        "command.json": lambda: bench_command(
+            zenoh.Encoding.APPLICATION_JSON, n // 4, r
+        ),
+        "command.msgpack": lambda: bench_command(MSGPACK_ENCODING, n // 4, r),
+        "command.struct": lambda: bench_command(STRUCT_ENCODING, n // 4, r),
+        "loop.latency": lambda: bench_loop(max(int(400 * scale), 20)),
+    }
+
+
+def environment() -> dict[str, Any]:
+    """比較するときに確認する実行環境の情報"""
+    try:
+        commit = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "zenoh": importlib.metadata.version("eclipse-zenoh"),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(
+    results: dict[str, Result], baseline: dict[str, Result], threshold: float
+) -> list[str]:
+    """比較結果を表示し、threshold を超えて遅くなったケース名を返す"""
+    regressions = []
+    for name, result in results.items():
+        new = result["value"]
+        old = baseline.get(name, {}).get("value")
+        if new is None or not old:
+            value = "-" if new is None else f"{new:.2f}"
+            print(f"{name:20s} {'-':>10} -> {value:>10}  (no baseline)")
+            continue
+        ratio = new / old
+        mark = ""
+        if ratio > 1 + threshold:
+            mark = "  REGRESSION"
+            regressions.append(name)
+        unit = result["unit"]
+        print(f"{name:20s} {old:10.2f} -> {new:10.2f} {unit}  x{ratio:.2f}{mark}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--only", action="append", default=None, help="実行するケース（glob、複数可）"
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="計測回数の倍率（0.1 で簡易計測）"
+    )
+    parser.add_argument("--output", default=None, help="結果を保存する JSON のパス")
+    parser.add_argument("--compare", default=None, help="比較する結果の JSON のパス")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="遅くなったとみなす割合（0.2 で 20%% 以上遅くなったら失敗）",
+    )
+    args = parser.parse_args()
+
+    results: dict[str, Result] = {}
+    for name, run in cases(args.scale).items():
+        if args.only and not any(fnmatch(name, p) for p in args.only):
+            continue
+        results[name] = run()
+        value = results[name]["value"]
+        print(f"{name:20s} {value:10.2f} us" if value is not None else name)
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\ncompared with {baseline['environment']['commit']}")
+        current = report["environment"]
+        for key in ("python", "zenoh", "machine", "platform", "cpu_count"):
+            if baseline["environment"].get(key) != current[key]:
+                print(
+                    f"warning: {key} differs"
+                    f" ({baseline['environment'].get(key)} -> {current[key]})"
+                )
+        if compare(results, baseline["results"], args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
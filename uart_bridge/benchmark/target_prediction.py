@@ -0,0 +1,232 @@
+"""照準の予測（TargetPredictor）で、送信する照準の誤差が減るかを記録の再生で比べる
+
+`[uart] record_path` で記録したファイルの送信フレームから、照準が変化した時刻と
+値を取り出し、その時刻に認識結果が届いたものとして再生する
+（`--every-frame` では、同じ値の送信フレームも認識結果が届いたものとして扱う）。
+送信のたび（--tx-rate-hz）に以下の方式で送る照準を求め、その時点の実際の照準との
+誤差[px]（target_x, target_y のユークリッド距離）を比べる。
+実際の照準が止まっている区間の誤差（stopped）も別に集計する。
+
+- hold: 最後に届いた認識結果をそのまま送る（予測なし、これまでの動作）
+- predict: TargetPredictor で送信時刻まで外挿する
+- predict+lead: さらに --latency-ms だけ先まで外挿する（lead_ms）
+
+認識結果はカメラの撮影から --latency-ms 遅れて届くものとし、実際の照準は
+後から届いた認識結果を撮影時刻で線形補間して求める。予測を有効にして記録した
+ファイルは、送信フレームが外挿した値になるので使わないこと。
+
+記録を指定しない場合は、左右に動いては止まる照準を 30fps で認識して送ったときの
+記録（認識結果ごとに1フレーム）を一時ファイルに作って再生する。
+
+    uv run python3 benchmark/target_prediction.py
+    uv run python3 benchmark/target_prediction.py match.ublog --latency-ms 60
+"""
+
+import argparse
+import bisect
+import json
+import math
+import random
+import statistics
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from uart_bridge.domain.config import TargetPredictionConfig
+from uart_bridge.domain.messages import RobotCommand
+from uart_bridge.infra.codec import create_codec
+from uart_bridge.infra.serial_log import TX, SerialRecorder, read_serial_log
+from uart_bridge.infra.target_predictor import TargetPredictor
+
+Observation = tuple[float, RobotCommand]
+
+#: 作成する記録で照準が動き続ける時間と、止まる時間[秒]
+MOVE_S = 3.0
+HOLD_S = 1.0
+#: 実際の照準がこの時間[秒]にこの距離[px]未満しか動いていなければ止まっているとみなす
+STOPPED_WINDOW_S = 0.1
+STOPPED_PX = 2.0
+
+
+def make_recording(path: Path, duration: float, fps: float, latency: float) -> None:
+    """動く照準を認識して送ったときの送信フレームを記録する
+
+    照準は周期の異なる正弦波の和で左右・上下に動き、`MOVE_S` 秒動くごとに
+    `HOLD_S` 秒止まる。動いている間の認識結果には ±1px 程度の誤差を加え、
+    撮影間隔・遅延は常に揺らがせる。止まっている間も認識結果は同じ間隔で届き、
+    値は変化しない（同じ照準が届き続ける）。
+    """
+    rng = random.Random(0)
+    codec = create_codec("csv")
+    with SerialRecorder(path, codec="csv") as recorder:
+        t = 0.0
+        while t < duration:
+            cycles, phase = divmod(t, MOVE_S + HOLD_S)
+            s = cycles * MOVE_S + min(phase, MOVE_S)  # 止まっている間は進まない
+            x = 640 + 250 * math.sin(2 * math.pi * 0.4 * s) + 80 * math.sin(5.3 * s)
+            y = 360 + 60 * math.sin(2 * math.pi * 0.7 * s)
+            distance = 1500 + 300 * math.sin(0.8 * s)
+            noise = 1.0 if phase < MOVE_S else 0.0
+            command = RobotCommand(
+                target_x=round(x + rng.gauss(0, noise)),
+                target_y=round(y + rng.gauss(0, noise)),
+                target_distance=round(distance),
+            )
+            arrival = t + latency + rng.uniform(-0.003, 0.003)
+            recorder.record_tx(arrival, codec.encode(command))
+            t += 1 / fps + rng.uniform(-0.002, 0.002)
+
+
+def load_observations(path: Path, every_frame: bool = False) -> list[Observation]:
+    """記録の送信フレームから、照準が変化した時刻とコマンドを取り出す
+
+    `every_frame` では、照準が同じ送信フレームも取り出す（認識結果ごとに
+    1フレームの記録用。ハートビートを含む記録では止まって見えてしまう）。
+    """
+    codec_name, records = read_serial_log(path)
+    codec = create_codec(codec_name)
+    observations: list[Observation] = []
+    previous: tuple[int, int, int] | None = None
+    for record in records:
+        if record.direction != TX:
+            continue
+        frame = record.data.removesuffix(codec.delimiter)
+        command = codec.decode_command(frame)
+        if command is None:
+            continue
+        target = (command.target_x, command.target_y, command.target_distance)
+        if every_frame or target != previous:
+            observations.append((record.timestamp, command))
+            previous = target
+    return observations
+
+
+def evaluate(
+    observations: list[Observation],
+    latency: float,
+    tx_rate_hz: float,
+    config: TargetPredictionConfig | None,
+) -> dict[str, Any]:
+    """送信のたびに送る照準と実際の照準の誤差[px]を集計する"""
+    # 撮影時刻（届いた時刻 - 遅延）と照準
+    captured = [t - latency for t, _ in observations]
+    targets = [(c.target_x, c.target_y) for _, c in observations]
+
+    def actual(t: float) -> tuple[float, float] | None:
+        i = bisect.bisect_right(captured, t)
+        if i == 0 or i == len(captured):
+            return None
+        t0, t1 = captured[i - 1], captured[i]
+        if t1 - t0 > 0.2:  # 照準を見失っていた区間は除く
+            return None
+        r = (t - t0) / (t1 - t0)
+        (x0, y0), (x1, y1) = targets[i - 1], targets[i]
+        return x0 + (x1 - x0) * r, y0 + (y1 - y0) * r
+
+    def stopped(t: float) -> bool:
+        now, before = actual(t), actual(t - STOPPED_WINDOW_S)
+        return (
+            now is not None
+            and before is not None
+            and math.hypot(now[0] - before[0], now[1] - before[1]) < STOPPED_PX
+        )
+
+    predictor = TargetPredictor(config) if config is not None else None
+    errors: list[float] = []
+    stopped_errors: list[float] = []
+    index = 0
+    current: RobotCommand | None = None
+    now = observations[0][0]
+    end = observations[-1][0]
+    while now < end:
+        while index < len(observations) and observations[index][0] <= now:
+            received_at, current = observations[index]
+            if predictor is not None:
+                predictor.observe(current, received_at)
+            index += 1
+        truth = actual(now)
+        if current is not None and truth is not None:
+            sent = current if predictor is None else predictor.predict(current, now)
+            error = math.hypot(sent.target_x - truth[0], sent.target_y - truth[1])
+            errors.append(error)
+            if stopped(now):
+                stopped_errors.append(error)
+        now += 1 / tx_rate_hz
+
+    errors.sort()
+    return {
+        "mean": statistics.fmean(errors),
+        "rms": math.sqrt(statistics.fmean(e * e for e in errors)),
+        "p95": errors[int(len(errors) * 0.95) - 1],
+        "max": errors[-1],
+        "ticks": len(errors),
+        "stopped_mean": statistics.fmean(stopped_errors) if stopped_errors else 0.0,
+        "stopped_max": max(stopped_errors, default=0.0),
+        "stopped_ticks": len(stopped_errors),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", nargs="?", help="再生する記録（省略時は作成する）")
+    parser.add_argument(
+        "--latency-ms", type=float, default=50.0, help="撮影から認識結果が届くまで"
+    )
+    parser.add_argument("--tx-rate-hz", type=float, default=100.0)
+    parser.add_argument(
+        "--every-frame",
+        action="store_true",
+        help="同じ照準の送信フレームも認識結果として扱う",
+    )
+    parser.add_argument("--fps", type=float, default=30.0, help="作成する記録の fps")
+    parser.add_argument(
+        "--duration", type=float, default=60.0, help="作成する記録の長さ[秒]"
+    )
+    parser.add_argument("--alpha", type=float, default=TargetPredictionConfig().alpha)
+    parser.add_argument("--beta", type=float, default=TargetPredictionConfig().beta)
+    parser.add_argument(
+        "--max-horizon-ms",
+        type=float,
+        default=TargetPredictionConfig().max_horizon_ms,
+    )
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.log is None:
+            path = Path(tmp) / "synthetic.ublog"
+            make_recording(path, args.duration, args.fps, latency)
+            every_frame = True
+        else:
+            path = Path(args.log)
+            every_frame = args.every_frame
+        observations = load_observations(path, every_frame)
+
+    config = TargetPredictionConfig(
+        enabled=True,
+        alpha=args.alpha,
+        beta=args.beta,
+        max_horizon_ms=args.max_horizon_ms,
+    )
+    results = {
+        "hold": evaluate(observations, latency, args.tx_rate_hz, None),
+        "predict": evaluate(observations, latency, args.tx_rate_hz, config),
+        "predict+lead": evaluate(
+            observations,
+            latency,
+            args.tx_rate_hz,
+            config.model_copy(update={"lead_ms": args.latency_ms}),
+        ),
+    }
+    for name, r in results.items():
+        print(
+            f"{name:14s} mean {r['mean']:7.2f} px  rms {r['rms']:7.2f} px"
+            f"  p95 {r['p95']:7.2f} px  max {r['max']:7.2f} px"
+            f"  stopped mean {r['stopped_mean']:7.2f} px"
+            f"  max {r['stopped_max']:7.2f} px"
+        )
+    print(json.dumps({"observations": len(observations), "results": results}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""マイコンのエミュレータで状態の送信レートを上げ、uart_bridge の処理能力の上限を調べる
+
+別プロセスで動かした `McuEmulator` の疑似端末に `SerialRobotDriver` と
+`ZenohTransmitter` をつなぎ、`Application` で中継した `robot/state` を
+別のセッションで購読する。
+レートごとに、送信した数・ドライバが受信した数・配信した数・購読側に届いた数と、
+受信から配信までのレイテンシ（`BridgeStats` の rx_publish）を出力する。
+
+    uv run python3 benchmark/throughput.py --rates 100,1000,5000 --duration 3
+"""
+
+import argparse
+import json
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import zenoh
+
+from uart_bridge.application.application import Application
+from uart_bridge.infra.codec import CodecName, create_codec
+from uart_bridge.infra.serial_robot_driver import SerialRobotDriver
+from uart_bridge.infra.stats import BridgeStats
+from uart_bridge.infra.zenoh_transmitter import ZenohTransmitter
+
+PREFIX = "benchmark_throughput"
+
+
+def run(
+    rate: float, duration: float, codec: CodecName, per_field: bool
+) -> dict[str, object]:
+    """1つのレートで計測する"""
+    stats = BridgeStats()
+    delivered = 0
+
+    def on_state(sample: zenoh.Sample) -> None:
+        nonlocal delivered
+        delivered += 1
+
+    session = zenoh.open(zenoh.Config())
+    session.declare_subscriber(f"{PREFIX}/robot/state", on_state)
+
+    # 同じプロセスだと GIL を取り合い、エミュレータが指定のレートで送信できない
+    link = Path(tempfile.gettempdir()) / f"{PREFIX}_uart"
+    link.unlink(missing_ok=True)
+    emulator = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uart_bridge.tools.mcu_emulator",
+            f"--codec={codec}",
+            f"--rate={rate}",
+            f"--link={link}",
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        while not link.exists():
+            time.sleep(0.01)
+
+        stop = threading.Event()
+        with (
+            SerialRobotDriver(
+                str(link),
+                codec=create_codec(codec),
+                stats=stats,
+            ) as driver,
+            ZenohTransmitter(
+                prefix=PREFIX,
+                per_field=per_field,
+                stats=stats,
+            ) as transmitter,
+        ):
+            app = Application(driver, transmitter)
+
+            def spin() -> None:
+                while not stop.is_set():
+                    app.spin_once(timeout=0.1)
+
+            thread = threading.Thread(target=spin, daemon=True)
+            thread.start()
+            time.sleep(duration)
+            emulator.send_signal(signal.SIGINT)
+            output, _ = emulator.communicate()
+            time.sleep(0.1)  # 受信・配信中のデータを処理しきるのを待つ
+            stop.set()
+            thread.join()
+
+            sent = json.loads(output.splitlines()[-1])["sent_states"]
+            received = driver.state_version
+            corrupt = driver.corrupt_frames
+            published = transmitter.state_seq
+
+    finally:
+        if emulator.poll() is None:
+            emulator.kill()
+
+    session.close()  # type: ignore
+    latency = stats.histograms["rx_publish"].summary()
+    return {
+        "rate_hz": rate,
+        "sent": sent,
+        "received": received,
+        "published": published,
+        "delivered": delivered,
+        "corrupt": corrupt,
+        "received_ratio": round(received / sent, 3) if sent else 0.0,
+        "rx_publish_p50_us": round(latency["p50_us"], 1),
+        "rx_publish_p99_us": round(latency["p99_us"], 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--rates",
+        default="100,1000,5000,10000",
+        help="状態の送信レート[Hz]（カンマ区切り）",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=3.0, help="レートごとの計測時間[秒]"
+    )
+    parser.add_argument("--codec", choices=("csv", "binary"), default="csv")
+    parser.add_argument(
+        "--no-per-field", action="store_true", help="robot/state/<key> に配信しない"
+    )
+    parser.add_argument("--json", action="store_true", help="JSONで出力する")
+    args = parser.parse_args()
+
+    results = []
+    for rate in (float(r) for r in args.rates.split(",")):
+        results.append(run(rate, args.duration, args.codec, not args.no_per_field))
+
+    if args.json:
+        print(json.dumps(results))
+    else:
+        for r in results:
+            print(r)
+
+
+if __name__ == "__main__":
+    main()
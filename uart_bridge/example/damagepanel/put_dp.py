@@ -1,17 +1,36 @@
+import argparse
 import random
 
 import zenoh
 
 from uart_bridge.domain.messages import DamagePanelRecognition
+from uart_bridge.infra.command_payload import (
+    MSGPACK_ENCODING,
+    STRUCT_ENCODING,
+    encode_damagepanel,
+)
+
+ENCODINGS = {
+    "json": zenoh.Encoding.APPLICATION_JSON,
+    "msgpack": MSGPACK_ENCODING,
+    "struct": STRUCT_ENCODING,
+}
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--encoding", choices=ENCODINGS, default="json", help="ペイロードの形式"
+    )
+    args = parser.parse_args()
+
     session = zenoh.open(zenoh.Config())
     key_expr = "damagepanel"
 
     # Subscribe to the robot command topic
 
-    pub = session.declare_publisher(f"{key_expr}")
+    encoding = ENCODINGS[args.encoding]
+    pub = session.declare_publisher(f"{key_expr}", encoding=encoding)
 
     d = DamagePanelRecognition(
         target_x=random.randint(0, 1280),
@@ -19,10 +38,8 @@ def main() -> None:
         target_distance=random.randint(0, 100),
     )
 
-    print(type(d.model_dump_json()))
-
-    pub.put(d.model_dump_json())
-    print(f"Published DamagePanelRecognition: {d.model_dump()}")
+    pub.put(encode_damagepanel(d, encoding))
+    print(f"Published DamagePanelRecognition ({args.encoding}): {d.model_dump()}")
 
 
 if __name__ == "__main__":
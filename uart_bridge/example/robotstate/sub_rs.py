@@ -1,38 +1,25 @@
-import time
+from uart_bridge.domain.messages import RobotStateId
+from uart_bridge.infra.robot_state_client import RobotStateClient
 
-import zenoh
 
-from uart_bridge.domain.messages import RobotState, RobotStateId
-
-
-class StateReceiver:
-    key_expr = "robot/state"
-
-    def __init__(self) -> None:
-        self.session = zenoh.open(zenoh.Config())
-
-        for key in RobotState.model_fields.keys():
-            print(f"Subscribing to {self.key_expr}/{key}")
-            self.session.declare_subscriber(f"{self.key_expr}/{key}", self._on_received)
-
-        self.session.declare_publisher(f"{self.key_expr}/request").put("request")
-
-    def _on_received(self, sample: zenoh.Sample) -> None:
-        if str(sample.key_expr) == f"{self.key_expr}/state_id":
-            value: str | RobotStateId = RobotStateId(int(sample.payload.to_bytes()))
-        else:
-            value = sample.payload.to_string()
-        print(f"Received {sample.key_expr}: {value}")
-
-    def run(self) -> None:
+def main() -> None:
+    with RobotStateClient() as client:
+        update = client.latest
+        version = 0 if update is None else update.version
         while True:
-            time.sleep(1)
-
-    def __del__(self) -> None:
-        self.session.close()  # type: ignore
+            if update is not None:
+                state = update.state
+                print(
+                    f"Received seq={update.seq} "
+                    f"state_id={RobotStateId(state.state_id).name} "
+                    f"pitch_deg={state.pitch_deg:.2f} "
+                    f"muzzle_velocity={state.muzzle_velocity:.2f} "
+                    f"connected={client.connected}"
+                )
+            update = client.wait_for_update(version)
+            assert update is not None
+            version = update.version
 
 
 if __name__ == "__main__":
-    main = StateReceiver()
-
-    main.run()
+    main()
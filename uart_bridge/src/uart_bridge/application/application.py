@@ -1,9 +1,16 @@
+import asyncio
+from threading import Condition
+from time import monotonic
+
 from uart_bridge.application.interfaces import (
     ApplicationInterface,
+    AsyncApplicationInterface,
+    AsyncRobotDriver,
+    AsyncTransmitter,
     RobotDriver,
     Transmitter,
 )
-from uart_bridge.domain.messages import RobotCommand, RobotState
+from uart_bridge.domain.messages import RobotCommand, RobotStateSnapshot
 
 
 class Application(ApplicationInterface):
@@ -20,13 +27,111 @@ class Application(ApplicationInterface):
         self._robot_driver = robot_driver
         self._transmitter = transmitter
 
-    def spin(self) -> None:
-        while True:
+        # 新しい状態・コマンドが届いたことを通知し合うための条件変数
+        # 起動直後は現在の値を一度反映させるため、更新ありから始める
+        self._condition = Condition()
+        self._state_updated = True
+        self._command_updated = True
+        # 最後に配信した接続状態（起動直後は未配信）
+        self._connected: bool | None = None
+
+        self._robot_driver.set_update_callback(self._on_state_updated)
+        self._transmitter.set_update_callback(self._on_command_updated)
+
+    def _on_state_updated(self) -> None:
+        with self._condition:
+            self._state_updated = True
+            self._condition.notify()
+
+    def _on_command_updated(self) -> None:
+        with self._condition:
+            self._command_updated = True
+            self._condition.notify()
+
+    def spin_once(self, timeout: float | None = None) -> bool:
+        """状態かコマンドが更新されるまで待ち、更新された方だけを反映する
+
+        コマンドの入力が古くなる時刻（`Transmitter.next_deadline`）になった場合も
+        コマンドが更新されたものとして扱う。
+
+        Returns:
+            timeout までに更新があった場合は True
+        """
+        deadline = self._transmitter.next_deadline()
+        wait_timeout = timeout
+        if deadline is not None:
+            remaining = max(deadline - monotonic(), 0.0)
+            wait_timeout = remaining if timeout is None else min(timeout, remaining)
+
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._state_updated or self._command_updated, wait_timeout
+            )
+            state_updated, self._state_updated = self._state_updated, False
+            command_updated, self._command_updated = self._command_updated, False
+
+        if deadline is not None and monotonic() >= deadline:
+            command_updated = True
+        if not (state_updated or command_updated):
+            return False
+
+        if state_updated:
+            connected = self._robot_driver.is_connected()
+            if connected != self._connected:
+                self._transmitter.publish_connection(connected)
+                self._connected = connected
+
             # ロボットの状態取得
-            robot_state: RobotState = self._robot_driver.get_robot_state()
+            robot_state: RobotStateSnapshot = self._robot_driver.get_state_snapshot()
 
             self._transmitter.publish(robot_state)
 
+        if command_updated:
             robot_command: RobotCommand = self._transmitter.subscribe()
 
-            self._robot_driver.set_send_values(robot_command)
+            self._robot_driver.set_send_values(
+                robot_command, self._transmitter.target_received_at()
+            )
+
+        return True
+
+    def spin(self) -> None:
+        while True:
+            self.spin_once()
+
+
+class AsyncApplication(AsyncApplicationInterface):
+    """asyncio のイベントループ1つで動作する Application
+
+    状態の配信とコマンドの転送をそれぞれタスクとして並行に実行する。
+    """
+
+    def __init__(
+        self,
+        robot_driver: AsyncRobotDriver,
+        transmitter: AsyncTransmitter,
+    ):
+        self._robot_driver = robot_driver
+        self._transmitter = transmitter
+
+    async def _forward_state(self) -> None:
+        published: bool | None = None  # 最後に配信した接続状態
+        while True:
+            robot_state = await self._robot_driver.wait_for_state()
+            connected = self._robot_driver.is_connected()
+            if connected != published:
+                await self._transmitter.publish_connection(connected)
+                published = connected
+            await self._transmitter.publish(robot_state)
+
+    async def _forward_command(self) -> None:
+        while True:
+            robot_command = await self._transmitter.wait_for_command()
+            self._robot_driver.set_send_values(
+                robot_command, self._transmitter.target_received_at()
+            )
+
+    async def spin(self) -> None:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self._forward_state())
+            tg.create_task(self._forward_command())
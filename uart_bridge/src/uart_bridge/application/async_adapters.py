@@ -0,0 +1,88 @@
+import asyncio
+
+from uart_bridge.application.interfaces import (
+    AsyncRobotDriver,
+    AsyncTransmitter,
+    RobotDriver,
+    Transmitter,
+)
+from uart_bridge.domain.messages import RobotCommand, RobotState, RobotStateSnapshot
+
+
+class AsyncRobotDriverAdapter(AsyncRobotDriver):
+    """同期の RobotDriver を AsyncRobotDriver として扱うアダプタ
+
+    ドライバのスレッドからの更新通知をイベントループに転送する。
+    実行中のイベントループ内で生成すること。
+    """
+
+    def __init__(self, robot_driver: RobotDriver) -> None:
+        self._robot_driver = robot_driver
+        self._loop = asyncio.get_running_loop()
+        self._updated = asyncio.Event()
+        self._updated.set()  # 初回は現在の状態をすぐに返す
+        self._robot_driver.set_update_callback(self._on_update)
+
+    def _on_update(self) -> None:
+        self._loop.call_soon_threadsafe(self._updated.set)
+
+    async def wait_for_state(self) -> RobotStateSnapshot:
+        await self._updated.wait()
+        self._updated.clear()
+        return self._robot_driver.get_state_snapshot()
+
+    def is_connected(self) -> bool:
+        return self._robot_driver.is_connected()
+
+    def set_send_values(
+        self, value: RobotCommand, received_at: float | None = None
+    ) -> None:
+        self._robot_driver.set_send_values(value, received_at)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._robot_driver.close)
+
+
+class AsyncTransmitterAdapter(AsyncTransmitter):
+    """同期の Transmitter を AsyncTransmitter として扱うアダプタ
+
+    購読コールバックのスレッドからの更新通知をイベントループに転送する。
+    実行中のイベントループ内で生成すること。
+    """
+
+    def __init__(self, transmitter: Transmitter) -> None:
+        self._transmitter = transmitter
+        self._loop = asyncio.get_running_loop()
+        self._updated = asyncio.Event()
+        self._updated.set()  # 初回は現在のコマンドをすぐに返す
+        self._transmitter.set_update_callback(self._on_update)
+
+    def _on_update(self) -> None:
+        self._loop.call_soon_threadsafe(self._updated.set)
+
+    async def publish(self, robot_state: RobotState | RobotStateSnapshot) -> None:
+        self._transmitter.publish(robot_state)
+
+    async def publish_connection(self, connected: bool) -> None:
+        self._transmitter.publish_connection(connected)
+
+    async def wait_for_command(self) -> RobotCommand:
+        # 入力が古くなる時刻になったら、通知が無くてもコマンドを作り直す
+        deadline = self._transmitter.next_deadline()
+        if deadline is None:
+            await self._updated.wait()
+        else:
+            # loop.time() は time.monotonic() と同じ時計
+            timeout = max(deadline - self._loop.time(), 0.0)
+            try:
+                await asyncio.wait_for(self._updated.wait(), timeout)
+            except TimeoutError:
+                pass
+        self._updated.clear()
+        return self._transmitter.subscribe()
+
+    def target_received_at(self) -> float | None:
+        return self._transmitter.target_received_at()
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._transmitter.close)
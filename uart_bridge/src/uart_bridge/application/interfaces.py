@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Any, Self
+from typing import Any, Callable, Self
 
-from uart_bridge.domain.messages import RobotCommand, RobotState
+from uart_bridge.domain.messages import RobotCommand, RobotState, RobotStateSnapshot
 
 
 class ApplicationInterface(ABC):
@@ -12,22 +12,55 @@ class ApplicationInterface(ABC):
         pass
 
 
+class AsyncApplicationInterface(ABC):
+    """Interface for the CoRE auto-pilot application running on asyncio."""
+
+    @abstractmethod
+    async def spin(self) -> None:
+        pass
+
+
 class RobotDriver(ABC):
     """Interface for communicating with robot"""
 
+    _update_callback: Callable[[], None] | None = None
+
     def __enter__(self) -> Self:
         return self
 
     def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
         self.close()
 
+    def set_update_callback(self, callback: Callable[[], None]) -> None:
+        """Register a callback invoked when a new robot state is available."""
+        self._update_callback = callback
+
+    def _notify_update(self) -> None:
+        if self._update_callback is not None:
+            self._update_callback()
+
     @abstractmethod
     def get_robot_state(self) -> RobotState:
         pass
 
+    def get_state_snapshot(self) -> RobotStateSnapshot:
+        """Return the latest robot state without building a pydantic model."""
+        return RobotStateSnapshot.from_model(self.get_robot_state())
+
+    def is_connected(self) -> bool:
+        """Return whether the link to the robot is up. A change of this value
+        is notified through the update callback."""
+        return True
+
     @abstractmethod
-    def set_send_values(self, value: RobotCommand) -> None:
-        """Set values to be sent to the robot."""
+    def set_send_values(
+        self, value: RobotCommand, received_at: float | None = None
+    ) -> None:
+        """Set values to be sent to the robot.
+
+        `received_at` is the `time.monotonic()` arrival time of the recognition
+        sample the target was taken from. Drivers that predict the target
+        observe every new sample, even when `value` is unchanged."""
         pass
 
     @abstractmethod
@@ -38,14 +71,24 @@ class RobotDriver(ABC):
 class Transmitter(ABC):
     """Interface for communicating with robot"""
 
+    _update_callback: Callable[[], None] | None = None
+
     def __enter__(self) -> Self:
         return self
 
     def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
         self.close()
 
+    def set_update_callback(self, callback: Callable[[], None]) -> None:
+        """Register a callback invoked when a new robot command is available."""
+        self._update_callback = callback
+
+    def _notify_update(self) -> None:
+        if self._update_callback is not None:
+            self._update_callback()
+
     @abstractmethod
-    def publish(self, robot_state: RobotState) -> None:
+    def publish(self, robot_state: RobotState | RobotStateSnapshot) -> None:
         pass
 
     @abstractmethod
@@ -53,6 +96,89 @@ class Transmitter(ABC):
         """Subscribe to receive commands or data."""
         pass
 
+    def publish_connection(self, connected: bool) -> None:
+        """Publish a change of the link state to the robot."""
+        pass
+
+    def target_received_at(self) -> float | None:
+        """Return the `time.monotonic()` arrival time of the recognition sample
+        behind the target of the last `subscribe()` result, or None if unknown."""
+        return None
+
+    def next_deadline(self) -> float | None:
+        """Return the `time.monotonic()` time at which `subscribe()` may change
+        without a new message (e.g. a stale input falling back to its default),
+        or None if there is no such time."""
+        return None
+
     @abstractmethod
     def close(self) -> None:
         pass
+
+
+class AsyncRobotDriver(ABC):
+    """Interface for communicating with robot on asyncio"""
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        await self.close()
+
+    @abstractmethod
+    async def wait_for_state(self) -> RobotStateSnapshot:
+        """Wait until a new robot state is available and return it."""
+        pass
+
+    def is_connected(self) -> bool:
+        """Return whether the link to the robot is up. `wait_for_state()`
+        also returns when this value changes."""
+        return True
+
+    @abstractmethod
+    def set_send_values(
+        self, value: RobotCommand, received_at: float | None = None
+    ) -> None:
+        """Set values to be sent to the robot.
+
+        `received_at` is the `time.monotonic()` arrival time of the recognition
+        sample the target was taken from. Drivers that predict the target
+        observe every new sample, even when `value` is unchanged."""
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
+
+
+class AsyncTransmitter(ABC):
+    """Interface for communicating with robot on asyncio"""
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        await self.close()
+
+    @abstractmethod
+    async def publish(self, robot_state: RobotState | RobotStateSnapshot) -> None:
+        pass
+
+    async def publish_connection(self, connected: bool) -> None:
+        """Publish a change of the link state to the robot."""
+        pass
+
+    @abstractmethod
+    async def wait_for_command(self) -> RobotCommand:
+        """Wait until a new command is available and return it."""
+        pass
+
+    def target_received_at(self) -> float | None:
+        """Return the `time.monotonic()` arrival time of the recognition sample
+        behind the target of the last `wait_for_command()` result, or None if
+        unknown."""
+        return None
+
+    @abstractmethod
+    async def close(self) -> None:
+        pass
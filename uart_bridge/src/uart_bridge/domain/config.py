@@ -1,9 +1,12 @@
 import os
 import tomllib
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal, Self
 
-from pydantic import BaseModel, Field, field_validator
+import zenoh
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from uart_bridge.domain.messages import RobotState
 
 
 class GlobalConfig(BaseModel):
@@ -11,17 +14,279 @@ class GlobalConfig(BaseModel):
     websocket_port: int = Field(default=8080, description="WebSocket Port")
 
 
-class UartConfig(BaseModel):
+class FieldPublishConfig(BaseModel):
+    """robot/state のフィールドごとの配信ポリシー"""
+
+    deadband_abs: float = Field(
+        default=0.0, ge=0, description="この値以下の変化は配信しない（絶対値）"
+    )
+    deadband_rel: float = Field(
+        default=0.0, ge=0, description="前回値に対するこの割合以下の変化は配信しない"
+    )
+    max_rate_hz: float | None = Field(
+        default=None, gt=0, description="配信の最大レート[Hz]（未指定で制限なし）"
+    )
+
+
+ZenohPriority = Literal[
+    "real_time",
+    "interactive_high",
+    "interactive_low",
+    "data_high",
+    "data",
+    "data_low",
+    "background",
+]
+
+
+class PublisherQosConfig(BaseModel):
+    """Zenoh の publisher の QoS"""
+
+    priority: ZenohPriority = Field(default="data", description="配信の優先度")
+    congestion_control: Literal["drop", "block"] = Field(
+        default="drop", description="輻輳時に破棄するか、送信できるまで待つか"
+    )
+    express: bool = Field(default=False, description="バッチングせずに即座に送信する")
+
+
+def default_publish_qos() -> dict[str, PublisherQosConfig]:
+    """制御に関わるキーを大量のデータより優先して即座に送る既定の QoS"""
+    control = PublisherQosConfig(priority="interactive_high", express=True)
+    return {
+        "robot/state": control,
+        "robot/state/state_id": control,
+        "robot/state/ready_to_fire": control,
+        "robot/connection": control,
+    }
+
+
+class ZenohSessionConfig(BaseModel):
+    """Zenoh のセッションの設定"""
+
+    mode: Literal["peer", "client", "router"] = Field(
+        default="peer", description="セッションのモード"
+    )
+    connect: list[str] = Field(
+        default_factory=list, description="接続先のエンドポイント"
+    )
+    listen: list[str] = Field(
+        default_factory=list, description="待ち受けるエンドポイント"
+    )
+    multicast_scouting: bool | None = Field(
+        default=None,
+        description="マルチキャストによる探索（未指定なら connect が空のときだけ有効）",
+    )
+
+
+class ThreadSchedulingConfig(BaseModel):
+    """シリアル通信のスレッドの CPU とスケジューリングの設定"""
+
+    cpu_affinity: list[int] = Field(
+        default_factory=list, description="実行する CPU の番号（空なら指定しない）"
+    )
+    sched_fifo_priority: int | None = Field(
+        default=None, ge=1, le=99, description="SCHED_FIFO の優先度（未指定なら通常）"
+    )
+    nice: int | None = Field(
+        default=None, ge=-20, le=19, description="nice 値（未指定なら変更しない）"
+    )
+
+
+class TargetPredictionConfig(BaseModel):
+    """送信のたびに照準の位置を外挿する予測の設定"""
+
+    enabled: bool = Field(default=False, description="照準の予測を行う")
+    alpha: float = Field(
+        default=0.85, gt=0, le=1, description="α-β フィルタの位置の補正の割合"
+    )
+    beta: float = Field(
+        default=0.3, ge=0, le=2, description="α-β フィルタの速度の補正の割合"
+    )
+    lead_ms: float = Field(
+        default=0.0, ge=0, description="送信時刻より先まで外挿する時間[ms]"
+    )
+    max_horizon_ms: float = Field(
+        default=100.0, ge=0, description="最後の認識結果から外挿する時間の上限[ms]"
+    )
+    max_jump_px: float = Field(
+        default=100.0, gt=0, description="この距離[px]以上跳んだら外挿をやり直す"
+    )
+
+
+class LogConfig(BaseModel):
+    """ログの出力の設定"""
+
+    level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = Field(
+        default="INFO", description="出力するログのレベル"
+    )
+    format: Literal["text", "json"] = Field(
+        default="text", description="出力形式（json は1行1オブジェクト）"
+    )
+    rate_limit_per_sec: float = Field(
+        default=1.0,
+        ge=0,
+        description="同じメッセージを出力する上限[件/秒]（0で無制限）",
+    )
+    rate_limit_burst: int = Field(
+        default=5, ge=1, description="同じメッセージを続けて出力できる件数"
+    )
+    frame_history: int = Field(
+        default=64, ge=0, description="エラー時に書き出す直前の送受信フレーム数"
+    )
+
+
+def _check_device(v: str) -> str:
+    """デバイスのパスが空でないことを確かめる
+
+    `/dev/serial/by-id/...` などのシンボリックリンクは解決せずにそのまま使い、
+    ドライバがそのパスを開いて監視する（再接続で別のノードになっても追いかける）。
+    起動時にデバイスが無くても、現れたら接続する。
+    """
+    if not v.strip():
+        raise ValueError("UART port must not be empty!")
+    return v
+
+
+class UartDeviceConfig(BaseModel):
+    """`[uart.devices.<name>]` で追加する UART デバイスの設定"""
+
     device: str = Field(..., description="UARTポートのパス")
+    codec: Literal["csv", "binary"] | None = Field(
+        default=None, description="通信フォーマット（未指定なら [uart] の codec）"
+    )
+    prefix: str | None = Field(
+        default=None, description="キーのプレフィックス（未指定ならデバイス名）"
+    )
 
     @field_validator("device", mode="after")
     @classmethod
     def validate_port(cls, v: str) -> str:
+        return _check_device(v)
+
+
+class UartConfig(BaseModel):
+    device: str | None = Field(default=None, description="UARTポートのパス")
+    codec: Literal["csv", "binary"] = Field(
+        default="csv", description="マイコンとの通信フォーマット"
+    )
+    tx_mode: Literal["on_change", "periodic"] = Field(
+        default="on_change", description="コマンドの送信モード"
+    )
+    tx_rate_hz: float = Field(
+        default=100.0, gt=0, description="コマンドの周期送信のレート[Hz]"
+    )
+    tx_min_interval_ms: float = Field(
+        default=5.0, ge=0, description="変化時に送信する最小間隔[ms]"
+    )
+    tx_overrun: Literal["skip", "catch_up"] = Field(
+        default="skip", description="周期送信が1周期以上遅れた場合の動作"
+    )
+    scheduling: ThreadSchedulingConfig = Field(
+        default_factory=ThreadSchedulingConfig,
+        description="シリアル通信のスレッドの CPU とスケジューリングの設定",
+    )
+    target_prediction: TargetPredictionConfig = Field(
+        default_factory=TargetPredictionConfig,
+        description="送信のたびに照準の位置を外挿する予測の設定",
+    )
+    runtime: Literal["thread", "asyncio"] = Field(
+        default="thread", description="実行方式（スレッド or asyncio）"
+    )
+    log: LogConfig = Field(default_factory=LogConfig, description="ログの出力の設定")
+    reconnect_max_interval_ms: float = Field(
+        default=1000.0, gt=0, description="切断時に再接続を試みる間隔の上限[ms]"
+    )
+    serial_process: bool = Field(
+        default=False, description="シリアル通信を子プロセスで行う"
+    )
+    command_timeout_ms: float = Field(
+        default=0.0,
+        ge=0,
+        description="入力が届かない場合にコマンドを既定値に戻すまでの時間[ms]（0で無効）",
+    )
+    publish_per_field: bool = Field(
+        default=True, description="robot/state/<key> へのフィールドごとの配信"
+    )
+    publish_keyframe_interval_ms: float = Field(
+        default=1000.0, ge=0, description="全フィールドを再配信する間隔[ms]（0で無効）"
+    )
+    history_size: int = Field(
+        default=0, ge=0, description="robot/history で返す状態の履歴の件数（0で無効）"
+    )
+    publish_fields: dict[str, FieldPublishConfig] = Field(
+        default_factory=dict, description="フィールドごとの配信ポリシー"
+    )
+    publish_qos: dict[str, PublisherQosConfig] = Field(
+        default_factory=default_publish_qos,
+        description="キー（プレフィックスからの相対パス）ごとの配信の QoS"
+        "（既定の QoS に上書きする）",
+    )
+    zenoh: ZenohSessionConfig = Field(
+        default_factory=ZenohSessionConfig, description="Zenoh のセッションの設定"
+    )
+    record_path: str | None = Field(
+        default=None,
+        description="送受信したバイト列を記録するファイルのパス（strftime 形式）",
+    )
+    devices: dict[str, UartDeviceConfig] = Field(
+        default_factory=dict,
+        description="追加の UART デバイス（1つの I/O ループと Zenoh セッションで扱う）",
+    )
+
+    @field_validator("device", mode="after")
+    @classmethod
+    def validate_port(cls, v: str | None) -> str | None:
         # ここで加工
-        real_path = Path(v).resolve()
-        if not real_path.exists():
-            raise ValueError(f"{v} is not a valid UART port!")
-        return str(real_path)
+        return None if v is None else _check_device(v)
+
+    @model_validator(mode="after")
+    def require_device(self) -> Self:
+        if self.device is None and not self.devices:
+            raise ValueError("device or devices is required!")
+        if "" in self.devices:
+            raise ValueError("device name must not be empty!")
+        return self
+
+    def device_configs(self) -> dict[str, UartDeviceConfig]:
+        """扱うすべてのデバイスを、名前と codec・プレフィックスを補った設定で返す
+
+        `device` は名前 "" ・プレフィックス "" のデバイスとして先頭に含める。
+        """
+        configs = {}
+        if self.device is not None:
+            configs[""] = UartDeviceConfig.model_construct(
+                device=self.device, codec=self.codec, prefix=""
+            )
+        for name, config in self.devices.items():
+            configs[name] = UartDeviceConfig.model_construct(
+                device=config.device,
+                codec=config.codec if config.codec is not None else self.codec,
+                prefix=config.prefix if config.prefix is not None else name,
+            )
+        return configs
+
+    @field_validator("publish_fields", mode="after")
+    @classmethod
+    def validate_publish_fields(
+        cls, v: dict[str, FieldPublishConfig]
+    ) -> dict[str, FieldPublishConfig]:
+        for key in v:
+            if key not in RobotState.model_fields:
+                raise ValueError(f"{key} is not a field of RobotState!")
+        return v
+
+    @field_validator("publish_qos", mode="after")
+    @classmethod
+    def validate_publish_qos(
+        cls, v: dict[str, PublisherQosConfig]
+    ) -> dict[str, PublisherQosConfig]:
+        for key in v:
+            try:
+                zenoh.KeyExpr(key)
+            except zenoh.ZError as err:
+                raise ValueError(f"{key} is not a valid key expression!") from err
+        # 指定したキーだけを既定の QoS に上書きする
+        return {**default_publish_qos(), **v}
 
 
 class Config(BaseModel):
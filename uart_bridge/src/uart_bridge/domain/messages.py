@@ -1,5 +1,5 @@
 from enum import Enum, auto
-from typing import Optional, Tuple
+from typing import NamedTuple, Optional, Self, Tuple
 
 from pydantic import BaseModel
 
@@ -55,6 +55,65 @@ class RobotState(BaseModel):
     reserved: int = 0  # 未使用
 
 
+class RobotStateSnapshot(NamedTuple):
+    """ロボットの状態の軽量な不変スナップショット
+
+    受信のたびに pydantic の検証を行わないための内部表現。
+    各値の意味は `RobotState` と同じだが、`state_id` は整数のまま保持する。
+    `RobotState` が必要になった時点で `to_model()` で生成する。
+    """
+
+    state_id: int = RobotStateId.UNKNOWN.value
+    pitch_deg: float = 0.0
+    muzzle_velocity: float = 0.0
+    reloaded_left_disks: int = 0
+    reloaded_right_disks: int = 0
+    video_id: int = 0
+    target_panel: bool = False
+    auto_aim: bool = False
+    record_video: bool = False
+    ready_to_fire: bool = False
+    reserved: int = 0
+
+    @classmethod
+    def from_model(cls, state: RobotState) -> Self:
+        return cls(
+            state.state_id.value,
+            state.pitch_deg,
+            state.muzzle_velocity,
+            state.reloaded_left_disks,
+            state.reloaded_right_disks,
+            state.video_id,
+            state.target_panel,
+            state.auto_aim,
+            state.record_video,
+            state.ready_to_fire,
+            state.reserved,
+        )
+
+    def to_model(self) -> RobotState:
+        return RobotState(
+            state_id=RobotStateId(self.state_id),
+            pitch_deg=self.pitch_deg,
+            muzzle_velocity=self.muzzle_velocity,
+            reloaded_left_disks=self.reloaded_left_disks,
+            reloaded_right_disks=self.reloaded_right_disks,
+            video_id=self.video_id,
+            target_panel=self.target_panel,
+            auto_aim=self.auto_aim,
+            record_video=self.record_video,
+            ready_to_fire=self.ready_to_fire,
+            reserved=self.reserved,
+        )
+
+
+def as_snapshot(state: RobotState | RobotStateSnapshot) -> RobotStateSnapshot:
+    """RobotState をスナップショットに変換する（スナップショットはそのまま返す）"""
+    if isinstance(state, RobotStateSnapshot):
+        return state
+    return RobotStateSnapshot.from_model(state)
+
+
 class DamagePanelRecognition(BaseModel):
     """ダメージパネル認識結果"""
 
@@ -0,0 +1,209 @@
+import contextlib
+import json
+import logging
+import queue
+import sys
+import threading
+from collections import deque
+from collections.abc import Iterator, Mapping, Sequence
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from time import monotonic
+
+from uart_bridge.domain.config import LogConfig
+
+
+class RateLimitFilter(logging.Filter):
+    """同じメッセージを `rate` 件/秒までに間引くフィルタ（トークンバケット）
+
+    ロガー名とフォーマット文字列（引数を埋め込む前のメッセージ）の組ごとに
+    数えるので、値だけが異なる同じ種類のメッセージはまとめて間引かれる。
+    `extra={"rate_limit_key": ...}` を付けたレコードはその値ごとにも分けて数える
+    （デバイスごとに間引くなど）。間引いた件数は、次に通したレコードの
+    `suppressed` 属性に付ける。間引いたレコードには `rate_limited` 属性を付ける。
+
+    Args:
+        rate: 1秒あたりに通す件数（0 以下で間引かない）
+        burst: 続けて通せる件数
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        super().__init__()
+        self._rate = rate
+        self._burst = float(burst)
+        # (ロガー名, フォーマット文字列, rate_limit_key)
+        #   -> (残りの件数, 最後に数えた時刻, 間引いた件数)
+        self._buckets: dict[tuple[str, object, object], tuple[float, float, int]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self._rate <= 0:
+            return True
+        key = (record.name, record.msg, getattr(record, "rate_limit_key", None))
+        now = monotonic()
+        with self._lock:
+            tokens, last, suppressed = self._buckets.get(key, (self._burst, now, 0))
+            tokens = min(tokens + (now - last) * self._rate, self._burst)
+            if tokens < 1.0:
+                self._buckets[key] = (tokens, now, suppressed + 1)
+                record.rate_limited = True
+                return False
+            self._buckets[key] = (tokens - 1.0, now, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+#: 送受信したフレーム（時刻, "rx" か "tx", バイト列）
+Frame = tuple[float, str, bytes]
+
+
+def format_frames(frames: Sequence[Frame]) -> list[str]:
+    """フレームを、最後のフレームからの相対時刻を付けた行にする"""
+    last = frames[-1][0]
+    return [f"{at - last:+.6f} {direction} {data!r}" for at, direction, data in frames]
+
+
+class TextFormatter(logging.Formatter):
+    """`時刻 レベル ロガー名: メッセージ` の1行にし、間引いた件数を添える
+
+    `FrameHistory.dump` のレコードには、直前のフレームを続く行に書き出す。
+    """
+
+    def __init__(self) -> None:
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f" ({suppressed} similar messages suppressed)"
+        frames = getattr(record, "frames", ())
+        if frames:
+            text += f"; last {len(frames)} frames:"
+            text += "".join(f"\n  {line}" for line in format_frames(frames))
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """1レコードを1行の JSON オブジェクトにする（journald や収集ツール向け）"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, object] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        frames = getattr(record, "frames", ())
+        if frames:
+            entry["frames"] = format_frames(frames)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """メッセージの整形をせずにキューへ渡す QueueHandler
+
+    標準の `QueueHandler.prepare` は呼び出したスレッドで引数を埋め込むが、
+    同じプロセス内のキューなのでレコードをそのまま渡し、整形と書き込みは
+    すべて `QueueListener` のスレッドで行う。引数には変更されない値
+    （bytes, str, 数値など）を渡すこと。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+@contextlib.contextmanager
+def configure_logging(config: LogConfig) -> Iterator[None]:
+    """ルートロガーの出力をバックグラウンドのスレッドに移す
+
+    ロガーはレコードをキューに積むだけで、整形と標準エラー出力への書き込みは
+    `QueueListener` のスレッドで行う。同じメッセージは `config` のレートに
+    間引いてからキューに積む。終了時には溜まったログを書き出してから戻す。
+    """
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(
+        JsonFormatter() if config.format == "json" else TextFormatter()
+    )
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(
+        RateLimitFilter(config.rate_limit_per_sec, config.rate_limit_burst)
+    )
+    listener = QueueListener(log_queue, handler)
+
+    root = logging.getLogger()
+    previous_level = root.level
+    root.addHandler(queue_handler)
+    root.setLevel(config.level)
+    listener.start()
+    try:
+        yield
+    finally:
+        root.removeHandler(queue_handler)
+        root.setLevel(previous_level)
+        listener.stop()
+
+
+class FrameHistory:
+    """直前に送受信したフレームを保持し、エラー時にまとめて書き出すリングバッファ
+
+    送受信のたびに `append` で追加する（古いものから捨てる）。
+    ログを出力しない通常時の負担は deque への追加だけ。
+
+    Args:
+        size: 保持するフレーム数
+    """
+
+    def __init__(self, size: int) -> None:
+        self._frames: deque[Frame] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def append(self, at: float, direction: str, data: bytes) -> None:
+        """送受信したバイト列を追加する（direction は "rx" か "tx"）"""
+        self._frames.append((at, direction, data))
+
+    def dump(
+        self,
+        logger: logging.Logger,
+        msg: str,
+        *args: object,
+        extra: Mapping[str, object] | None = None,
+    ) -> None:
+        """`msg % args` と保持しているフレームを1つのエラーとして出力する
+
+        エラーの種類ごとに `RateLimitFilter` で間引けるよう、フォーマット文字列は
+        種類ごとに固定し、値は `args` で渡す。フレームは変更されないタプルの
+        まま `frames` 属性に付け、文字列にするのは `TextFormatter` /
+        `JsonFormatter`（`QueueListener` のスレッド）に任せる。
+        出力したときだけフレームを空にし、間引かれた場合は次のエラーで
+        書き出せるように残す。
+        """
+        if not logger.isEnabledFor(logging.ERROR):
+            return
+        record = logger.makeRecord(
+            logger.name,
+            logging.ERROR,
+            "(unknown file)",
+            0,
+            msg,
+            args,
+            None,
+            extra={**(extra or {}), "frames": tuple(self._frames)},
+        )
+        logger.handle(record)
+        if not getattr(record, "rate_limited", False):
+            self._frames.clear()
+
+
+def create_frame_history(config: LogConfig) -> FrameHistory | None:
+    """設定からフレームのリングバッファを作る（0 なら None）"""
+    return FrameHistory(config.frame_history) if config.frame_history else None
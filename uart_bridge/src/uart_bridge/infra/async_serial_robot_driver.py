@@ -0,0 +1,158 @@
+import asyncio
+import logging
+from time import monotonic
+from typing import Any, Self
+
+import serial
+
+from uart_bridge.application.interfaces import AsyncRobotDriver
+from uart_bridge.domain.messages import RobotCommand, RobotStateSnapshot
+from uart_bridge.infra.app_logging import FrameHistory
+from uart_bridge.infra.codec import RobotCodec
+from uart_bridge.infra.serial_link import ReadCallback, SerialLink
+from uart_bridge.infra.serial_log import SerialRecorder
+from uart_bridge.infra.stats import BridgeStats
+from uart_bridge.infra.target_predictor import TargetPredictor
+from uart_bridge.infra.tx_scheduler import TxScheduler
+
+_logger = logging.getLogger(__name__)
+
+
+class AsyncSerialRobotDriver(AsyncRobotDriver):
+    """asyncio のイベントループ上でマイコンと通信するクラス
+
+    シリアルポートのファイルディスクリプタを `loop.add_reader` で監視し、
+    受信・デコード・送信をすべてイベントループのスレッドで行う。
+    `async with` で開始・終了する。
+
+    送受信と再接続の処理は `SerialRobotDriver` と同じ `SerialLink` が行い、
+    このクラスはイベントループへの登録と送信時刻までの待ち合わせだけを行う。
+
+    Args:
+        port: シリアルポートのデバイス
+        baudrate: ボーレート
+        timeout: 最初の再接続の間隔[秒]
+        reconnect_max: 再接続の間隔の上限[秒]
+        codec: 通信フォーマット
+        tx_scheduler: コマンド送信のスケジューラ
+        stats: 各区間のレイテンシを記録する統計（None で記録しない）
+        recorder: 送受信したバイト列の記録先（None で記録しない）
+        frame_history: エラー時に書き出す直前の送受信フレーム（None で保持しない）
+        predictor: 送信のたびに照準を外挿する予測（None で外挿しない）
+    """
+
+    def __init__(
+        self,
+        port: str,
+        baudrate: int = 115200,
+        parity: Any = serial.PARITY_NONE,
+        stopbits: Any = serial.STOPBITS_ONE,
+        timeout: float = 0.01,
+        reconnect_max: float = 1.0,
+        codec: RobotCodec | None = None,
+        tx_scheduler: TxScheduler | None = None,
+        stats: BridgeStats | None = None,
+        recorder: SerialRecorder | None = None,
+        frame_history: FrameHistory | None = None,
+        predictor: TargetPredictor | None = None,
+    ) -> None:
+        self._link = SerialLink(
+            port,
+            register=self._register,
+            unregister=self._unregister,
+            on_update=self._on_update,
+            wakeup=self._on_wakeup,
+            baudrate=baudrate,
+            parity=parity,
+            stopbits=stopbits,
+            timeout=timeout,
+            reconnect_max=reconnect_max,
+            codec=codec,
+            tx_scheduler=tx_scheduler,
+            stats=stats,
+            recorder=recorder,
+            frame_history=frame_history,
+            predictor=predictor,
+        )
+
+        self._state_updated = asyncio.Event()
+        self._state_updated.set()  # 初回は現在の状態をすぐに返す
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> Self:
+        self._link.start()
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def _register(self, fd: int, callback: ReadCallback) -> None:
+        asyncio.get_running_loop().add_reader(fd, lambda: callback(monotonic()))
+
+    def _unregister(self, fd: int) -> None:
+        asyncio.get_running_loop().remove_reader(fd)
+
+    def _on_update(self) -> None:
+        self._state_updated.set()
+
+    def _on_wakeup(self) -> None:
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        """次の処理の時刻まで待ち、送信または再接続を行う
+
+        例外が起きた場合は `SerialIoLoop` と同様にログに出力して続ける。
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            # loop.time() は time.monotonic() と同じ時計
+            timeout = self._link.next_deadline() - loop.time()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(timeout, 0.0))
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                self._link.service(loop.time())
+            except Exception:
+                _logger.exception("error in servicing %s", self._link.port)
+
+    async def wait_for_state(self) -> RobotStateSnapshot:
+        """新しい状態を受信するまで待ち、最新の状態を返す"""
+        await self._state_updated.wait()
+        self._state_updated.clear()
+        return self._link.robot_state
+
+    def set_send_values(
+        self, value: RobotCommand, received_at: float | None = None
+    ) -> None:
+        """マイコンへ送信する整数値を更新する"""
+        self._link.set_send_values(value, received_at)
+
+    def is_connected(self) -> bool:
+        """シリアルポートに接続しているか"""
+        return self._link.connected
+
+    @property
+    def reconnects(self) -> int:
+        """切断後に再接続した回数"""
+        return self._link.reconnects
+
+    @property
+    def dropped_frames(self) -> int:
+        """取りこぼしたフレーム数"""
+        return self._link.dropped_frames
+
+    @property
+    def corrupt_frames(self) -> int:
+        """破損していたフレーム数"""
+        return self._link.corrupt_frames
+
+    async def close(self) -> None:
+        _logger.info("closing robot driver")
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._link.stop()
@@ -0,0 +1,415 @@
+import logging
+import struct
+from abc import ABC, abstractmethod
+from binascii import crc_hqx
+from typing import Literal
+
+from uart_bridge.domain.messages import (
+    RobotCommand,
+    RobotStateId,
+    RobotStateSnapshot,
+)
+
+CodecName = Literal["csv", "binary"]
+
+_logger = logging.getLogger(__name__)
+
+_STATE_IDS = frozenset(state_id.value for state_id in RobotStateId)
+
+#: バイナリのコマンドの各フィールド（int16）の範囲
+_INT16_MIN = -0x8000
+_INT16_MAX = 0x7FFF
+
+#: バイナリのフレームの末尾の CRC16
+_CRC = struct.Struct("<H")
+
+
+def _make_state(
+    state_id: int,
+    pitch_deg: float,
+    muzzle_velocity: float,
+    reloaded_left_disks: int,
+    reloaded_right_disks: int,
+    video_id: int,
+    flags: int,
+    reserved: int,
+) -> RobotStateSnapshot | None:
+    """受信した値からスナップショットを作る。state_id が不正な場合は None"""
+    if state_id not in _STATE_IDS:
+        return None
+    return RobotStateSnapshot(
+        state_id,
+        pitch_deg,
+        muzzle_velocity,
+        reloaded_left_disks,
+        reloaded_right_disks,
+        video_id,
+        bool((flags >> 3) & 0b00000001),
+        bool((flags >> 2) & 0b00000001),
+        bool((flags >> 1) & 0b00000001),
+        bool((flags >> 0) & 0b00000001),
+        reserved,
+    )
+
+
+def _pack_flags(state: RobotStateSnapshot) -> int:
+    """フラグをビットフィールドにまとめる"""
+    return (
+        (state.target_panel << 3)
+        | (state.auto_aim << 2)
+        | (state.record_video << 1)
+        | (state.ready_to_fire << 0)
+    )
+
+
+class RobotCodec(ABC):
+    """マイコンとの通信フォーマットのインターフェース
+
+    受信したバイト列は `feed` で渡す。フレームの途中で区切られていても、
+    残りはバッファに保持され次回の `feed` で復元される。
+    区切り文字が届かないまま `max_frame_length` を超えた場合は
+    （フォーマットやボーレートの設定違いなど）、バッファを捨てて破損として数える。
+    """
+
+    #: フレームの区切り文字
+    delimiter: bytes = b"\n"
+    #: 区切り文字を含まない受信途中のフレームの最大長[バイト]
+    max_frame_length: int = 256
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self.dropped_frames = 0  # 取りこぼしたフレーム数
+        self.corrupt_frames = 0  # 破損していたフレーム数
+
+    def feed(self, data: bytes) -> list[RobotStateSnapshot]:
+        """受信したバイト列を渡し、完成したフレームをデコードして返す"""
+        # 前回までに探し終えた部分は探し直さない
+        start = max(len(self._buffer) - len(self.delimiter) + 1, 0)
+        self._buffer += data
+        states: list[RobotStateSnapshot] = []
+
+        begin = 0
+        while (end := self._buffer.find(self.delimiter, start)) >= 0:
+            frame = bytes(self._buffer[begin:end])
+            begin = start = end + len(self.delimiter)
+            if not frame:
+                continue
+
+            state = self.decode(frame)
+            if state is None:
+                self.corrupt_frames += 1
+            else:
+                states.append(state)
+        del self._buffer[:begin]
+
+        if len(self._buffer) > self.max_frame_length:
+            self._buffer.clear()
+            self.corrupt_frames += 1
+
+        return states
+
+    def reset(self) -> None:
+        """受信途中のバッファを破棄する（再接続時など）"""
+        self._buffer.clear()
+
+    @abstractmethod
+    def decode(self, frame: bytes) -> RobotStateSnapshot | None:
+        """区切り文字を除いた1フレームをデコードする。破損時は None"""
+        pass
+
+    @abstractmethod
+    def encode(self, command: RobotCommand) -> bytes:
+        """送信するコマンドを区切り文字込みのフレームにエンコードする"""
+        pass
+
+    @classmethod
+    @abstractmethod
+    def pack_state(cls, state: RobotStateSnapshot, seq: int) -> bytes:
+        """ロボットの状態をフレーム化する（マイコン側の実装・試験用）"""
+        pass
+
+    @abstractmethod
+    def decode_command(self, frame: bytes) -> RobotCommand | None:
+        """区切り文字を除いた1フレームをコマンドにデコードする。破損時は None
+
+        マイコン側の実装・試験用
+        """
+        pass
+
+
+class CsvCodec(RobotCodec):
+    """カンマ区切りのASCIIテキストによる通信フォーマット"""
+
+    delimiter = b"\n"
+
+    def decode(self, frame: bytes) -> RobotStateSnapshot | None:
+        try:
+            parts = frame.decode("ascii").strip().split(",")
+            if len(parts) < 8:
+                # 必要な項目が揃っていなければスキップ
+                return None
+            return _make_state(
+                int(parts[0]),
+                float(parts[1]) / 10.0,
+                float(parts[2]) / 1000,
+                int(parts[3]),
+                int(parts[4]),
+                int(parts[5]),
+                int(parts[6]),
+                int(parts[7]),
+            )
+        except (UnicodeDecodeError, ValueError) as err:
+            _logger.debug("invalid csv frame %r: %s", frame, err)
+            return None
+
+    def encode(self, command: RobotCommand) -> bytes:
+        return command.to_str().encode("ascii")
+
+    @classmethod
+    def pack_state(cls, state: RobotStateSnapshot, seq: int = 0) -> bytes:
+        """ロボットの状態を1行にする。CSV には seq が無いため無視する"""
+        values = (
+            state.state_id,
+            round(state.pitch_deg * 10),
+            round(state.muzzle_velocity * 1000),
+            state.reloaded_left_disks,
+            state.reloaded_right_disks,
+            state.video_id,
+            _pack_flags(state),
+            state.reserved,
+        )
+        return (",".join(map(str, values)) + "\n").encode("ascii")
+
+    def decode_command(self, frame: bytes) -> RobotCommand | None:
+        try:
+            values = [int(v) for v in frame.decode("ascii").split(",")]
+        except (UnicodeDecodeError, ValueError):
+            return None
+        if len(values) != len(RobotCommand.model_fields):
+            return None
+        return RobotCommand(**dict(zip(RobotCommand.model_fields, values)))
+
+
+#: 分割せずにその場でエンコードできるデータの長さの上限[バイト]
+_COBS_SHORT = 0xFE
+
+
+def _cobs_encode_in_place(buffer: bytearray) -> None:
+    """先頭に1バイトの余白を置いたデータをその場でCOBSエンコードする
+
+    各 0x00 （と先頭の余白）を次の 0x00 までの距離に置き換える。
+    ブロックの分割はしないので、データは `_COBS_SHORT` バイト未満に限る。
+    """
+    # 短いデータでは find() で 0x00 を1つずつ探すより、split() で
+    # ブロックの長さをまとめて求めるほうが速い
+    index = 0
+    for block in buffer[1:].split(b"\x00"):
+        code = len(block) + 1
+        buffer[index] = code
+        index += code
+
+
+def cobs_encode(data: bytes) -> bytes:
+    """COBSでエンコードする（区切り文字の 0x00 は含まない）"""
+    if len(data) < _COBS_SHORT:
+        buffer = bytearray(1)
+        buffer += data
+        _cobs_encode_in_place(buffer)
+        return bytes(buffer)
+
+    out = bytearray()
+    start = 0
+    while True:
+        # 0x00 の位置でブロックに分け、254バイト以上のブロックはさらに分割する
+        zero = data.find(b"\x00", start)
+        end = len(data) if zero < 0 else zero
+        while end - start >= 0xFE:
+            out.append(0xFF)
+            out += data[start : start + 0xFE]
+            start += 0xFE
+        out.append(end - start + 1)
+        out += data[start:end]
+        if zero < 0:
+            return bytes(out)
+        start = zero + 1
+
+
+def cobs_decode(data: bytes) -> bytes:
+    """COBSでデコードする。不正なデータの場合は ValueError"""
+    if b"\x00" in data:
+        raise ValueError("unexpected zero byte in COBS frame")
+    size = len(data)
+    if size <= _COBS_SHORT + 1:
+        # 0xFF のブロックの後にコードが続くことはないので、
+        # 各コードを 0x00 に戻して先頭のコードを取り除けばよい
+        out = bytearray(data)
+        index = 0
+        while index < size:
+            out[index] = 0
+            index += data[index]
+        if index > size:
+            raise ValueError("truncated COBS frame")
+        return bytes(out[1:])
+
+    out = bytearray()
+    index = 0
+    while index < len(data):
+        code = data[index]
+        end = index + code
+        if end > len(data):
+            raise ValueError("truncated COBS frame")
+        out += data[index + 1 : end]
+        index = end
+        if code != 0xFF and index < len(data):
+            out.append(0)
+    return bytes(out)
+
+
+class BinaryCodec(RobotCodec):
+    """固定長の構造体をCOBSでフレーム化した通信フォーマット
+
+    フレーム: COBS(seq[u8] + payload + crc16[u16 LE]) + 0x00
+
+    - CRCは CRC-16/CCITT (初期値 0xFFFF) を seq と payload に対して計算する
+    - seq はフレームごとに1ずつ増え、255の次は0に戻る
+    """
+
+    delimiter = b"\x00"
+
+    #: state_id, pitch_deg(x10), muzzle_velocity(x1000),
+    #: reloaded_left_disks, reloaded_right_disks, video_id, flags, reserved
+    STATE = struct.Struct("<BhiBBBBB")
+    #: target_x, target_y, target_distance, force_linear, force_angular
+    #: （未使用の dummy は送らない）
+    COMMAND = struct.Struct("<hhhhh")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._rx_seq: int | None = None
+        self._tx_seq = 0
+
+    @staticmethod
+    def pack_frame(seq: int, payload: bytes) -> bytes:
+        """seq と CRC を付与し、COBSでフレーム化する"""
+        # 先頭のCOBSのコードの余白、seq、payload、CRC、区切り文字を1つのバッファに並べる
+        frame = bytearray(2)
+        frame[1] = seq & 0xFF
+        frame += payload
+        frame += _CRC.pack(crc_hqx(frame[1:], 0xFFFF))
+        if len(frame) - 1 >= _COBS_SHORT:
+            return cobs_encode(bytes(frame[1:])) + b"\x00"
+        _cobs_encode_in_place(frame)
+        frame.append(0)
+        return bytes(frame)
+
+    @staticmethod
+    def unpack_frame(frame: bytes) -> tuple[int, bytes] | None:
+        """COBSフレームを検証し (seq, payload) を返す。破損時は None"""
+        body = BinaryCodec._unpack_body(frame)
+        if body is None:
+            return None
+        return body[0], body[1:-2]
+
+    @staticmethod
+    def _unpack_body(frame: bytes) -> bytes | None:
+        """COBSフレームを検証し seq + payload + crc を返す。破損時は None"""
+        try:
+            body = cobs_decode(frame)
+        except ValueError:
+            return None
+        if len(body) < 3:
+            return None
+        (crc,) = _CRC.unpack_from(body, len(body) - 2)
+        if crc_hqx(body[:-2], 0xFFFF) != crc:
+            return None
+        return body
+
+    @classmethod
+    def pack_state(cls, state: RobotStateSnapshot, seq: int) -> bytes:
+        """ロボットの状態をフレーム化する（マイコン側の実装・試験用）"""
+        payload = cls.STATE.pack(
+            state.state_id,
+            round(state.pitch_deg * 10),
+            round(state.muzzle_velocity * 1000),
+            state.reloaded_left_disks,
+            state.reloaded_right_disks,
+            state.video_id,
+            _pack_flags(state),
+            state.reserved,
+        )
+        return cls.pack_frame(seq, payload)
+
+    def decode(self, frame: bytes) -> RobotStateSnapshot | None:
+        # payload を切り出さずに body から直接読む
+        body = self._unpack_body(frame)
+        if body is None or len(body) != self.STATE.size + 3:
+            return None
+        seq = body[0]
+
+        (
+            state_id,
+            pitch,
+            velocity,
+            left_disks,
+            right_disks,
+            video_id,
+            flags,
+            reserved,
+        ) = self.STATE.unpack_from(body, 1)
+        state = _make_state(
+            state_id,
+            pitch / 10.0,
+            velocity / 1000,
+            left_disks,
+            right_disks,
+            video_id,
+            flags,
+            reserved,
+        )
+        if state is None:
+            return None
+
+        # seq が前回と同じフレームは再送とみなし、一周分の取りこぼしとは数えない
+        if self._rx_seq is not None and seq != self._rx_seq:
+            self.dropped_frames += (seq - self._rx_seq - 1) & 0xFF
+        self._rx_seq = seq
+        return state
+
+    def encode(self, command: RobotCommand) -> bytes:
+        """コマンドをフレーム化する。int16 の範囲外の値は範囲内に丸める"""
+        values = (
+            command.target_x,
+            command.target_y,
+            command.target_distance,
+            command.force_linear,
+            command.force_angular,
+        )
+        try:
+            payload = self.COMMAND.pack(*values)
+        except struct.error:
+            payload = self.COMMAND.pack(
+                *[min(max(value, _INT16_MIN), _INT16_MAX) for value in values]
+            )
+        frame = self.pack_frame(self._tx_seq, payload)
+        self._tx_seq = (self._tx_seq + 1) & 0xFF
+        return frame
+
+    def decode_command(self, frame: bytes) -> RobotCommand | None:
+        unpacked = self.unpack_frame(frame)
+        if unpacked is None or len(unpacked[1]) != self.COMMAND.size:
+            return None
+        values = self.COMMAND.unpack(unpacked[1])
+        return RobotCommand(**dict(zip(RobotCommand.model_fields, values)))
+
+    def reset(self) -> None:
+        super().reset()
+        self._rx_seq = None
+
+
+def create_codec(name: CodecName) -> RobotCodec:
+    """設定名から通信フォーマットを生成する"""
+    match name:
+        case "csv":
+            return CsvCodec()
+        case "binary":
+            return BinaryCodec()
@@ -0,0 +1,106 @@
+import logging
+from collections import deque
+from collections.abc import Callable
+from time import monotonic
+from typing import Generic, TypeVar
+
+import zenoh
+
+_logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CommandSource(Generic[T]):
+    """コマンドの入力元1つ分の受信バッファと最新値
+
+    zenoh のコールバックでは `on_sample` で受信時刻とサンプルを
+    固定長のリングバッファに積んで通知するだけにし、デコードは `poll` を
+    呼ぶメインループ側で行う。溜まったサンプルはまとめて取り出し、
+    正しくデコードできた最新の1つだけを使う。
+
+    最後に受信してから `timeout` 秒経つと古いとみなし、`default` を返す。
+
+    Args:
+        decode: ペイロードをデコードする関数（不正な場合は ValueError）
+        default: 未受信・古くなった場合の値
+        timeout: 値が有効な時間[秒]（0で無期限）
+        capacity: リングバッファの長さ（溢れた場合は古いサンプルから捨てる）
+        on_received: サンプルを受信したときに呼ぶ関数（メインループを起こす）
+    """
+
+    def __init__(
+        self,
+        decode: Callable[[bytes, zenoh.Encoding], T],
+        default: T,
+        timeout: float = 0.0,
+        capacity: int = 8,
+        on_received: Callable[[], None] | None = None,
+    ) -> None:
+        self._decode = decode
+        self._default = default
+        self._timeout = timeout
+        self._on_received = on_received
+        # deque の append/popleft はスレッドセーフなのでロック不要
+        self._ring: deque[tuple[float, zenoh.Sample]] = deque(maxlen=capacity)
+
+        self._value = default
+        self._received_at: float | None = None
+        self._expired = False  # 古くなったことを poll で反映済みか
+        self.received_samples = 0  # 受信したサンプル数
+        self.skipped_samples = 0  # 新しいサンプルがあり使わなかったサンプル数
+        self.invalid_samples = 0  # デコードできなかったサンプル数
+
+    def on_sample(self, sample: zenoh.Sample) -> None:
+        """zenoh のサブスクライバのコールバック"""
+        self._ring.append((monotonic(), sample))
+        if self._on_received is not None:
+            self._on_received()
+
+    def poll(self, now: float) -> T:
+        """溜まったサンプルを取り込み、現在の値を返す"""
+        if self._ring:
+            self._take_newest()
+
+        if self.is_stale(now):
+            self._expired = True
+            return self._default
+        return self._value
+
+    def _take_newest(self) -> None:
+        """溜まったサンプルをすべて取り出し、デコードできた最新のものを値にする"""
+        samples: list[tuple[float, zenoh.Sample]] = []
+        while self._ring:
+            samples.append(self._ring.popleft())
+        self.received_samples += len(samples)
+
+        for i, (received_at, sample) in enumerate(reversed(samples)):
+            try:
+                value = self._decode(sample.payload.to_bytes(), sample.encoding)
+            except ValueError as err:
+                _logger.warning("invalid sample: %s", err)
+                self.invalid_samples += 1
+                continue
+            self._value = value
+            self._received_at = received_at
+            self._expired = False
+            self.skipped_samples += len(samples) - i - 1
+            return
+
+    def is_stale(self, now: float) -> bool:
+        """値が古くなっている（または未受信）か"""
+        if self._received_at is None:
+            return True
+        # stale_deadline() と同じ式で判定する
+        return self._timeout > 0 and now >= self._received_at + self._timeout
+
+    def stale_deadline(self) -> float | None:
+        """`poll` の値が既定値に戻る時刻。無期限・未受信・反映済みの場合は None"""
+        if self._timeout <= 0 or self._received_at is None or self._expired:
+            return None
+        return self._received_at + self._timeout
+
+    @property
+    def received_at(self) -> float | None:
+        """最新の値を受信した時刻（`time.monotonic()`）"""
+        return self._received_at
@@ -0,0 +1,116 @@
+import math
+import struct
+
+import msgpack  # type: ignore[import-untyped]
+import zenoh
+
+from uart_bridge.domain.messages import DamagePanelRecognition, LiDARMessage
+
+#: フィールド名をキーとする map
+MSGPACK_ENCODING = zenoh.Encoding("application/msgpack")
+#: 固定長の構造体（リトルエンディアン）
+STRUCT_ENCODING = zenoh.Encoding.APPLICATION_OCTET_STREAM
+
+#: target_x, target_y, target_distance
+DAMAGEPANEL = struct.Struct("<hhh")
+#: linear, angular
+FORCE_VECTOR = struct.Struct("<ff")
+
+#: RobotCommand の各フィールドの範囲（バイナリ形式では int16 で送る）
+COMMAND_MIN = -0x8000
+COMMAND_MAX = 0x7FFF
+#: force_angular に入れるときの angular の倍率
+ANGULAR_SCALE = 10
+
+
+def _check_range(name: str, value: float) -> None:
+    """コマンドに入れる値が有限で範囲内か確かめる。範囲外なら ValueError"""
+    if not (math.isfinite(value) and COMMAND_MIN <= value <= COMMAND_MAX):
+        raise ValueError(f"{name} out of range: {value}")
+
+
+def decode_damagepanel(
+    payload: bytes, encoding: zenoh.Encoding
+) -> tuple[int, int, int]:
+    """`damagepanel` のペイロードをエンコーディングに応じてデコードする
+
+    msgpack と構造体に対応し、それ以外は JSON として扱う。
+    不正なペイロードや、コマンドに入らない値の場合は ValueError
+    （msgpack・pydantic の例外も ValueError）
+
+    Returns:
+        (target_x, target_y, target_distance)
+    """
+    values: tuple[int, int, int]
+    if encoding == STRUCT_ENCODING:
+        try:
+            values = DAMAGEPANEL.unpack(payload)
+        except struct.error as err:
+            raise ValueError(err) from err
+    elif encoding == MSGPACK_ENCODING:
+        try:
+            d = msgpack.unpackb(payload)
+            values = (
+                int(d["target_x"]),
+                int(d["target_y"]),
+                int(d["target_distance"]),
+            )
+        except (KeyError, TypeError, OverflowError) as err:
+            raise ValueError(err) from err
+    else:
+        m = DamagePanelRecognition.model_validate_json(payload)
+        values = (m.target_x, m.target_y, m.target_distance)
+    for name, value in zip(DamagePanelRecognition.model_fields, values):
+        _check_range(name, value)
+    return values
+
+
+def decode_force_vector(
+    payload: bytes, encoding: zenoh.Encoding
+) -> tuple[float, float]:
+    """`lidar/force_vector` のペイロードをエンコーディングに応じてデコードする
+
+    msgpack と構造体に対応し、それ以外は JSON として扱う。
+    不正なペイロードや、NaN・無限大などコマンドに入らない値の場合は ValueError
+    （msgpack・pydantic の例外も ValueError）
+
+    Returns:
+        (linear, angular)
+    """
+    values: tuple[float, float]
+    if encoding == STRUCT_ENCODING:
+        try:
+            values = FORCE_VECTOR.unpack(payload)
+        except struct.error as err:
+            raise ValueError(err) from err
+    elif encoding == MSGPACK_ENCODING:
+        try:
+            d = msgpack.unpackb(payload)
+            values = (float(d["linear"]), float(d["angular"]))
+        except (KeyError, TypeError) as err:
+            raise ValueError(err) from err
+    else:
+        m = LiDARMessage.model_validate_json(payload)
+        values = (m.linear, m.angular)
+    linear, angular = values
+    _check_range("linear", linear)
+    _check_range("angular", angular * ANGULAR_SCALE)
+    return values
+
+
+def encode_damagepanel(d: DamagePanelRecognition, encoding: zenoh.Encoding) -> bytes:
+    """`decode_damagepanel` でデコードできるペイロードを作る（送信側・試験用）"""
+    if encoding == STRUCT_ENCODING:
+        return DAMAGEPANEL.pack(d.target_x, d.target_y, d.target_distance)
+    if encoding == MSGPACK_ENCODING:
+        return msgpack.packb(d.model_dump())  # type: ignore[no-any-return]
+    return d.model_dump_json().encode()
+
+
+def encode_force_vector(m: LiDARMessage, encoding: zenoh.Encoding) -> bytes:
+    """`decode_force_vector` でデコードできるペイロードを作る（送信側・試験用）"""
+    if encoding == STRUCT_ENCODING:
+        return FORCE_VECTOR.pack(m.linear, m.angular)
+    if encoding == MSGPACK_ENCODING:
+        return msgpack.packb(m.model_dump())  # type: ignore[no-any-return]
+    return m.model_dump_json().encode()
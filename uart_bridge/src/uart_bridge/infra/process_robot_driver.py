@@ -0,0 +1,444 @@
+import contextlib
+import functools
+import logging
+import multiprocessing
+import signal
+import socket
+from collections.abc import Callable, Sequence
+from multiprocessing.shared_memory import SharedMemory
+from struct import Struct
+from threading import Event, Lock, Thread
+
+from uart_bridge.application.interfaces import RobotDriver
+from uart_bridge.domain.config import (
+    LogConfig,
+    TargetPredictionConfig,
+    ThreadSchedulingConfig,
+)
+from uart_bridge.domain.messages import RobotCommand, RobotState, RobotStateSnapshot
+from uart_bridge.infra.app_logging import configure_logging, create_frame_history
+from uart_bridge.infra.codec import CodecName, create_codec
+from uart_bridge.infra.serial_io_loop import SerialIoLoop
+from uart_bridge.infra.serial_log import SerialRecorder
+from uart_bridge.infra.serial_robot_driver import SerialRobotDriver
+from uart_bridge.infra.shared_state import SeqlockSlot
+from uart_bridge.infra.stats import BridgeStats, LatencyHistogram
+from uart_bridge.infra.target_predictor import create_target_predictor
+from uart_bridge.infra.thread_scheduling import apply_thread_scheduling
+from uart_bridge.infra.tx_scheduler import TxScheduler
+
+_logger = logging.getLogger(__name__)
+
+#: 子プロセスから親プロセスへ渡す状態
+#: RobotStateSnapshot の各フィールドに続き、受信した状態の数、最新の状態を
+#: 受信した時刻、変化したコマンドを最後に送信した時刻、接続状態、
+#: 取りこぼし・破損したフレーム数、再接続した回数
+STATE = Struct("<qddqqq????q" + "QddB" + "QQQ")
+#: 親プロセスから子プロセスへ渡すコマンド
+#: RobotCommand の各フィールドに続き、照準の認識結果が届いた時刻（不明なら 0）
+COMMAND = Struct("<6qd")
+_COMMAND_FIELDS = len(RobotCommand.model_fields)
+
+_SNAPSHOT_FIELDS = len(RobotStateSnapshot._fields)
+
+#: 子プロセスで計測し、親プロセスの統計に含める区間
+_TX_STAGES = ("tx_jitter", "tx_period")
+_HISTOGRAM_BUCKETS = len(LatencyHistogram.BOUNDS) + 1
+_HISTOGRAM_FIELDS = _HISTOGRAM_BUCKETS + 2
+#: 子プロセスから親プロセスへ渡す送信の統計
+#: _TX_STAGES の各ヒストグラム（バケットごとの件数、件数、最大値）に続き、
+#: 1周期以上遅れた回数、読み飛ばした締め切りの数
+TX_STATS = Struct("<" + f"{_HISTOGRAM_BUCKETS + 1}Qd" * len(_TX_STAGES) + "QQ")
+
+
+def _pack_histogram(histogram: LatencyHistogram) -> tuple[float, ...]:
+    return (*histogram.counts, histogram.count, histogram.max)
+
+
+def _unpack_histogram(values: Sequence[float]) -> LatencyHistogram:
+    histogram = LatencyHistogram()
+    histogram.counts = [int(n) for n in values[:_HISTOGRAM_BUCKETS]]
+    histogram.count = int(values[_HISTOGRAM_BUCKETS])
+    histogram.max = float(values[_HISTOGRAM_BUCKETS + 1])
+    return histogram
+
+
+class _ChildStats(BridgeStats):
+    """子プロセスで、配信の起点になる時刻と送信の統計を親プロセスに渡すための統計"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.command_sent_at = 0.0
+        self.on_command_sent: Callable[[], None] | None = None
+        self.on_tx_timing: Callable[[], None] | None = None
+
+    def record_command_sent(self, now: float) -> None:
+        super().record_command_sent(now)
+        self.command_sent_at = now
+        if self.on_command_sent is not None:
+            self.on_command_sent()
+
+    def record_tx_timing(self, deadline: float, previous: float, now: float) -> None:
+        super().record_tx_timing(deadline, previous, now)
+        if self.on_tx_timing is not None:
+            self.on_tx_timing()
+
+
+def serve_serial(
+    shm_name: str,
+    parent: socket.socket,
+    port: str,
+    baudrate: int,
+    timeout: float,
+    reconnect_max: float,
+    codec: CodecName,
+    tx_scheduler: TxScheduler,
+    record_path: str | None,
+    scheduling: ThreadSchedulingConfig | None,
+    log: LogConfig | None,
+    target_prediction: TargetPredictionConfig | None,
+) -> None:
+    """子プロセスでシリアル通信を行う
+
+    `parent` から1バイト届くたびに共有メモリのコマンドを読み出して送信し、
+    状態が更新されるたびに共有メモリに書き込んで `parent` に1バイト送る。
+    送信の統計は送信するたびに共有メモリに書き込む（`parent` には知らせない）。
+    `parent` が閉じられたら終了する。
+    """
+    # Ctrl+C は親プロセスが受け取り、ソケットを閉じて終了を伝える
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # spawn した子プロセスにはロギングの設定が引き継がれない
+    logging_stack = contextlib.ExitStack()
+    if log is not None:
+        logging_stack.enter_context(configure_logging(log))
+
+    shm = SharedMemory(name=shm_name)
+    assert shm.buf is not None
+    state_slot = SeqlockSlot(shm.buf, 0, STATE)
+    command_slot = SeqlockSlot(shm.buf, SeqlockSlot.size(STATE), COMMAND)
+    tx_slot = SeqlockSlot(
+        shm.buf, SeqlockSlot.size(STATE) + SeqlockSlot.size(COMMAND), TX_STATS
+    )
+    parent.setblocking(False)
+    stop = Event()
+    stats = _ChildStats()
+    recorder = (
+        SerialRecorder(record_path, codec=codec) if record_path is not None else None
+    )
+
+    with SerialIoLoop() as loop:
+        if scheduling is not None:
+            loop.call(lambda: apply_thread_scheduling(scheduling))
+        driver = SerialRobotDriver(
+            port,
+            baudrate=baudrate,
+            timeout=timeout,
+            reconnect_max=reconnect_max,
+            codec=create_codec(codec),
+            tx_scheduler=tx_scheduler,
+            stats=stats,
+            recorder=recorder,
+            frame_history=create_frame_history(log) if log is not None else None,
+            predictor=(
+                create_target_predictor(target_prediction)
+                if target_prediction is not None
+                else None
+            ),
+            io_loop=loop,
+        )
+        lock = Lock()  # 初回の書き込みと I/O ループからの書き込みの排他
+
+        def publish() -> None:
+            with lock:
+                state_slot.write(
+                    (
+                        *driver.get_state_snapshot(),
+                        driver.state_version,
+                        stats.state_received_at or 0.0,
+                        stats.command_sent_at,
+                        driver.is_connected(),
+                        driver.dropped_frames,
+                        driver.corrupt_frames,
+                        driver.reconnects,
+                    )
+                )
+            try:
+                parent.send(b"\0")
+            except BlockingIOError:
+                pass  # 親プロセスは未読の通知があれば最新の値を読む
+            except OSError:
+                stop.set()
+
+        def publish_tx() -> None:
+            tx_slot.write(
+                (
+                    *(
+                        value
+                        for stage in _TX_STAGES
+                        for value in _pack_histogram(stats.histograms[stage])
+                    ),
+                    tx_scheduler.overruns,
+                    tx_scheduler.skipped,
+                )
+            )
+
+        def on_parent(received_at: float) -> None:
+            try:
+                data = parent.recv(4096)
+            except BlockingIOError:
+                return
+            except OSError:
+                data = b""
+            if not data:
+                stop.set()
+                return
+            values = command_slot.read()
+            received_at = values[_COMMAND_FIELDS]
+            driver.set_send_values(
+                RobotCommand.model_construct(
+                    **dict(zip(RobotCommand.model_fields, values))
+                ),
+                received_at or None,
+            )
+
+        driver.set_update_callback(publish)
+        stats.on_command_sent = publish
+        stats.on_tx_timing = publish_tx
+        loop.call(lambda: loop.register(parent.fileno(), on_parent))
+        on_parent(0.0)  # 起動前に書き込まれたコマンドを反映する
+        publish()
+
+        stop.wait()
+        loop.call(lambda: loop.unregister(parent.fileno()))
+        driver.close()
+
+    if recorder is not None:
+        recorder.close()
+    parent.close()
+    shm.close()
+    logging_stack.close()
+
+
+class ProcessRobotDriver(RobotDriver):
+    """シリアル通信を子プロセスで行う RobotDriver
+
+    `SerialRobotDriver` とその I/O ループを子プロセスで動かし、最新の状態と
+    コマンドを `multiprocessing.shared_memory` 上の seqlock で受け渡す。
+    Zenoh のコールバックや配信の処理と GIL を取り合わないため、
+    送信のタイミングが親プロセスの負荷の影響を受けない。
+    更新の通知にはソケットペアを使い、親プロセスが終了すると子プロセスも終わる。
+
+    子プロセスで計測する区間のうち tx_jitter, tx_period と送信の遅れの
+    カウンタ（tx_overruns, tx_skipped）は、子プロセスが送信のたびに共有メモリに
+    書き込み、`stats` の集計時に読み出す。rx_parse, rx_swap, tx_write は
+    `stats` に含まれない。rx_publish, cmd_tx とその他のカウンタは親プロセスで
+    集計する。
+
+    Args:
+        port: シリアルポートのデバイス
+        baudrate: ボーレート
+        timeout: 最初の再接続の間隔[秒]
+        reconnect_max: 再接続の間隔の上限[秒]
+        codec: 通信フォーマットの名前
+        tx_scheduler: コマンド送信のスケジューラ
+        stats: 各区間のレイテンシを記録する統計（None で記録しない）
+        record_path: 送受信したバイト列の記録先（None で記録しない）
+        scheduling: 子プロセスの I/O ループのスレッドに設定する CPU・優先度
+        log: 子プロセスのログの出力の設定（None で設定しない）
+        target_prediction: 子プロセスで送信のたびに照準を外挿する予測の設定
+    """
+
+    def __init__(
+        self,
+        port: str,
+        baudrate: int = 115200,
+        timeout: float = 0.01,
+        reconnect_max: float = 1.0,
+        codec: CodecName = "csv",
+        tx_scheduler: TxScheduler | None = None,
+        stats: BridgeStats | None = None,
+        record_path: str | None = None,
+        scheduling: ThreadSchedulingConfig | None = None,
+        log: LogConfig | None = None,
+        target_prediction: TargetPredictionConfig | None = None,
+    ) -> None:
+        state_size = SeqlockSlot.size(STATE)
+        command_size = SeqlockSlot.size(COMMAND)
+        self._shm = SharedMemory(
+            create=True, size=state_size + command_size + SeqlockSlot.size(TX_STATS)
+        )
+        # 新しく作った共有メモリは 0 で埋められている
+        assert self._shm.buf is not None
+        self._state_slot = SeqlockSlot(self._shm.buf, 0, STATE)
+        self._command_slot = SeqlockSlot(self._shm.buf, state_size, COMMAND)
+        self._tx_slot = SeqlockSlot(self._shm.buf, state_size + command_size, TX_STATS)
+        self._send_values = RobotCommand()
+        self._target_received_at: float | None = None
+        self._command_slot.write((*self._send_values.model_dump().values(), 0.0))
+
+        self._stats = stats
+        self._robot_state = RobotStateSnapshot()
+        self._state_version = 0
+        self._command_sent_at = 0.0
+        self._connected = False
+        if stats is not None:
+            stats.add_counter("rx_dropped_frames", lambda: self.dropped_frames)
+            stats.add_counter("rx_corrupt_frames", lambda: self.corrupt_frames)
+            stats.add_counter("serial_reconnects", lambda: self.reconnects)
+            for index, stage in enumerate(_TX_STAGES):
+                stats.add_histogram(
+                    stage, functools.partial(self._read_tx_histogram, index)
+                )
+            stats.add_counter("tx_overruns", lambda: self._read_tx_counter(0))
+            stats.add_counter("tx_skipped", lambda: self._read_tx_counter(1))
+
+        self._is_closed = False
+        self._socket, child = socket.socketpair()
+        # 親プロセスの Zenoh のスレッドを引き継がないよう、fork せずに起動する
+        context = multiprocessing.get_context("spawn")
+        self._process = context.Process(
+            target=serve_serial,
+            args=(
+                self._shm.name,
+                child,
+                port,
+                baudrate,
+                timeout,
+                reconnect_max,
+                codec,
+                tx_scheduler if tx_scheduler is not None else TxScheduler(),
+                record_path,
+                scheduling,
+                log,
+                target_prediction,
+            ),
+            name=f"serial {port}",
+            daemon=True,
+        )
+        self._process.start()
+        child.close()
+
+        self._thread = Thread(target=self._watch, daemon=True)
+        self._thread.start()
+
+    def _watch(self) -> None:
+        """子プロセスからの通知を待ち、共有メモリの状態を取り込む"""
+        while True:
+            try:
+                data = self._socket.recv(4096)
+            except OSError:
+                data = b""
+            if not data:
+                break
+            self._load_state()
+
+        if self._connected:
+            _logger.error("serial process exited")
+            self._connected = False
+            self._notify_update()
+
+    def _load_state(self) -> None:
+        values = self._state_slot.read()
+        version, received_at, sent_at, connected = values[
+            _SNAPSHOT_FIELDS : _SNAPSHOT_FIELDS + 4
+        ]
+
+        stats = self._stats
+        if stats is not None and sent_at != self._command_sent_at:
+            stats.record_command_sent(sent_at)
+        self._command_sent_at = sent_at
+
+        changed = bool(connected) != self._connected
+        self._connected = bool(connected)
+        if version != self._state_version:
+            if stats is not None:
+                stats.mark_state_received(received_at)
+            self._robot_state = RobotStateSnapshot._make(values[:_SNAPSHOT_FIELDS])
+            self._state_version = version
+            changed = True
+        if changed:
+            self._notify_update()
+
+    def set_send_values(
+        self, value: RobotCommand, received_at: float | None = None
+    ) -> None:
+        """マイコンへ送信する値を共有メモリに書き込み、子プロセスに知らせる
+
+        値が変化していなくても、新しい認識結果（`received_at`）なら知らせる。
+        """
+        if value == self._send_values and (
+            received_at is None or received_at == self._target_received_at
+        ):
+            return
+        self._send_values = value
+        self._target_received_at = received_at
+        self._command_slot.write((*value.model_dump().values(), received_at or 0.0))
+        try:
+            self._socket.send(b"\0")
+        except OSError:
+            pass  # 子プロセスは終了している
+
+    def is_connected(self) -> bool:
+        """子プロセスがシリアルポートに接続しているか"""
+        return self._connected
+
+    def _read_counter(self, index: int) -> int:
+        """子プロセスが最後に状態を書き込んだ時点のカウンタを読み出す"""
+        return int(self._state_slot.read()[_SNAPSHOT_FIELDS + 4 + index])
+
+    def _read_tx_histogram(self, index: int) -> LatencyHistogram:
+        """子プロセスが最後に送信した時点の `_TX_STAGES[index]` の統計を読み出す"""
+        start = index * _HISTOGRAM_FIELDS
+        return _unpack_histogram(
+            self._tx_slot.read()[start : start + _HISTOGRAM_FIELDS]
+        )
+
+    def _read_tx_counter(self, index: int) -> int:
+        """子プロセスが最後に送信した時点の送信の遅れのカウンタを読み出す"""
+        return int(self._tx_slot.read()[len(_TX_STAGES) * _HISTOGRAM_FIELDS + index])
+
+    @property
+    def dropped_frames(self) -> int:
+        """取りこぼしたフレーム数"""
+        return self._read_counter(0)
+
+    @property
+    def corrupt_frames(self) -> int:
+        """破損していたフレーム数"""
+        return self._read_counter(1)
+
+    @property
+    def reconnects(self) -> int:
+        """切断後に再接続した回数"""
+        return self._read_counter(2)
+
+    @property
+    def state_version(self) -> int:
+        """受信した状態の数（状態が更新されるたびに増える）"""
+        return self._state_version
+
+    def get_state_snapshot(self) -> RobotStateSnapshot:
+        """最新のロボットの状態をスナップショットで返す"""
+        return self._robot_state
+
+    def get_robot_state(self) -> RobotState:
+        """最新のロボットの状態を返す"""
+        return self._robot_state.to_model()
+
+    def close(self) -> None:
+        _logger.info("closing robot driver")
+        if self._is_closed:
+            return
+        self._is_closed = True
+        try:
+            self._socket.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+        self._process.join(timeout=2.0)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._thread.join()
+        self._socket.close()
+        self._shm.close()
+        self._shm.unlink()
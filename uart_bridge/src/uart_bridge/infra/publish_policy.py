@@ -0,0 +1,77 @@
+from uart_bridge.domain.config import FieldPublishConfig
+from uart_bridge.domain.messages import RobotStateSnapshot
+
+
+class StatePublishPolicy:
+    """robot/state の各フィールドを配信するかを決めるクラス
+
+    フィールドごとに、前回配信した値からの変化が不感帯を超え、
+    かつ最大レートを超えない場合に配信する。抑制された変化は前回配信値との
+    比較で判定し続けるので、次の状態更新以降で配信される。
+    また `keyframe_interval` ごとに全フィールドを強制的に再配信し、
+    パケットを取りこぼした購読者や途中参加の購読者も最新値に収束させる。
+
+    時刻は `time.monotonic()` の値[秒]を渡す。
+
+    Args:
+        fields: フィールド名ごとのポリシー（未指定のフィールドは変化時に毎回配信）
+        keyframe_interval: 全フィールドを再配信する間隔[秒]（0で無効）
+    """
+
+    def __init__(
+        self,
+        fields: dict[str, FieldPublishConfig] | None = None,
+        keyframe_interval: float = 0.0,
+    ) -> None:
+        fields = fields or {}
+        configs = [
+            fields.get(key, FieldPublishConfig()) for key in RobotStateSnapshot._fields
+        ]
+        self._deadband_abs = [c.deadband_abs for c in configs]
+        self._deadband_rel = [c.deadband_rel for c in configs]
+        self._min_interval = [
+            1.0 / c.max_rate_hz if c.max_rate_hz else 0.0 for c in configs
+        ]
+        self._keyframe_interval = keyframe_interval
+
+        self._published: list[object] | None = None  # 前回配信した値
+        self._published_at = [float("-inf")] * len(configs)
+        self._keyframe_at = float("-inf")
+
+    def _changed(self, index: int, value: object, last: object) -> bool:
+        if value == last:
+            return False
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return True
+        assert isinstance(last, (int, float))
+        threshold = max(
+            self._deadband_abs[index], self._deadband_rel[index] * abs(last)
+        )
+        return abs(value - last) > threshold
+
+    def select(
+        self, snapshot: RobotStateSnapshot, now: float, force: bool = False
+    ) -> list[int]:
+        """配信すべきフィールドのインデックスを返し、配信したものとして記録する"""
+        if (
+            self._keyframe_interval
+            and now - self._keyframe_at >= self._keyframe_interval
+        ):
+            force = True
+
+        if force or self._published is None:
+            self._published = list(snapshot)
+            self._published_at = [now] * len(snapshot)
+            self._keyframe_at = now
+            return list(range(len(snapshot)))
+
+        selected = []
+        for index, value in enumerate(snapshot):
+            if now - self._published_at[index] < self._min_interval[index]:
+                continue
+            if not self._changed(index, value, self._published[index]):
+                continue
+            self._published[index] = value
+            self._published_at[index] = now
+            selected.append(index)
+        return selected
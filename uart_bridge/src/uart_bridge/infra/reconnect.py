@@ -0,0 +1,140 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+from pathlib import Path
+from typing import Any, Self
+
+_logger = logging.getLogger(__name__)
+
+# inotify(7) の定数
+_IN_ATTRIB = 0x00000004
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+
+# デバイスファイル・シンボリックリンクの作成、udev によるパーミッションの変更、
+# 監視しているディレクトリ自体の削除・移動を検知する
+_WATCH_MASK = _IN_ATTRIB | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE_SELF | _IN_MOVE_SELF
+
+
+class ReconnectBackoff:
+    """再接続を試みる間隔を、失敗するたびに `factor` 倍に伸ばす
+
+    Args:
+        initial: 最初の間隔[秒]
+        maximum: 間隔の上限[秒]
+        factor: 失敗するたびに間隔を伸ばす倍率
+    """
+
+    def __init__(self, initial: float, maximum: float, factor: float = 2.0) -> None:
+        self._initial = initial
+        self._maximum = max(maximum, initial)
+        self._factor = factor
+        self._delay = initial
+
+    def next_delay(self) -> float:
+        """次に再接続を試みるまでの時間[秒]を返し、その次の間隔を伸ばす"""
+        delay = self._delay
+        self._delay = min(delay * self._factor, self._maximum)
+        return delay
+
+    def reset(self) -> None:
+        """接続できた（またはデバイスが現れた）ので最初の間隔に戻す"""
+        self._delay = self._initial
+
+
+def _load_libc() -> Any:
+    """inotify の関数を持つ libc を読み込む。使えない環境では None"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        for name in ("inotify_init1", "inotify_add_watch", "inotify_rm_watch"):
+            getattr(libc, name)
+    except (OSError, AttributeError):
+        return None
+    libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+    return libc
+
+
+class DeviceWatcher:
+    """デバイスファイルが現れたことを inotify で検知するクラス
+
+    `path` の親ディレクトリ（無ければ存在する最も近い祖先）を監視する。
+    `/dev/serial/by-id/...` のようにディレクトリごと消えるパスでも、
+    ディレクトリが作られたら監視を張り直して追いかける。
+
+    `fileno()` を selector などで監視し、読み出し可能になったら `read()` を呼ぶ。
+    """
+
+    _libc: Any = None
+
+    def __init__(self, path: Path | str) -> None:
+        if DeviceWatcher._libc is None:
+            DeviceWatcher._libc = _load_libc()
+        if DeviceWatcher._libc is None:
+            raise OSError("inotify is not available")
+        self._path = Path(path)
+        self._fd = self._check(self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC))
+        self._wd = -1
+        # 監視しているディレクトリと inode（作り直された場合に張り直すため）
+        self._watching: tuple[Path, int] | None = None
+        self._arm()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def _check(result: int) -> int:
+        if result < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        return result
+
+    def _arm(self) -> None:
+        """存在する最も近いディレクトリを監視する"""
+        directory = self._path.parent
+        while not directory.is_dir() and directory != directory.parent:
+            directory = directory.parent
+        watching = (directory, directory.stat().st_ino)
+        if watching == self._watching:
+            return
+        if self._wd >= 0:
+            # 監視していたディレクトリが消えた場合は既に外れているので失敗してよい
+            self._libc.inotify_rm_watch(self._fd, self._wd)
+        self._wd = self._check(
+            self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        )
+        self._watching = watching
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read(self) -> bool:
+        """溜まったイベントを読み捨て、デバイスが存在すれば True を返す"""
+        try:
+            while os.read(self._fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        self._arm()
+        return self._path.exists()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_device_watcher(path: Path | str) -> DeviceWatcher | None:
+    """`DeviceWatcher` を作る。inotify が使えない環境では None"""
+    try:
+        return DeviceWatcher(path)
+    except OSError as err:
+        _logger.warning("device hotplug watching is disabled: %s", err)
+        return None
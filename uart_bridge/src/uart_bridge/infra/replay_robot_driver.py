@@ -0,0 +1,124 @@
+from pathlib import Path
+from threading import Event, Thread
+from time import monotonic
+
+from uart_bridge.application.interfaces import RobotDriver
+from uart_bridge.domain.messages import RobotCommand, RobotState, RobotStateSnapshot
+from uart_bridge.infra.codec import create_codec
+from uart_bridge.infra.serial_log import RX, read_serial_log
+from uart_bridge.infra.stats import BridgeStats
+
+
+class ReplayRobotDriver(RobotDriver):
+    """`SerialRecorder` で記録した受信データを再生する RobotDriver
+
+    記録した時刻の間隔を `speed` で割った間隔で受信データをデコードし、
+    `SerialRobotDriver` と同じように最新の状態を差し替えて通知する。
+    送信したコマンドは記録したものと比べられるように保持する。
+
+    Args:
+        path: 記録したファイルのパス
+        speed: 再生速度の倍率（0 で待たずに最速で再生する）
+        stats: 各区間のレイテンシを記録する統計（None で記録しない）
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        speed: float = 1.0,
+        stats: BridgeStats | None = None,
+    ) -> None:
+        if speed < 0:
+            raise ValueError("speed must not be negative")
+        codec_name, self._records = read_serial_log(path)
+        self._codec = create_codec(codec_name)
+        self._speed = speed
+        self._stats = stats
+        if stats is not None:
+            stats.add_counter("rx_dropped_frames", lambda: self.dropped_frames)
+            stats.add_counter("rx_corrupt_frames", lambda: self.corrupt_frames)
+
+        self._robot_state = RobotStateSnapshot()
+        self._state_version = 0
+        self.recorded_commands: list[bytes] = []  # 記録された送信データ
+        self.sent_commands: list[RobotCommand] = []  # 再生中に送信を指示された値
+
+        self._finished = Event()
+        self._is_closed = False
+        self._thread = Thread(target=self._replay, daemon=True)
+        self._thread.start()
+
+    def _replay(self) -> None:
+        """記録の時刻に合わせて受信データをデコードする"""
+        started_at = monotonic()
+        first: float | None = None
+        for direction, timestamp, data in self._records:
+            if self._is_closed:
+                break
+            if direction != RX:
+                self.recorded_commands.append(data)
+                continue
+
+            if first is None:
+                first = timestamp
+            if self._speed > 0:
+                delay = started_at + (timestamp - first) / self._speed - monotonic()
+                if delay > 0 and self._finished.wait(delay):
+                    break
+            self._receive(monotonic(), data)
+        self._finished.set()
+
+    def _receive(self, received_at: float, data: bytes) -> None:
+        states = self._codec.feed(data)
+        if not states:
+            return
+
+        stats = self._stats
+        if stats is not None:
+            stats.record("rx_parse", received_at, monotonic())
+            stats.mark_state_received(received_at)
+        self._robot_state = states[-1]
+        self._state_version += len(states)
+        if stats is not None:
+            stats.record("rx_swap", received_at, monotonic())
+        self._notify_update()
+
+    def wait_finished(self, timeout: float | None = None) -> bool:
+        """最後まで再生するまで待つ。再生し終えていれば True"""
+        return self._finished.wait(timeout)
+
+    @property
+    def dropped_frames(self) -> int:
+        """取りこぼしたフレーム数"""
+        return self._codec.dropped_frames
+
+    @property
+    def corrupt_frames(self) -> int:
+        """破損していたフレーム数"""
+        return self._codec.corrupt_frames
+
+    @property
+    def state_version(self) -> int:
+        """再生した状態の数（状態が更新されるたびに増える）"""
+        return self._state_version
+
+    def get_state_snapshot(self) -> RobotStateSnapshot:
+        """最新のロボットの状態をスナップショットで返す"""
+        return self._robot_state
+
+    def get_robot_state(self) -> RobotState:
+        """最新のロボットの状態を返す"""
+        return self._robot_state.to_model()
+
+    def set_send_values(
+        self, value: RobotCommand, received_at: float | None = None
+    ) -> None:
+        """送信を指示された値を保持する（実際には送信しない）"""
+        if not self.sent_commands or self.sent_commands[-1] != value:
+            self.sent_commands.append(value)
+
+    def close(self) -> None:
+        self._is_closed = True
+        self._finished.set()
+        self._thread.join()
+        self._records.close()
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable
+from threading import Condition, Lock
+from typing import Any, NamedTuple, Self
+
+import zenoh
+
+from uart_bridge.domain.config import ZenohSessionConfig
+from uart_bridge.domain.messages import RobotStateSnapshot
+from uart_bridge.infra.state_payload import unpack_state
+from uart_bridge.infra.zenoh_session import create_zenoh_config
+from uart_bridge.infra.zenoh_transmitter import format_connection
+
+_logger = logging.getLogger(__name__)
+
+
+class RobotStateUpdate(NamedTuple):
+    """uart_bridge から受け取ったロボットの状態"""
+
+    state: RobotStateSnapshot
+    seq: int  # uart_bridge が配信ごとに増やす番号
+    timestamp: float  # uart_bridge が配信した UNIX時刻[秒]
+    version: int  # このクライアントが状態を更新した回数
+
+
+class RobotStateClient:
+    """uart_bridge が配信するロボットの状態を受け取り、最新の状態を保持するクライアント
+
+    フィールドごとのキー（`robot/state/<key>`）ではなく、全フィールドを
+    まとめた `robot/state` の msgpack を1つ購読し、型の付いた
+    `RobotStateUpdate` として保持する。起動時の状態は `robot/state` への
+    問い合わせ（get）で1回だけ取得する。
+
+    最新の状態は `latest` でロックを取らずに読める。更新を待つには
+    コールバック（`add_callback`、Zenoh のスレッドで呼ばれる）、
+    `wait_for_update`（スレッドを止めて待つ）、`updates`（asyncio）を使う。
+    接続状態（`robot/connection`）も同じように `connected` で読める。
+
+    Args:
+        prefix: uart_bridge の Zenoh のプレフィックス
+        session: 共有する Zenoh のセッション（None で開く）
+        session_config: セッションを開く場合の設定
+        bootstrap_timeout: 起動時の問い合わせを待つ時間[秒]
+    """
+
+    def __init__(
+        self,
+        prefix: str = "",
+        session: zenoh.Session | None = None,
+        session_config: ZenohSessionConfig | None = None,
+        bootstrap_timeout: float = 1.0,
+    ) -> None:
+        self._owns_session = session is None
+        self._session = (
+            session
+            if session is not None
+            else zenoh.open(create_zenoh_config(session_config))
+        )
+        prefix = prefix.rstrip("/") + "/" if prefix else ""
+        self._state_key = f"{prefix}robot/state"
+        self._connection_key = f"{prefix}robot/connection"
+
+        self.latest: RobotStateUpdate | None = None
+        self.connected: bool | None = None
+        self._condition = Condition()
+        self._callbacks: list[Callable[[RobotStateUpdate], None]] = []
+        self._callbacks_lock = Lock()
+
+        # 購読してから問い合わせ、その間の更新を取りこぼさないようにする
+        self._declared: list[Any] = [
+            self._session.declare_subscriber(self._state_key, self._on_state),
+            self._session.declare_subscriber(self._connection_key, self._on_connection),
+        ]
+        for key, callback in (
+            (self._state_key, self._on_state),
+            (self._connection_key, self._on_connection),
+        ):
+            for reply in self._session.get(key, timeout=bootstrap_timeout):
+                if reply.ok is not None:
+                    callback(reply.ok)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close()
+
+    @property
+    def version(self) -> int:
+        """状態を更新した回数（未受信なら 0）"""
+        latest = self.latest
+        return 0 if latest is None else latest.version
+
+    def _on_state(self, sample: zenoh.Sample) -> None:
+        try:
+            state, seq, timestamp = unpack_state(sample.payload.to_bytes())
+        except (ValueError, KeyError, TypeError) as err:
+            _logger.warning("invalid robot state: %s", err)
+            return
+
+        with self._condition:
+            latest = self.latest
+            if latest is not None and (
+                seq == latest.seq
+                or (seq < latest.seq and timestamp <= latest.timestamp)
+            ):
+                # 問い合わせの返信と配信の重複、または古い返信。
+                # uart_bridge を再起動した場合は seq が戻るが、時刻は進む
+                return
+            update = RobotStateUpdate(state, seq, timestamp, self.version + 1)
+            self.latest = update
+            self._condition.notify_all()
+
+        with self._callbacks_lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback(update)
+
+    def _on_connection(self, sample: zenoh.Sample) -> None:
+        self.connected = sample.payload.to_string() == format_connection(True)
+
+    def add_callback(self, callback: Callable[[RobotStateUpdate], None]) -> None:
+        """状態が更新されるたびに Zenoh のスレッドで呼ぶ関数を登録する"""
+        with self._callbacks_lock:
+            self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[RobotStateUpdate], None]) -> None:
+        with self._callbacks_lock:
+            self._callbacks.remove(callback)
+
+    def wait_for_update(
+        self, version: int | None = None, timeout: float | None = None
+    ) -> RobotStateUpdate | None:
+        """`version` より新しい状態を受け取るまで待って返す
+
+        Args:
+            version: 既に受け取った状態の version（None で現在の version）
+            timeout: 待つ時間[秒]（None で無期限）
+
+        Returns:
+            最新の状態。timeout までに更新されなければ None
+        """
+        with self._condition:
+            if version is None:
+                version = self.version
+            if not self._condition.wait_for(lambda: self.version > version, timeout):
+                return None
+            return self.latest
+
+    async def updates(self) -> AsyncIterator[RobotStateUpdate]:
+        """状態が更新されるたびに最新の状態を返す非同期イテレータ
+
+        処理が追いつかない間に届いた状態は読み飛ばし、最新の状態だけを返す。
+        既に状態を受け取っていれば、最初にその状態を返す。
+        """
+        loop = asyncio.get_running_loop()
+        updated = asyncio.Event()
+
+        def notify(update: RobotStateUpdate) -> None:
+            loop.call_soon_threadsafe(updated.set)
+
+        self.add_callback(notify)
+        try:
+            version = 0
+            while True:
+                latest = self.latest
+                if latest is not None and latest.version > version:
+                    version = latest.version
+                    yield latest
+                    continue
+                await updated.wait()
+                updated.clear()
+        finally:
+            self.remove_callback(notify)
+
+    def close(self) -> None:
+        """購読を止める（セッションを開いた場合は閉じる）"""
+        if self._owns_session:
+            self._session.close()  # type: ignore
+            return
+        for entity in reversed(self._declared):
+            entity.undeclare()
+        self._declared.clear()
@@ -0,0 +1,156 @@
+import logging
+import math
+import os
+import selectors
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable
+from threading import Event, Thread, get_ident
+from time import monotonic
+from typing import Any, Self
+
+_logger = logging.getLogger(__name__)
+
+
+class IoChannel(ABC):
+    """`SerialIoLoop` で扱う通信路（シリアルポート1つ分）"""
+
+    @abstractmethod
+    def next_deadline(self) -> float:
+        """次に `service` を呼んでほしい時刻（`time.monotonic()`）"""
+
+    @abstractmethod
+    def service(self, now: float) -> None:
+        """送信・再接続など、時刻に応じた処理を行う"""
+
+
+class SerialIoLoop:
+    """複数のシリアルポートを1つのスレッドと selector で扱う I/O ループ
+
+    ファイルディスクリプタごとに、読み出し可能になったときのコールバックを
+    `register` で登録する。各 `IoChannel` の `next_deadline` の最も早い時刻まで
+    selector で待ち、届いたデータを処理してから各チャンネルの `service` を呼ぶ。
+
+    `register` や `add` はループのスレッドで呼ぶ。他のスレッドからは `call` で
+    ループのスレッドに処理を渡す。
+
+    コールバックや `service`、`call` で渡した処理で例外が起きた場合はログに
+    出力して次に進み、1つのチャンネルの不具合で他のシリアルポートの送受信を
+    止めない（`call` の例外は呼び出し元でも送出する）。
+    """
+
+    def __init__(self) -> None:
+        self._selector = selectors.DefaultSelector()
+        # 他のスレッドからループを起こすためのパイプ
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+
+        self._channels: list[IoChannel] = []
+        # ループのスレッドで実行する処理、完了を通知するイベント、起きた例外
+        self._calls: deque[tuple[Callable[[], None], Event, list[Exception]]] = deque()
+        self._is_closed = False
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close()
+
+    def register(self, fd: int, callback: Callable[[float], None]) -> None:
+        """`fd` が読み出し可能になったら `callback(検知した時刻)` を呼ぶ"""
+        self._selector.register(fd, selectors.EVENT_READ, callback)
+
+    def unregister(self, fd: int) -> None:
+        self._selector.unregister(fd)
+
+    def add(self, channel: IoChannel) -> None:
+        self._channels.append(channel)
+
+    def remove(self, channel: IoChannel) -> None:
+        self._channels.remove(channel)
+
+    def wakeup(self) -> None:
+        """ループを起こし、各チャンネルの時刻を計算し直させる"""
+        try:
+            os.write(self._wakeup_w, b"\0")
+        except BlockingIOError:
+            pass  # 既に起こしている
+
+    def call(self, func: Callable[[], None]) -> None:
+        """`func` をループのスレッドで実行し、終わるまで待つ
+
+        `func` で起きた例外は、ループを止めずに呼び出し元のスレッドで送出する。
+        """
+        if get_ident() == self._thread.ident or not self._thread.is_alive():
+            func()
+            return
+        done = Event()
+        errors: list[Exception] = []
+        self._calls.append((func, done, errors))
+        self.wakeup()
+        done.wait()
+        if errors:
+            raise errors[0]
+
+    def _run(self) -> None:
+        while not self._is_closed:
+            deadline = min(
+                (c.next_deadline() for c in self._channels), default=math.inf
+            )
+            timeout = None if deadline == math.inf else max(deadline - monotonic(), 0.0)
+            events = self._selector.select(timeout)
+
+            received_at = monotonic()
+            for key, _ in events:
+                if key.data is None:
+                    self._drain_wakeup()
+                else:
+                    try:
+                        key.data(received_at)
+                    except Exception:
+                        _logger.exception("error in callback for fd %d", key.fd)
+
+            self._run_calls()
+
+            now = monotonic()
+            for channel in self._channels:
+                try:
+                    channel.service(now)
+                except Exception:
+                    _logger.exception("error in servicing %r", channel)
+
+        # 止めた後に渡された処理も実行し、呼び出し元を待たせたままにしない
+        self._run_calls()
+
+    def _run_calls(self) -> None:
+        while self._calls:
+            func, done, errors = self._calls.popleft()
+            try:
+                func()
+            except Exception as err:
+                _logger.exception("error in calling %r", func)
+                errors.append(err)
+            finally:
+                done.set()
+
+    def _drain_wakeup(self) -> None:
+        """ループを起こすために書き込まれたバイトを読み捨てる"""
+        try:
+            os.read(self._wakeup_r, 4096)
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        """ループを止める。チャンネルは先に閉じておくこと"""
+        if self._is_closed:
+            return
+        self._is_closed = True
+        self.wakeup()
+        self._thread.join()
+        self._selector.close()
+        os.close(self._wakeup_r)
+        os.close(self._wakeup_w)
@@ -0,0 +1,329 @@
+import logging
+from collections.abc import Callable
+from threading import Lock
+from time import monotonic
+from typing import Any, Optional
+
+import serial
+
+from uart_bridge.domain.messages import RobotCommand, RobotStateSnapshot
+from uart_bridge.infra.app_logging import FrameHistory
+from uart_bridge.infra.codec import CsvCodec, RobotCodec
+from uart_bridge.infra.reconnect import ReconnectBackoff, create_device_watcher
+from uart_bridge.infra.serial_log import SerialRecorder
+from uart_bridge.infra.stats import BridgeStats
+from uart_bridge.infra.target_predictor import TargetPredictor
+from uart_bridge.infra.tx_scheduler import TxScheduler
+
+_logger = logging.getLogger(__name__)
+
+#: 読み出し可能になったファイルディスクリプタのコールバック（引数は検知した時刻）
+ReadCallback = Callable[[float], None]
+
+
+class SerialLink:
+    """1つのシリアルポートの送受信と再接続を行うクラス
+
+    受信したバイト列のデコード、送信スケジュールに従ったコマンドの送信、
+    切断時の再接続（間隔を倍々に伸ばし、デバイスが現れたら待たずに再接続）を
+    まとめて持つ。ファイルディスクリプタの監視とタイマーはドライバ
+    （`SerialRobotDriver` の I/O ループ、`AsyncSerialRobotDriver` の asyncio）が
+    受け持ち、以下の関数で受け渡す。
+
+    - `register(fd, callback)` / `unregister(fd)`: 読み出しの監視を頼む
+    - `on_update()`: 状態や接続状態が変化した
+    - `wakeup()`: `next_deadline` が早まったので待ち時間を計算し直してほしい
+
+    `start`, `stop`, `service` と登録したコールバックはドライバの I/O の
+    スレッドで呼ぶ。`set_send_values` は他のスレッドから呼んでよい。
+
+    Args:
+        port: シリアルポートのデバイス
+        register: ファイルディスクリプタの読み出しを監視する関数
+        unregister: 監視をやめる関数
+        on_update: 状態が更新されたときに呼ぶ関数
+        wakeup: 次の処理の時刻が早まったときに呼ぶ関数
+        baudrate: ボーレート
+        timeout: 最初の再接続の間隔[秒]
+        reconnect_max: 再接続の間隔の上限[秒]
+        codec: 通信フォーマット
+        tx_scheduler: コマンド送信のスケジューラ
+        stats: 各区間のレイテンシを記録する統計（None で記録しない）
+        recorder: 送受信したバイト列の記録先（None で記録しない）
+        frame_history: エラー時に書き出す直前の送受信フレーム（None で保持しない）
+        predictor: 送信のたびに照準を外挿する予測（None で外挿しない）
+    """
+
+    def __init__(
+        self,
+        port: str,
+        register: Callable[[int, ReadCallback], None],
+        unregister: Callable[[int], None],
+        on_update: Callable[[], None],
+        wakeup: Callable[[], None],
+        baudrate: int = 115200,
+        parity: Any = serial.PARITY_NONE,
+        stopbits: Any = serial.STOPBITS_ONE,
+        timeout: float = 0.01,
+        reconnect_max: float = 1.0,
+        codec: RobotCodec | None = None,
+        tx_scheduler: TxScheduler | None = None,
+        stats: BridgeStats | None = None,
+        recorder: SerialRecorder | None = None,
+        frame_history: FrameHistory | None = None,
+        predictor: TargetPredictor | None = None,
+    ) -> None:
+        self.port = port
+        self._register = register
+        self._unregister = unregister
+        self._on_update = on_update
+        self._wakeup = wakeup
+        self._baudrate = baudrate
+        self._parity = parity
+        self._stopbits = stopbits
+        self._serial: Optional[serial.Serial] = None
+        self._codec = codec if codec is not None else CsvCodec()
+        self._tx_scheduler = tx_scheduler if tx_scheduler is not None else TxScheduler()
+        self._stats = stats
+        self._recorder = recorder
+        self._frame_history = frame_history
+        self._predictor = predictor
+        self._corrupt_frames = 0  # 最後にフレームを書き出した時点の破損フレーム数
+        if stats is not None:
+            stats.add_counter("rx_dropped_frames", lambda: self.dropped_frames)
+            stats.add_counter("rx_corrupt_frames", lambda: self.corrupt_frames)
+            stats.add_counter("serial_reconnects", lambda: self.reconnects)
+            stats.add_counter("tx_overruns", lambda: self._tx_scheduler.overruns)
+            stats.add_counter("tx_skipped", lambda: self._tx_scheduler.skipped)
+
+        # 再接続の間隔とデバイスの出現の監視
+        self._backoff = ReconnectBackoff(timeout, reconnect_max)
+        self._retry_at = 0.0
+        self._last_error: str | None = None
+        self._connected = False
+        self._has_connected = False
+        self.reconnects = 0  # 切断後に再接続した回数
+        self._watcher = create_device_watcher(port)
+        self._device_appeared = False
+
+        # 最新のロボット状態（不変のスナップショットを差し替えるのでロック不要）
+        self.robot_state = RobotStateSnapshot()
+        self.state_version = 0  # 受信した状態の数
+
+        # 送信用の値とそのロック
+        self._send_lock = Lock()
+        self._send_values = RobotCommand()
+
+    def start(self) -> None:
+        """デバイスの監視を始め、シリアルポートを開く"""
+        if self._watcher is not None:
+            self._register(self._watcher.fileno(), self._on_device_event)
+        self._open_serial_port()
+
+    def stop(self) -> None:
+        """シリアルポートを閉じ、デバイスの監視をやめる"""
+        self._close_serial_port()
+        if self._watcher is not None:
+            self._unregister(self._watcher.fileno())
+            self._watcher.close()
+
+    def _open_serial_port(self) -> None:
+        """シリアルポートを開き、読み出しを監視する
+
+        失敗した場合は次に再接続を試みる時刻を決める。同じエラーは繰り返し表示しない。
+        """
+        try:
+            self._serial = serial.Serial(
+                port=self.port,
+                baudrate=self._baudrate,
+                stopbits=self._stopbits,
+                parity=self._parity,
+                timeout=0,  # 監視して読み出すのでノンブロッキング
+            )
+            self._register(self._serial.fileno(), self._receive)
+        except serial.SerialException as err:
+            if str(err) != self._last_error:
+                _logger.warning("cannot open %s: %s", self.port, err)
+                self._last_error = str(err)
+            self._serial = None
+            self._retry_at = monotonic() + self._backoff.next_delay()
+            return
+
+        self._backoff.reset()
+        self._last_error = None
+        with self._send_lock:
+            self._tx_scheduler.reset()
+        self._set_connected(True)
+
+    def _close_serial_port(self) -> None:
+        """シリアルポートを閉じ、受信途中のフレームを破棄する"""
+        if self._serial:
+            self._unregister(self._serial.fileno())
+            self._serial.close()
+        self._serial = None
+        self._codec.reset()
+
+    def _disconnect(self, err: Exception) -> None:
+        """通信に失敗したのでシリアルポートを閉じ、再接続を待つ"""
+        self._report("serial error on %s: %s", str(err))
+        self._close_serial_port()
+        self._set_connected(False)
+        self._wakeup()
+
+    def _report(self, msg: str, *args: object) -> None:
+        """エラーを出力する。直前に送受信したフレームがあれば一緒に書き出す
+
+        `msg` の最初の引数はポートで、エラーの種類とポートごとに間引かれる。
+        """
+        args = (self.port, *args)
+        extra = {"rate_limit_key": self.port}
+        if self._frame_history is not None:
+            self._frame_history.dump(_logger, msg, *args, extra=extra)
+        else:
+            _logger.error(msg, *args, extra=extra)
+
+    def _set_connected(self, connected: bool) -> None:
+        """接続状態が変化したら表示して通知する"""
+        if connected == self._connected:
+            return
+        if connected and self._has_connected:
+            self.reconnects += 1
+        self._connected = connected
+        self._has_connected |= connected
+        _logger.info(
+            "serial port %s %s",
+            self.port,
+            "connected" if connected else "disconnected",
+        )
+        self._on_update()
+
+    def _on_device_event(self, received_at: float) -> None:
+        """監視しているディレクトリに変化があった"""
+        assert self._watcher is not None
+        # 接続中は他のデバイスの変化なので読み捨てる
+        if self._watcher.read() and not self._serial:
+            # udev がパーミッションを設定するまで開けないことがあるので、
+            # 最初の間隔から再接続を試みる
+            self._backoff.reset()
+            self._device_appeared = True
+            self._wakeup()
+
+    def next_deadline(self) -> float:
+        """次に送信する時刻、切断中は次に再接続を試みる時刻"""
+        if self._serial:
+            with self._send_lock:
+                return self._tx_scheduler.next_deadline()
+        return 0.0 if self._device_appeared else self._retry_at
+
+    def service(self, now: float) -> None:
+        """送信時刻になっていれば送信し、切断中は再接続を試みる"""
+        if self._serial:
+            self._transmit(now)
+        elif self._device_appeared or now >= self._retry_at:
+            self._device_appeared = False
+            self._open_serial_port()
+
+    def _receive(self, received_at: float) -> None:
+        """届いているバイト列を読み出してデコードする
+
+        Args:
+            received_at: データが届いたことを検知した時刻
+        """
+        assert self._serial is not None
+        try:
+            buffer = self._serial.read(self._serial.in_waiting or 1)
+            _logger.debug("read state: %r", buffer)
+        except Exception as err:
+            self._disconnect(err)
+            return
+        if self._recorder is not None:
+            self._recorder.record_rx(received_at, buffer)
+        if self._frame_history is not None:
+            self._frame_history.append(received_at, "rx", buffer)
+
+        states = self._codec.feed(buffer)
+        if self._codec.corrupt_frames != self._corrupt_frames:
+            self._corrupt_frames = self._codec.corrupt_frames
+            self._report("corrupt frame from %s")
+        if not states:
+            return
+
+        stats = self._stats
+        if stats is not None:
+            stats.record("rx_parse", received_at, monotonic())
+            stats.mark_state_received(received_at)
+        self.robot_state = states[-1]
+        self.state_version += len(states)
+        if stats is not None:
+            stats.record("rx_swap", received_at, monotonic())
+        self._on_update()
+
+    def _transmit(self, now: float) -> None:
+        """送信時刻になっていればコマンドを送信する（排他制御）"""
+        assert self._serial is not None
+        with self._send_lock:
+            if not self._tx_scheduler.is_due(now):
+                return
+            deadline = self._tx_scheduler.scheduled_deadline()
+            previous = self._tx_scheduler.last_sent
+            changed = self._tx_scheduler.changed
+            command = self._send_values
+            if self._predictor is not None:
+                command = self._predictor.predict(command, now)
+            send_data = self._codec.encode(command)
+            self._tx_scheduler.mark_sent(now)
+        try:
+            self._serial.write(send_data)
+        except Exception as err:
+            self._disconnect(err)
+            return
+        if self._recorder is not None:
+            self._recorder.record_tx(now, send_data)
+        if self._frame_history is not None:
+            self._frame_history.append(now, "tx", send_data)
+
+        if self._stats is not None:
+            sent_at = monotonic()
+            self._stats.record_tx_timing(deadline, previous, now)
+            self._stats.record("tx_write", now, sent_at)
+            if changed:
+                self._stats.record_command_sent(sent_at)
+        _logger.debug("sent data: %r", send_data)
+
+    def set_send_values(
+        self, value: RobotCommand, received_at: float | None = None
+    ) -> None:
+        """マイコンへ送信する値を更新する
+
+        照準の予測には、値が変化していなくても `received_at` に届いた
+        認識結果として取り込む（None なら値が変化したときだけ現在時刻で取り込む）。
+        値が変化したか予測が更新された場合は `wakeup` を呼び、
+        送信スケジュールに反映させる。
+        """
+        with self._send_lock:
+            changed = value != self._send_values
+            observed = False
+            if self._predictor is not None and (changed or received_at is not None):
+                observed = self._predictor.observe(
+                    value, monotonic() if received_at is None else received_at
+                )
+            if not (changed or observed):
+                return
+            self._send_values = value
+            self._tx_scheduler.notify_changed()
+        self._wakeup()
+
+    @property
+    def connected(self) -> bool:
+        """シリアルポートに接続しているか"""
+        return self._connected
+
+    @property
+    def dropped_frames(self) -> int:
+        """取りこぼしたフレーム数"""
+        return self._codec.dropped_frames
+
+    @property
+    def corrupt_frames(self) -> int:
+        """破損していたフレーム数"""
+        return self._codec.corrupt_frames
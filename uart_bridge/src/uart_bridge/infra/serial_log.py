@@ -0,0 +1,150 @@
+import struct
+from collections import deque
+from collections.abc import Generator
+from pathlib import Path
+from threading import Event, Thread
+from typing import Any, BinaryIO, NamedTuple, Self, cast
+
+from uart_bridge.infra.codec import CodecName
+
+#: ファイルの先頭: マジック, バージョン, 通信フォーマット名（NUL 埋め）
+HEADER = struct.Struct("<4sB8s")
+MAGIC = b"UBLG"
+VERSION = 1
+
+#: 記録の先頭: 向き, 時刻（`time.monotonic()`）, バイト列の長さ
+RECORD = struct.Struct("<BdI")
+RX = 0
+TX = 1
+
+
+class SerialLogRecord(NamedTuple):
+    """シリアル通信の記録1件分"""
+
+    direction: int  # RX or TX
+    timestamp: float
+    data: bytes
+
+
+class SerialRecorder:
+    """シリアル通信で送受信したバイト列をファイルに記録するクラス
+
+    `record_rx` / `record_tx` は固定長のキューに積むだけで I/O ループを
+    止めない。書き込みは別スレッドが `flush_interval` ごとにまとめて行う。
+    書き込みが追いつかずキューが溢れた場合は、その記録を捨てて数える。
+
+    Args:
+        path: 記録するファイルのパス（既存のファイルは上書きする）
+        codec: 記録する通信フォーマットの名前（再生時にデコードに使う）
+        flush_interval: ファイルに書き込む間隔[秒]
+        capacity: 書き込み待ちにできる記録の数
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        codec: CodecName = "csv",
+        flush_interval: float = 0.1,
+        capacity: int = 65536,
+    ) -> None:
+        self.path = Path(path)
+        self._flush_interval = flush_interval
+        self._capacity = capacity
+        # deque の append/popleft はスレッドセーフなのでロック不要
+        self._queue: deque[tuple[int, float, bytes]] = deque()
+        self.recorded = 0  # ファイルに書き込んだ記録の数
+        self.dropped = 0  # キューが溢れて捨てた記録の数
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, codec.encode()))
+
+        self._stop = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close()
+
+    def record_rx(self, timestamp: float, data: bytes) -> None:
+        """受信したバイト列を記録する"""
+        self._record(RX, timestamp, data)
+
+    def record_tx(self, timestamp: float, data: bytes) -> None:
+        """送信したバイト列を記録する"""
+        self._record(TX, timestamp, data)
+
+    def _record(self, direction: int, timestamp: float, data: bytes) -> None:
+        if len(self._queue) >= self._capacity:
+            self.dropped += 1
+            return
+        self._queue.append((direction, timestamp, data))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._flush_interval):
+            self._write_pending()
+        self._write_pending()
+
+    def _write_pending(self) -> None:
+        """キューに溜まった記録をまとめて書き込む"""
+        queue = self._queue
+        chunks: list[bytes] = []
+        while queue:
+            direction, timestamp, data = queue.popleft()
+            chunks.append(RECORD.pack(direction, timestamp, len(data)))
+            chunks.append(data)
+        if not chunks:
+            return
+        self._file.write(b"".join(chunks))
+        self._file.flush()
+        self.recorded += len(chunks) // 2
+
+    def close(self) -> None:
+        """書き込み待ちの記録をすべて書き込んでファイルを閉じる"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        self._file.close()
+
+
+def _read_exactly(file: BinaryIO, size: int) -> bytes | None:
+    data = file.read(size)
+    return data if len(data) == size else None
+
+
+def read_serial_log(
+    path: Path | str,
+) -> tuple[CodecName, Generator[SerialLogRecord, None, None]]:
+    """記録したファイルを読み、通信フォーマットの名前と記録のイテレータを返す
+
+    書き込み途中で終了したファイルは、最後の完全な記録まで読む。
+    ファイルは読み終えるか、イテレータを `close()` したときに閉じる。
+    """
+    file = open(path, "rb")
+    header = _read_exactly(file, HEADER.size)
+    if header is None:
+        file.close()
+        raise ValueError(f"{path} is not a serial log")
+    magic, version, codec = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        file.close()
+        raise ValueError(f"{path} is not a serial log (version {VERSION})")
+    codec_name = codec.rstrip(b"\0").decode()
+    if codec_name not in ("csv", "binary"):
+        file.close()
+        raise ValueError(f"unknown codec in {path}: {codec_name}")
+
+    def records() -> Generator[SerialLogRecord, None, None]:
+        with file:
+            while (head := _read_exactly(file, RECORD.size)) is not None:
+                direction, timestamp, size = RECORD.unpack(head)
+                data = _read_exactly(file, size)
+                if data is None:
+                    return
+                yield SerialLogRecord(direction, timestamp, data)
+
+    return cast(CodecName, codec_name), records()
@@ -1,21 +1,49 @@
-from copy import deepcopy
-from threading import Lock, Thread
-from time import sleep
-from typing import Any, Optional
+import logging
+from typing import Any
 
 import serial
 
 from uart_bridge.application.interfaces import RobotDriver
-from uart_bridge.domain.messages import RobotCommand, RobotState, RobotStateId
+from uart_bridge.domain.messages import RobotCommand, RobotState, RobotStateSnapshot
+from uart_bridge.infra.app_logging import FrameHistory
+from uart_bridge.infra.codec import RobotCodec
+from uart_bridge.infra.serial_io_loop import IoChannel, SerialIoLoop
+from uart_bridge.infra.serial_link import SerialLink
+from uart_bridge.infra.serial_log import SerialRecorder
+from uart_bridge.infra.stats import BridgeStats
+from uart_bridge.infra.target_predictor import TargetPredictor
+from uart_bridge.infra.tx_scheduler import TxScheduler
 
+_logger = logging.getLogger(__name__)
 
-class SerialRobotDriver(RobotDriver):
+
+class SerialRobotDriver(RobotDriver, IoChannel):
     """マイコンと通信しロボットを制御するクラス
 
+    シリアルポートのファイルディスクリプタを `SerialIoLoop` の selector で監視し、
+    データが届いた時点で読み出してフレームをデコードする。
+    コマンドの送信は受信とは独立に `tx_scheduler` のタイミングで行う。
+    複数のドライバで1つの `io_loop` を共有すると、1つのスレッドで
+    すべてのシリアルポートを扱う。
+
+    切断された場合は `timeout` から `reconnect_max` まで間隔を倍々に伸ばしながら
+    再接続を試みる。デバイスファイルの作成を inotify で監視し、
+    デバイスが現れたら間隔を待たずに再接続する。
+    送受信と再接続の処理は `SerialLink` が行い、このクラスは I/O ループとの
+    受け渡しだけを行う。
+
     Args:
         port: シリアルポートのデバイス
         baudrate: ボーレート
-        timeout: readのタイムアウト[秒]
+        timeout: 最初の再接続の間隔[秒]
+        reconnect_max: 再接続の間隔の上限[秒]
+        codec: 通信フォーマット
+        tx_scheduler: コマンド送信のスケジューラ
+        stats: 各区間のレイテンシを記録する統計（None で記録しない）
+        recorder: 送受信したバイト列の記録先（None で記録しない）
+        frame_history: エラー時に書き出す直前の送受信フレーム（None で保持しない）
+        predictor: 送信のたびに照準を外挿する予測（None で外挿しない）
+        io_loop: 共有する I/O ループ（None で専用のループを作る）
     """
 
     def __init__(
@@ -25,119 +53,104 @@ class SerialRobotDriver(RobotDriver):
         parity: Any = serial.PARITY_NONE,
         stopbits: Any = serial.STOPBITS_ONE,
         timeout: float = 0.01,  # 10ms timeout
+        reconnect_max: float = 1.0,
+        codec: RobotCodec | None = None,
+        tx_scheduler: TxScheduler | None = None,
+        stats: BridgeStats | None = None,
+        recorder: SerialRecorder | None = None,
+        frame_history: FrameHistory | None = None,
+        predictor: TargetPredictor | None = None,
+        io_loop: SerialIoLoop | None = None,
     ) -> None:
-        self._port = port
-        self._baudrate = baudrate
-        self._parity = parity
-        self._stopbits = stopbits
-        self._timeout = timeout
-        self._serial: Optional[serial.Serial] = None
-        self._open_serial_port()
-
-        # 初期ロボット状態（排他制御用ロック付き）
-        self._state_lock = Lock()
-        self._robot_state = RobotState()
-
-        # 送信用の値とそのロック
-        self._send_lock = Lock()
-        self._send_values = RobotCommand()
+        self._owns_loop = io_loop is None
+        self._loop = io_loop if io_loop is not None else SerialIoLoop()
+        self._link = SerialLink(
+            port,
+            register=self._loop.register,
+            unregister=self._loop.unregister,
+            on_update=self._notify_update,
+            wakeup=self._loop.wakeup,
+            baudrate=baudrate,
+            parity=parity,
+            stopbits=stopbits,
+            timeout=timeout,
+            reconnect_max=reconnect_max,
+            codec=codec,
+            tx_scheduler=tx_scheduler,
+            stats=stats,
+            recorder=recorder,
+            frame_history=frame_history,
+            predictor=predictor,
+        )
 
         self._is_closed = False
-        self._thread = Thread(target=self._update_robot_state, daemon=True)
-        self._thread.start()
-
-    def _open_serial_port(self) -> None:
-        """シリアルポートを開く"""
-        try:
-            self._serial = serial.Serial(
-                port=self._port,
-                baudrate=self._baudrate,
-                stopbits=self._stopbits,
-                parity=self._parity,
-                timeout=self._timeout,
-            )
-        except serial.SerialException as err:
-            print(err)
-            self._serial = None
-
-    def _update_robot_state(self) -> None:
-        """10ms間隔でシリアル通信の受信と送信を実施する"""
-        while not self._is_closed:
-            if not self._serial:
-                sleep(0.01)
-                self._open_serial_port()
-                continue
-
-            try:
-                buffer = self._serial.readline()
-                print(f"read state: {buffer!r}")
-            except Exception as err:
-                print(err)
-                if self._serial:
-                    self._serial.close()
-                self._serial = None
-                continue
-
-            try:
-                str_data = buffer.decode("ascii")
-            except UnicodeDecodeError as err:
-                print(err)
-                continue
-
-            if "\n" in str_data:
-                try:
-                    str_data = str_data.strip()
-                    parts = str_data.split(",")
-                    if len(parts) < 8:
-                        # 必要な項目が揃っていなければスキップ
-                        continue
-                    new_state = RobotState(
-                        state_id=RobotStateId(int(parts[0])),
-                        pitch_deg=float(parts[1]) / 10.0,
-                        muzzle_velocity=float(parts[2]) / 1000,
-                        reloaded_left_disks=int(parts[3]),
-                        reloaded_right_disks=int(parts[4]),
-                        video_id=int(parts[5]),
-                        target_panel=bool((int(parts[6]) >> 3) & 0b00000001),
-                        auto_aim=bool((int(parts[6]) >> 2) & 0b00000001),
-                        record_video=bool((int(parts[6]) >> 1) & 0b00000001),
-                        ready_to_fire=bool((int(parts[6]) >> 0) & 0b00000001),
-                        reserved=int(parts[7]),
-                    )
-                    with self._state_lock:
-                        self._robot_state = new_state
-                except ValueError as err:
-                    print(err)
-                    continue
-
-            # 受信後すぐに送信処理を実施（排他制御）
-            with self._send_lock:
-                send_str = self._send_values.to_str()
-            try:
-                self._serial.write(send_str.encode())
-                print(f"sent data: {send_str.strip()}")
-            except Exception as err:
-                print(err)
-                if self._serial:
-                    self._serial.close()
-                self._serial = None
-                continue
-
-            sleep(0.01)  # 10ms間隔
-
-    def set_send_values(self, value: RobotCommand) -> None:
-        """マイコンへ送信する整数値を更新する"""
-        with self._send_lock:
-            self._send_values = value
+        self._loop.call(self._start)
+
+    def _start(self) -> None:
+        """シリアルポートを開き、I/O ループに登録する（ループのスレッドで呼ぶ）"""
+        self._link.start()
+        self._loop.add(self)
+
+    def _stop(self) -> None:
+        """I/O ループから外し、シリアルポートを閉じる（ループのスレッドで呼ぶ）"""
+        self._loop.remove(self)
+        self._link.stop()
+
+    def next_deadline(self) -> float:
+        """次に送信する時刻、切断中は次に再接続を試みる時刻"""
+        return self._link.next_deadline()
+
+    def service(self, now: float) -> None:
+        """送信時刻になっていれば送信し、切断中は再接続を試みる"""
+        self._link.service(now)
+
+    def set_send_values(
+        self, value: RobotCommand, received_at: float | None = None
+    ) -> None:
+        """マイコンへ送信する整数値を更新する
+
+        値が変化した場合や、照準の予測が新しい認識結果（`received_at`）を
+        取り込んだ場合は I/O ループを起こし、送信スケジュールに反映させる。
+        """
+        self._link.set_send_values(value, received_at)
+
+    def is_connected(self) -> bool:
+        """シリアルポートに接続しているか"""
+        return self._link.connected
+
+    @property
+    def reconnects(self) -> int:
+        """切断後に再接続した回数"""
+        return self._link.reconnects
+
+    @property
+    def dropped_frames(self) -> int:
+        """取りこぼしたフレーム数"""
+        return self._link.dropped_frames
+
+    @property
+    def corrupt_frames(self) -> int:
+        """破損していたフレーム数"""
+        return self._link.corrupt_frames
+
+    @property
+    def state_version(self) -> int:
+        """受信した状態の数（状態が更新されるたびに増える）"""
+        return self._link.state_version
+
+    def get_state_snapshot(self) -> RobotStateSnapshot:
+        """最新のロボットの状態をスナップショットで返す"""
+        return self._link.robot_state
 
     def get_robot_state(self) -> RobotState:
         """最新のロボットの状態を返す"""
-        with self._state_lock:
-            return deepcopy(self._robot_state)
+        return self._link.robot_state.to_model()
 
     def close(self) -> None:
-        print("closing robot driver")
+        _logger.info("closing robot driver")
+        if self._is_closed:
+            return
         self._is_closed = True
-        self._thread.join()
-        if self._serial:
-            self._serial.close()
+        self._loop.call(self._stop)
+        if self._owns_loop:
+            self._loop.close()
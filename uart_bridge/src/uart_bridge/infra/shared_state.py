@@ -0,0 +1,71 @@
+import time
+from collections.abc import Iterable
+from struct import Struct
+from typing import Any
+
+_SEQ = Struct("<Q")
+
+
+class SeqlockSlot:
+    """共有メモリ上の固定長の値を、ロックを取らずに受け渡すスロット（seqlock）
+
+    先頭の 8 バイトがシーケンス番号で、その後ろに `layout` の値が続く。
+    書き込み側は番号を奇数にしてから値を書き、書き終えたら偶数に戻す。
+    読み出し側は値を読む前後で番号が同じ偶数なら、途中で書き換えられていない
+    値として返す。書き込み側は1つ（1つのプロセスの1つのスレッド）に限る。
+
+    書き込み側のプロセスが書き込み途中で終了すると番号は奇数のまま残る。
+    `MAX_READ_RETRIES` 回読み直しても読めなければ `stale` を立て、
+    最後に読めた値を返す。
+
+    Args:
+        buf: 共有メモリのバッファ（`SharedMemory.buf`）
+        offset: スロットの先頭のバイト位置
+        layout: 値の構造
+    """
+
+    #: 書き込み途中の値を読み直す回数の上限
+    MAX_READ_RETRIES = 10000
+
+    def __init__(self, buf: memoryview, offset: int, layout: Struct) -> None:
+        self._buf = buf
+        self._offset = offset
+        self._layout = layout
+        (self._seq,) = _SEQ.unpack_from(buf, offset)
+        self._last: tuple[Any, ...] = layout.unpack(bytes(layout.size))
+        self.stale = False  # 書き込み途中のまま読めなくなっているか
+
+    @staticmethod
+    def size(layout: Struct) -> int:
+        """`layout` の値を置くスロットのバイト数"""
+        return _SEQ.size + layout.size
+
+    @property
+    def version(self) -> int:
+        """書き込まれた回数"""
+        (seq,) = _SEQ.unpack_from(self._buf, self._offset)
+        return int(seq) // 2
+
+    def write(self, values: Iterable[Any]) -> None:
+        """値を書き込む"""
+        seq = self._seq + 1
+        _SEQ.pack_into(self._buf, self._offset, seq)
+        self._layout.pack_into(self._buf, self._offset + _SEQ.size, *values)
+        self._seq = seq + 1
+        _SEQ.pack_into(self._buf, self._offset, self._seq)
+
+    def read(self) -> tuple[Any, ...]:
+        """書き込み途中でない値を読み出す（読めなければ最後に読めた値）"""
+        for _ in range(self.MAX_READ_RETRIES):
+            (before,) = _SEQ.unpack_from(self._buf, self._offset)
+            if before & 1:
+                time.sleep(0)  # 書き込み側のプロセスに譲る
+                continue
+            values = self._layout.unpack_from(self._buf, self._offset + _SEQ.size)
+            (after,) = _SEQ.unpack_from(self._buf, self._offset)
+            if before == after:
+                self._last = values
+                self.stale = False
+                return values
+        self.stale = True
+        return self._last
@@ -0,0 +1,171 @@
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Mapping
+from threading import Lock
+from typing import Any
+
+import msgpack  # type: ignore[import-untyped]
+
+from uart_bridge.domain.messages import RobotStateSnapshot
+
+#: 列ごとの array の型コード（timestamp は UNIX時刻[秒]）
+COLUMNS: dict[str, str] = {
+    "timestamp": "d",
+    "state_id": "i",
+    "pitch_deg": "f",
+    "muzzle_velocity": "f",
+    "reloaded_left_disks": "i",
+    "reloaded_right_disks": "i",
+    "video_id": "i",
+    "target_panel": "B",
+    "auto_aim": "B",
+    "record_video": "B",
+    "ready_to_fire": "B",
+    "reserved": "i",
+}
+
+#: 型コードと、ペイロードに書く NumPy 形式の型（リトルエンディアン）
+_DTYPES = {"d": "<f8", "f": "<f4", "i": "<i4", "B": "|u1"}
+_TYPECODES = {dtype: code for code, dtype in _DTYPES.items()}
+
+
+class _TimestampView:
+    """古い順に並べた時刻を bisect で探すための読み出し専用のビュー"""
+
+    def __init__(self, timestamps: array[Any], first: int, length: int) -> None:
+        self._timestamps = timestamps
+        self._first = first
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> float:
+        return float(self._timestamps[(self._first + index) % len(self._timestamps)])
+
+
+class StateHistory:
+    """直近の `capacity` 件の状態を列ごとの array に保持するリングバッファ
+
+    状態を配信するたびに `append` で時刻と一緒に書き込み、古いものから
+    上書きする。`select` で時刻の範囲や直近の件数を指定して取り出し、
+    `pack_history` で列ごとのバイト列にまとめて返す。
+
+    書き込みは配信のスレッド、読み出しは Zenoh のスレッドから行うのでロックを取る。
+    時刻は古い順に並んでいるものとして二分探索する。
+
+    Args:
+        capacity: 保持する状態の数
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._capacity = capacity
+        self._columns: dict[str, array[Any]] = {
+            name: array(code, bytes(array(code).itemsize * capacity))
+            for name, code in COLUMNS.items()
+        }
+        self._timestamps = self._columns["timestamp"]
+        self._state_columns = [
+            self._columns[name] for name in RobotStateSnapshot._fields
+        ]
+        self._count = 0  # 書き込んだ総数
+        self._lock = Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return min(self._count, self._capacity)
+
+    def append(self, timestamp: float, state: RobotStateSnapshot) -> None:
+        """状態を1件書き込む（一杯なら最も古いものを上書きする）"""
+        with self._lock:
+            i = self._count % self._capacity
+            self._timestamps[i] = timestamp
+            for column, value in zip(self._state_columns, state):
+                column[i] = value
+            self._count += 1
+
+    def select(
+        self,
+        last: int | None = None,
+        start: float | None = None,
+        end: float | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> dict[str, array[Any]]:
+        """条件に合う状態を古い順に列ごとの array で返す
+
+        Args:
+            last: 直近の件数（範囲を指定した場合はその中の直近の件数）
+            start: この時刻以降の状態
+            end: この時刻以前の状態
+            fields: 返す列（None ですべて。timestamp は常に含む）
+        """
+        names = ["timestamp"]
+        if fields is None:
+            names = list(COLUMNS)
+        else:
+            for name in fields:
+                if name not in COLUMNS:
+                    raise ValueError(f"unknown field: {name}")
+                if name not in names:
+                    names.append(name)
+
+        with self._lock:
+            length = len(self)
+            first = self._count % self._capacity if self._count > self._capacity else 0
+            view = _TimestampView(self._timestamps, first, length)
+            lo = 0 if start is None else bisect_left(view, start)
+            hi = length if end is None else bisect_right(view, end)
+            if last is not None:
+                lo = max(lo, hi - last)
+            hi = max(lo, hi)
+            return {
+                name: self._slice(self._columns[name], first + lo, first + hi)
+                for name in names
+            }
+
+    def _slice(self, column: array[Any], begin: int, end: int) -> array[Any]:
+        """リングバッファ上の位置 [begin, end) をつなげた array を返す"""
+        capacity = self._capacity
+        if end <= capacity:
+            return column[begin:end]
+        if begin >= capacity:
+            return column[begin - capacity : end - capacity]
+        return column[begin:] + column[: end - capacity]
+
+
+def pack_history(columns: Mapping[str, array[Any]]) -> bytes:
+    """`StateHistory.select` の結果を msgpack の map にエンコードする
+
+    `count`（件数）と、列名ごとに `type`（NumPy 形式の型）と `data`（値を
+    リトルエンディアンで詰めたバイト列）を持つ map を `columns` に入れる。
+    NumPy では `np.frombuffer(data, dtype=type)` でそのまま読める。
+    """
+    count = len(columns["timestamp"])
+    packed = {}
+    for name, column in columns.items():
+        if sys.byteorder == "big":
+            column = array(column.typecode, column)
+            column.byteswap()
+        packed[name] = {"type": _DTYPES[column.typecode], "data": column.tobytes()}
+    return msgpack.packb(  # type: ignore[no-any-return]
+        {"count": count, "columns": packed}
+    )
+
+
+def unpack_history(data: bytes) -> dict[str, array[Any]]:
+    """`pack_history` でエンコードしたペイロードを列ごとの array に戻す"""
+    payload = msgpack.unpackb(data)
+    columns: dict[str, array[Any]] = {}
+    for name, column in payload["columns"].items():
+        values = array(_TYPECODES[column["type"]])
+        values.frombytes(column["data"])
+        if sys.byteorder == "big":
+            values.byteswap()
+        columns[name] = values
+    return columns
@@ -0,0 +1,32 @@
+import msgpack  # type: ignore[import-untyped]
+import zenoh
+
+from uart_bridge.domain.messages import RobotStateSnapshot
+
+#: `robot/state` に配信するペイロードのエンコーディング
+ENCODING = zenoh.Encoding("application/msgpack")
+
+
+def pack_state(snapshot: RobotStateSnapshot, seq: int, timestamp: float) -> bytes:
+    """ロボットの状態をまとめて msgpack の map にエンコードする
+
+    LiDAR のデータと同様にフィールド名をキーとする map で、
+    状態の各フィールドに加えて `seq`（配信ごとに増える番号）と
+    `timestamp`（UNIX時刻[秒]）を含む。
+    """
+    payload: dict[str, object] = snapshot._asdict()
+    payload["seq"] = seq
+    payload["timestamp"] = timestamp
+    return msgpack.packb(payload)  # type: ignore[no-any-return]
+
+
+def unpack_state(data: bytes) -> tuple[RobotStateSnapshot, int, float]:
+    """`pack_state` でエンコードしたペイロードをデコードする
+
+    Returns:
+        (スナップショット, seq, timestamp)
+    """
+    payload = msgpack.unpackb(data)
+    seq = payload.pop("seq")
+    timestamp = payload.pop("timestamp")
+    return RobotStateSnapshot(**payload), seq, timestamp
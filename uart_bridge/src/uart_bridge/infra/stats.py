@@ -0,0 +1,151 @@
+from bisect import bisect_left
+from collections.abc import Callable
+from time import monotonic
+from typing import Any
+
+#: 計測する区間
+#:
+#: - rx_parse: シリアルの受信 → フレームのデコード完了
+#: - rx_swap: シリアルの受信 → 最新の状態の差し替え
+#: - rx_publish: シリアルの受信 → Zenoh への配信完了
+#: - cmd_intake: コマンド入力の到着 → RobotCommand の生成
+#: - cmd_tx: コマンド入力の到着 → シリアルへの書き込み完了
+#: - tx_write: シリアルへの書き込みにかかった時間
+#: - tx_jitter: 周期・ハートビートの送信時刻 → 送信の開始（送信の遅れ）
+#: - tx_period: 前回の送信の開始 → 今回の送信の開始（実際の送信周期）
+STAGES = (
+    "rx_parse",
+    "rx_swap",
+    "rx_publish",
+    "cmd_intake",
+    "cmd_tx",
+    "tx_write",
+    "tx_jitter",
+    "tx_period",
+)
+
+
+class LatencyHistogram:
+    """対数間隔のバケットで時間[秒]の分布を数えるヒストグラム
+
+    1µs から約16秒までを 2^(1/4) 倍（約19%）刻みのバケットに分ける。
+    パーセンタイルはバケットの上限値で返す。記録は O(log n) の二分探索と
+    加算だけで、ロックは取らない（記録するスレッドは区間ごとに1つ）。
+    """
+
+    BOUNDS = tuple(1e-6 * 2 ** (i / 4) for i in range(97))
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """q (0〜1) パーセンタイルの値[秒]。記録が無ければ 0"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        total = 0
+        for i, n in enumerate(self.counts):
+            total += n
+            if total >= rank and n:
+                break
+        if i == len(self.BOUNDS):
+            return self.max
+        return min(self.BOUNDS[i], self.max)
+
+    def summary(self) -> dict[str, float]:
+        """件数と p50/p95/p99/max[µs] を返す"""
+        return {
+            "count": self.count,
+            "p50_us": self.percentile(0.50) * 1e6,
+            "p95_us": self.percentile(0.95) * 1e6,
+            "p99_us": self.percentile(0.99) * 1e6,
+            "max_us": self.max * 1e6,
+        }
+
+
+class BridgeStats:
+    """uart_bridge の各区間のレイテンシと取りこぼしの統計
+
+    各区間の起点の時刻（`time.monotonic()`）を受け渡し、区間ごとの
+    ヒストグラムに記録する。取りこぼしなどのカウンタは、値を返す関数を
+    `add_counter` で登録しておき、`summary` を呼んだときにだけ読み出す。
+    """
+
+    def __init__(self) -> None:
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self._counters: dict[str, Callable[[], int]] = {}
+        self._histogram_sources: dict[str, Callable[[], LatencyHistogram]] = {}
+        self._started_at = monotonic()
+
+        # 最新の状態を受信した時刻
+        self.state_received_at: float | None = None
+        # まだ送信していないコマンドの入力が届いた時刻
+        self._command_received_at: float | None = None
+
+    def record(self, stage: str, start: float, end: float) -> None:
+        """区間 `stage` の時間を記録する"""
+        self.histograms[stage].record(end - start)
+
+    def mark_state_received(self, received_at: float) -> None:
+        """最新の状態の受信時刻を記録する（rx_publish の起点）"""
+        self.state_received_at = received_at
+
+    def record_publish(self, now: float) -> None:
+        """最新の状態を配信し終えたことを記録する"""
+        if self.state_received_at is not None:
+            self.record("rx_publish", self.state_received_at, now)
+
+    def mark_command_received(self, received_at: float) -> None:
+        """新しいコマンドの入力の到着時刻を記録する（cmd_tx の起点）"""
+        self._command_received_at = received_at
+
+    def record_command_sent(self, now: float) -> None:
+        """新しいコマンドを書き込み終えたことを記録する"""
+        received_at, self._command_received_at = self._command_received_at, None
+        if received_at is not None:
+            self.record("cmd_tx", received_at, now)
+
+    def record_tx_timing(self, deadline: float, previous: float, now: float) -> None:
+        """送信の締め切りからの遅れと、前回の送信からの間隔を記録する
+
+        最初の送信やコマンドの変化による送信など、締め切りや前回の送信が
+        無い（-inf）場合は記録しない。
+        """
+        if deadline != float("-inf"):
+            self.record("tx_jitter", deadline, now)
+        if previous != float("-inf"):
+            self.record("tx_period", previous, now)
+
+    def add_counter(self, name: str, counter: Callable[[], int]) -> None:
+        """`summary` に含めるカウンタを登録する"""
+        self._counters[name] = counter
+
+    def add_histogram(
+        self, stage: str, histogram: Callable[[], LatencyHistogram]
+    ) -> None:
+        """`summary` で区間 `stage` の統計を、関数が返すヒストグラムから集計する
+
+        別のプロセスで計測した区間を読み出す場合などに使う。
+        """
+        self._histogram_sources[stage] = histogram
+
+    def summary(self) -> dict[str, Any]:
+        """区間ごとの統計とカウンタをまとめて返す"""
+        histograms = dict(self.histograms)
+        for stage, source in self._histogram_sources.items():
+            histograms[stage] = source()
+        return {
+            "uptime_s": monotonic() - self._started_at,
+            "latency": {
+                stage: histogram.summary() for stage, histogram in histograms.items()
+            },
+            "counters": {name: counter() for name, counter in self._counters.items()},
+        }
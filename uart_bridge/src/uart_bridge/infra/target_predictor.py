@@ -0,0 +1,124 @@
+import math
+
+from uart_bridge.domain.config import TargetPredictionConfig
+from uart_bridge.domain.messages import RobotCommand
+
+#: 照準を外したときに認識側が送る値（target_x, target_y, target_distance）
+_NO_TARGET = (
+    RobotCommand().target_x,
+    RobotCommand().target_y,
+    RobotCommand().target_distance,
+)
+
+
+class AlphaBetaFilter:
+    """1軸の位置と速度を推定する α-β フィルタ
+
+    観測のたびに、前回の推定から等速で進めた位置との差（残差）の
+    `alpha` 倍を位置に、`beta / 経過時間` 倍を速度に反映する。
+
+    Args:
+        alpha: 位置の補正の割合（0〜1）
+        beta: 速度の補正の割合（0〜2）
+    """
+
+    def __init__(self, alpha: float, beta: float) -> None:
+        self._alpha = alpha
+        self._beta = beta
+        self.position = 0.0
+        self.velocity = 0.0  # 1秒あたりの変化量
+        self.time = -math.inf  # 最後に観測した時刻
+
+    def reset(self, position: float, time: float) -> None:
+        """観測した位置から、静止しているものとして推定し直す"""
+        self.position = position
+        self.velocity = 0.0
+        self.time = time
+
+    def update(self, position: float, time: float) -> None:
+        dt = time - self.time
+        if dt <= 0:
+            self.reset(position, time)
+            return
+        predicted = self.position + self.velocity * dt
+        residual = position - predicted
+        self.position = predicted + self._alpha * residual
+        self.velocity += self._beta / dt * residual
+        self.time = time
+
+    def predict(self, time: float) -> float:
+        """`time` での位置を等速で外挿する"""
+        return self.position + self.velocity * (time - self.time)
+
+
+class TargetPredictor:
+    """カメラの認識結果の間を、照準の位置を外挿して埋める
+
+    認識結果（`target_x`, `target_y`, `target_distance`）が届くたびに、
+    値が変化していなくても `observe` でその到着時刻と一緒に渡し、
+    送信のたびに `predict` で現在時刻（+ `lead`）まで α-β フィルタで
+    外挿したコマンドを作る。照準以外のフィールドはそのまま。
+
+    最後の観測から `max_horizon` を超えて外挿する場合や、照準を外した値・
+    `max_jump` を超えて跳んだ値（別のパネルに切り替わった）を観測した場合は、
+    外挿せずに観測した値を使う。
+
+    Args:
+        config: 予測の設定
+    """
+
+    def __init__(self, config: TargetPredictionConfig) -> None:
+        self._axes = [AlphaBetaFilter(config.alpha, config.beta) for _ in range(3)]
+        self._lead = config.lead_ms / 1000
+        self._max_horizon = config.max_horizon_ms / 1000
+        self._max_jump = config.max_jump_px
+        self._observed: tuple[int, int, int] | None = None
+        self._tracking = False  # 外挿できる観測が続いているか
+
+    def observe(self, command: RobotCommand, time: float) -> bool:
+        """認識結果の照準を、`time` に観測したものとして取り込む
+
+        照準が前回と同じでも、時刻が新しければ取り込む（止まった照準の速度が
+        0 に近づく）。照準と時刻が前回と同じ（同じ認識結果）なら取り込まない。
+
+        Returns:
+            取り込んだか
+        """
+        target = (command.target_x, command.target_y, command.target_distance)
+        if target == self._observed and time == self._axes[0].time:
+            return False
+        previous, self._observed = self._observed, target
+        jumped = previous is None or (
+            math.hypot(target[0] - previous[0], target[1] - previous[1])
+            > self._max_jump
+        )
+        stale = time - self._axes[0].time > self._max_horizon
+        if target == _NO_TARGET or jumped or stale:
+            for axis, value in zip(self._axes, target):
+                axis.reset(value, time)
+            self._tracking = target != _NO_TARGET
+            return True
+        for axis, value in zip(self._axes, target):
+            axis.update(value, time)
+        return True
+
+    def predict(self, command: RobotCommand, now: float) -> RobotCommand:
+        """`now` に送信するコマンドの照準を外挿する"""
+        if not self._tracking or self._observed != (
+            command.target_x,
+            command.target_y,
+            command.target_distance,
+        ):
+            return command
+        time = now + self._lead
+        if time - self._axes[0].time > self._max_horizon:
+            return command
+        x, y, distance = (round(axis.predict(time)) for axis in self._axes)
+        return command.model_copy(
+            update={"target_x": x, "target_y": y, "target_distance": max(distance, 0)}
+        )
+
+
+def create_target_predictor(config: TargetPredictionConfig) -> TargetPredictor | None:
+    """設定から照準の予測を作る（無効なら None）"""
+    return TargetPredictor(config) if config.enabled else None
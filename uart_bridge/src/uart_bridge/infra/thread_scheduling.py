@@ -0,0 +1,39 @@
+import logging
+import os
+import threading
+
+from uart_bridge.domain.config import ThreadSchedulingConfig
+
+_logger = logging.getLogger(__name__)
+
+
+def apply_thread_scheduling(config: ThreadSchedulingConfig) -> None:
+    """呼び出したスレッドの CPU・スケジューリングポリシー・nice 値を設定する
+
+    Linux ではいずれもスレッドごとの設定なので、シリアル通信を行うスレッドで
+    呼ぶ。権限が無いなどで設定できなかった項目は警告を出力して続行する。
+    """
+    tid = threading.get_native_id()
+    if config.cpu_affinity:
+        try:
+            os.sched_setaffinity(tid, config.cpu_affinity)
+        except (OSError, AttributeError) as err:
+            _logger.warning(
+                "failed to set CPU affinity %s: %s", config.cpu_affinity, err
+            )
+
+    if config.sched_fifo_priority is not None:
+        try:
+            os.sched_setscheduler(
+                tid, os.SCHED_FIFO, os.sched_param(config.sched_fifo_priority)
+            )
+        except (OSError, AttributeError) as err:
+            _logger.warning(
+                "failed to set SCHED_FIFO %s: %s", config.sched_fifo_priority, err
+            )
+
+    if config.nice is not None:
+        try:
+            os.setpriority(os.PRIO_PROCESS, tid, config.nice)
+        except (OSError, AttributeError) as err:
+            _logger.warning("failed to set nice %s: %s", config.nice, err)
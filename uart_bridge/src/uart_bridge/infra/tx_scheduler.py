@@ -0,0 +1,134 @@
+import math
+from typing import Literal
+
+TxMode = Literal["on_change", "periodic"]
+TxOverrun = Literal["skip", "catch_up"]
+
+#: catch_up で続けて送信する遅れの上限[周期]。これを超えた分は読み飛ばす
+MAX_CATCH_UP = 5
+
+
+class TxScheduler:
+    """マイコンへのコマンド送信のタイミングを決めるクラス
+
+    受信とは独立に、以下のどちらかのモードで送信する。
+
+    - on_change: コマンドが変化したら最短 `min_interval` 間隔で即座に送信し、
+      変化が無くても `1 / rate_hz` ごとにハートビートとして送信する
+    - periodic: `1 / rate_hz` ごとに一定周期で送信する
+
+    periodic では、最初に送信した時刻から周期の整数倍の絶対時刻を締め切りにする。
+    送信が遅れても次の締め切りは後ろにずれないので、周期が累積してずれない。
+    1周期以上遅れた（オーバーラン）場合は `overrun` に従う。
+
+    - skip: 過ぎた締め切りを読み飛ばし、次の締め切りから周期を保つ
+    - catch_up: 過ぎた締め切りの分を続けて送信する（`MAX_CATCH_UP` 周期まで）
+
+    時刻は `time.monotonic()` の値[秒]を渡す。
+
+    Args:
+        mode: 送信モード
+        rate_hz: 周期送信（ハートビート）のレート[Hz]
+        min_interval: on_change モードでの最小送信間隔[秒]
+        overrun: periodic で1周期以上遅れた場合の動作
+    """
+
+    def __init__(
+        self,
+        mode: TxMode = "on_change",
+        rate_hz: float = 100.0,
+        min_interval: float = 0.005,
+        overrun: TxOverrun = "skip",
+    ) -> None:
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be positive")
+        self._mode = mode
+        self._period = 1.0 / rate_hz
+        self._min_interval = min_interval
+        self._overrun = overrun
+        self._last_sent = float("-inf")
+        self._deadline = float("-inf")  # periodic の次の締め切り
+        self._changed = False
+        self._catching_up = False  # catch_up で過ぎた締め切りの分を送信している
+        self.overruns = 0  # 1周期以上遅れた回数（続けて送信した分は数えない）
+        self.skipped = 0  # 読み飛ばした締め切りの数
+
+    @property
+    def mode(self) -> TxMode:
+        return self._mode
+
+    @property
+    def period(self) -> float:
+        """周期送信の間隔[秒]"""
+        return self._period
+
+    @property
+    def last_sent(self) -> float:
+        """最後に送信した時刻（まだ送信していなければ -inf）"""
+        return self._last_sent
+
+    @property
+    def changed(self) -> bool:
+        """前回の送信以降にコマンドが変化したか"""
+        return self._changed
+
+    def notify_changed(self) -> None:
+        """送信するコマンドが変化したことを通知する"""
+        self._changed = True
+
+    def next_deadline(self) -> float:
+        """次に送信すべき時刻を返す"""
+        if self._mode == "periodic":
+            return self._deadline
+        if self._changed:
+            return self._last_sent + self._min_interval
+        return self._last_sent + self._period
+
+    def scheduled_deadline(self) -> float:
+        """周期またはハートビートで決まっている次の送信時刻
+
+        on_change でコマンドの変化により送信する場合は決まった時刻が無いので
+        -inf を返す。送信の遅れ（tx_jitter）はこの時刻から数える。
+        """
+        if self._mode == "periodic":
+            return self._deadline
+        if self._changed:
+            return float("-inf")
+        return self._last_sent + self._period
+
+    def is_due(self, now: float) -> bool:
+        """現在時刻で送信すべきかを返す"""
+        return now >= self.next_deadline()
+
+    def mark_sent(self, now: float) -> None:
+        """送信したことを記録する"""
+        self._last_sent = now
+        self._changed = False
+        if self._mode == "periodic":
+            self._advance(now)
+
+    def _advance(self, now: float) -> None:
+        """periodic の次の締め切りを決める"""
+        if self._deadline == float("-inf"):
+            self._deadline = now + self._period
+            return
+        self._deadline += self._period
+        behind = now - self._deadline
+        if behind < 0:
+            self._catching_up = False
+            return
+        # catch_up で続けて送信している間の遅れは、同じオーバーランとして数える
+        if not self._catching_up:
+            self.overruns += 1
+        # 次の締め切りも既に過ぎている
+        missed = math.floor(behind / self._period) + 1
+        if self._overrun == "catch_up":
+            missed = max(missed - MAX_CATCH_UP, 0)
+        self._deadline += missed * self._period
+        self.skipped += missed
+        self._catching_up = self._deadline <= now
+
+    def reset(self) -> None:
+        """周期の起点を忘れ、次の送信から数え直す（再接続時など）"""
+        self._deadline = float("-inf")
+        self._catching_up = False
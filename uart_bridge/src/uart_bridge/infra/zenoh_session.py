@@ -0,0 +1,70 @@
+import json
+from collections.abc import Mapping
+from typing import Any
+
+import zenoh
+
+from uart_bridge.domain.config import PublisherQosConfig, ZenohSessionConfig
+
+_PRIORITIES = {
+    "real_time": zenoh.Priority.REAL_TIME,
+    "interactive_high": zenoh.Priority.INTERACTIVE_HIGH,
+    "interactive_low": zenoh.Priority.INTERACTIVE_LOW,
+    "data_high": zenoh.Priority.DATA_HIGH,
+    "data": zenoh.Priority.DATA,
+    "data_low": zenoh.Priority.DATA_LOW,
+    "background": zenoh.Priority.BACKGROUND,
+}
+
+_CONGESTION_CONTROLS = {
+    "drop": zenoh.CongestionControl.DROP,
+    "block": zenoh.CongestionControl.BLOCK,
+}
+
+
+def create_zenoh_config(config: ZenohSessionConfig | None = None) -> zenoh.Config:
+    """設定から Zenoh のセッションの設定を作る
+
+    接続先が分かっている場合はマルチキャストによる探索を省略し、
+    起動時に探索を待たずに接続する。
+    """
+    zenoh_config = zenoh.Config()
+    if config is None:
+        return zenoh_config
+
+    zenoh_config.insert_json5("mode", json.dumps(config.mode))
+    if config.connect:
+        zenoh_config.insert_json5("connect/endpoints", json.dumps(config.connect))
+    if config.listen:
+        zenoh_config.insert_json5("listen/endpoints", json.dumps(config.listen))
+
+    scouting = config.multicast_scouting
+    if scouting is None:
+        scouting = not config.connect
+    zenoh_config.insert_json5("scouting/multicast/enabled", json.dumps(scouting))
+    return zenoh_config
+
+
+def find_publisher_qos(
+    qos: Mapping[str, PublisherQosConfig], key: str
+) -> PublisherQosConfig:
+    """キーに適用する QoS を探す
+
+    `key` と完全に一致する設定を優先し、無ければワイルドカードを含む設定のうち
+    最初に `key` を含むものを使う。どれにも一致しなければ既定の QoS を返す。
+    """
+    if key in qos:
+        return qos[key]
+    for pattern, config in qos.items():
+        if zenoh.KeyExpr(pattern).includes(key):
+            return config
+    return PublisherQosConfig()
+
+
+def publisher_options(config: PublisherQosConfig) -> dict[str, Any]:
+    """`declare_publisher` に渡す QoS の引数を作る"""
+    return {
+        "priority": _PRIORITIES[config.priority],
+        "congestion_control": _CONGESTION_CONTROLS[config.congestion_control],
+        "express": config.express,
+    }
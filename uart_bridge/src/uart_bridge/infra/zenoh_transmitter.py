@@ -1,87 +1,462 @@
+import json
+import logging
+from collections.abc import Mapping
+from time import monotonic, time
+from typing import Any, TypeVar
+
 import zenoh
 
 from uart_bridge.application.interfaces import Transmitter
+from uart_bridge.domain.config import (
+    PublisherQosConfig,
+    ZenohSessionConfig,
+    default_publish_qos,
+)
 from uart_bridge.domain.messages import (
-    DamagePanelRecognition,
-    LiDARMessage,
     RobotCommand,
     RobotState,
+    RobotStateSnapshot,
+    as_snapshot,
+)
+from uart_bridge.infra.command_intake import CommandSource
+from uart_bridge.infra.command_payload import (
+    ANGULAR_SCALE,
+    decode_damagepanel,
+    decode_force_vector,
 )
+from uart_bridge.infra.publish_policy import StatePublishPolicy
+from uart_bridge.infra.state_history import StateHistory, pack_history
+from uart_bridge.infra.state_payload import ENCODING, pack_state
+from uart_bridge.infra.stats import BridgeStats
+from uart_bridge.infra.zenoh_session import (
+    create_zenoh_config,
+    find_publisher_qos,
+    publisher_options,
+)
+
+_logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def format_state_field(key: str, value: object) -> str:
+    """`robot/state/<key>` に配信する文字列に変換する"""
+    if key == "pitch_deg":
+        assert isinstance(value, float)
+        value = value / 10
+    elif key == "muzzle_velocity":
+        assert isinstance(value, float)
+        value = value / 1000
+    return f"{value}"
+
+
+def format_connection(connected: bool) -> str:
+    """`robot/connection` に配信する文字列に変換する"""
+    return "connected" if connected else "disconnected"
+
+
+def _add_source_counters(
+    stats: BridgeStats, name: str, source: CommandSource[Any]
+) -> None:
+    """コマンドの入力元の受信数などを統計に登録する"""
+    stats.add_counter(f"{name}_received", lambda: source.received_samples)
+    stats.add_counter(f"{name}_skipped", lambda: source.skipped_samples)
+    stats.add_counter(f"{name}_invalid", lambda: source.invalid_samples)
+
+
+def parse_history_parameters(parameters: zenoh.Parameters) -> dict[str, Any]:
+    """`robot/history` のセレクタのパラメータを `StateHistory.select` の引数にする
+
+    `last`（直近の件数）、`start`・`end`（UNIX時刻[秒]）、
+    `fields`（カンマ区切りの列名）に対応する。不正な値の場合は ValueError
+    """
+    args: dict[str, Any] = {}
+    last = parameters.get("last")
+    if last is not None:
+        args["last"] = int(last)
+        if args["last"] < 0:
+            raise ValueError(f"invalid last: {last}")
+    for name in ("start", "end"):
+        value = parameters.get(name)
+        if value is not None:
+            args[name] = float(value)
+    fields = parameters.get("fields")
+    if fields:
+        args["fields"] = fields.split(",")
+    return args
 
 
 class ZenohTransmitter(Transmitter):
-    """Transmits data using Zenoh protocol."""
+    """Transmits data using Zenoh protocol.
+
+    The whole robot state is published as one msgpack message to `robot/state`.
+    For compatibility, each field is also published to `robot/state/<key>`
+    unless `per_field` is False.
+
+    Which fields are sent on each tick is decided by `publish_policy`
+    (deadband, max rate and periodic keyframe per field).
 
-    def __init__(self, prefix: str = "") -> None:
-        self.zenoh_session = zenoh.open(zenoh.Config())
+    The latest state is also served by a queryable on `robot/state/**`, so a
+    late joiner can `get()` it without making every subscriber receive it again.
+
+    Commands from `damagepanel` and `lidar/force_vector` are decoded according
+    to the sample encoding: msgpack, a fixed struct (application/octet-stream)
+    or JSON as a fallback. See `uart_bridge.infra.command_payload`.
+    The zenoh callbacks only push samples into a bounded ring per source; they
+    are decoded in `subscribe()` on the caller's thread, which keeps the newest
+    sample per source and builds the command in one go. A source that has not
+    been received for `command_timeout` seconds falls back to its default.
+
+    If `stats` is given, the latency of each stage is recorded there and served
+    as JSON by a queryable on `robot/stats`.
+
+    If `history` is given, every published state is also appended to it and
+    a queryable on `robot/history` returns a slice of it as columnar binary
+    (see `uart_bridge.infra.state_history.pack_history`), selected with the
+    parameters `last`, `start`, `end` and `fields`, e.g.
+    `robot/history?last=500;fields=pitch_deg,muzzle_velocity`.
+
+    Changes of the serial link are published to `robot/connection` as
+    "connected" or "disconnected", and the current value is served by a
+    queryable on the same key.
+
+    Publisher QoS (priority, congestion control, express) is looked up per key
+    relative to `prefix` in `publish_qos`. By default the keys relevant to
+    control (`robot/state`, `state_id`, `ready_to_fire`, `robot/connection`) are
+    sent with a higher
+    priority and without batching, so they are not delayed behind bulk traffic.
+
+    Command inputs are subscribed relative to `input_prefix` (defaults to
+    `prefix`; `damagepanel` is never prefixed). Transmitters for several UART
+    devices pass the global prefix here, so every board receives the same
+    `lidar/force_vector` as the one LiDAR publisher writes.
+
+    If `session` is given, the transmitter declares its entities on that
+    session instead of opening its own, so several transmitters (one per UART
+    device) can share a single zenoh session. `close()` then undeclares them
+    and leaves the session open for its owner.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "",
+        per_field: bool = True,
+        publish_policy: StatePublishPolicy | None = None,
+        session_config: ZenohSessionConfig | None = None,
+        publish_qos: Mapping[str, PublisherQosConfig] | None = None,
+        command_timeout: float = 0.0,
+        stats: BridgeStats | None = None,
+        session: zenoh.Session | None = None,
+        history: StateHistory | None = None,
+        input_prefix: str | None = None,
+    ) -> None:
+        self._owns_session = session is None
+        self.zenoh_session = (
+            session
+            if session is not None
+            else zenoh.open(create_zenoh_config(session_config))
+        )
+        # 共有セッションでは close() で取り消すため、宣言したものを保持する
+        self._declared: list[Any] = []
+        self.publish_qos = (
+            publish_qos if publish_qos is not None else default_publish_qos()
+        )
 
         if prefix:
             prefix = prefix.rstrip("/") + "/"
         else:
             prefix = ""
+        if input_prefix is None:
+            input_prefix = prefix
+        elif input_prefix:
+            input_prefix = input_prefix.rstrip("/") + "/"
 
         self.publishers = {}
+        self.stats = stats
+        self.history = history
 
         self.robot_command = RobotCommand()
-        self.robot_state = RobotState()
+        default = RobotCommand()
+        self.damagepanel = CommandSource(
+            decode_damagepanel,
+            (default.target_x, default.target_y, default.target_distance),
+            timeout=command_timeout,
+            on_received=self._notify_update,
+        )
+        self.force_vector = CommandSource(
+            decode_force_vector,
+            (0.0, 0.0),
+            timeout=command_timeout,
+            on_received=self._notify_update,
+        )
+        if stats is not None:
+            _add_source_counters(stats, "damagepanel", self.damagepanel)
+            _add_source_counters(stats, "force_vector", self.force_vector)
+        # robot_command を作った入力値（変化が無ければ作り直さない）
+        self._command_inputs: tuple[object, object] | None = None
+        # 最新の状態とそれを受け取った UNIX 時刻（Zenoh のスレッドから
+        # 一緒に読むので1つのタプルで差し替える）
+        self._latest_state = (RobotStateSnapshot(), time())
+        self.state_seq = 0
+        self.publish_policy = (
+            publish_policy if publish_policy is not None else StatePublishPolicy()
+        )
 
-        for key in RobotState.model_fields.keys():
-            self.publishers[key] = self.zenoh_session.declare_publisher(
-                f"{prefix}robot/state/{key}"
+        self.state_key = f"{prefix}robot/state"
+        self.state_field_keys = {
+            key: zenoh.KeyExpr(f"{self.state_key}/{key}")
+            for key in RobotStateSnapshot._fields
+        }
+
+        self.state_publisher = self._keep(
+            self.zenoh_session.declare_publisher(
+                self.state_key,
+                encoding=ENCODING,
+                **self._publisher_options("robot/state"),
             )
+        )
 
-        self.zenoh_session.declare_subscriber(
-            f"{prefix}lidar/force_vector",
-            self.lidar_subscriber,
+        self.connected: bool | None = None
+        self.connection_key = f"{prefix}robot/connection"
+        self.connection_publisher = self._keep(
+            self.zenoh_session.declare_publisher(
+                self.connection_key,
+                encoding=zenoh.Encoding.TEXT_PLAIN,
+                **self._publisher_options("robot/connection"),
+            )
         )
+        self._keep(
+            self.zenoh_session.declare_queryable(
+                self.connection_key,
+                self._queryable_callback_connection,
+            )
+        )
+
+        if per_field:
+            for key in RobotStateSnapshot._fields:
+                self.publishers[key] = self._keep(
+                    self.zenoh_session.declare_publisher(
+                        f"{prefix}robot/state/{key}",
+                        **self._publisher_options(f"robot/state/{key}"),
+                    )
+                )
 
-        self.zenoh_session.declare_subscriber(
-            f"{prefix}robot/state/request",
-            self._subscriber_callback_request,
+        self._keep(
+            self.zenoh_session.declare_subscriber(
+                f"{input_prefix}lidar/force_vector",
+                self.force_vector.on_sample,
+            )
         )
 
-        self.zenoh_session.declare_subscriber(
-            "damagepanel",
-            self.recognition_damagepanel_subscriber,
+        self._keep(
+            self.zenoh_session.declare_queryable(
+                f"{prefix}robot/state/**",
+                self._queryable_callback_state,
+            )
         )
 
-    def publish(self, robot_state: RobotState, force: bool = False) -> None:
+        if stats is not None:
+            self._keep(
+                self.zenoh_session.declare_queryable(
+                    f"{prefix}robot/stats",
+                    self._queryable_callback_stats,
+                )
+            )
+
+        self.history_key = f"{prefix}robot/history"
+        if history is not None:
+            self._keep(
+                self.zenoh_session.declare_queryable(
+                    self.history_key,
+                    self._queryable_callback_history,
+                )
+            )
+
+        # 互換性のため残している。新しいクライアントは robot/state/** に get() する
+        self._keep(
+            self.zenoh_session.declare_subscriber(
+                f"{prefix}robot/state/request",
+                self._subscriber_callback_request,
+            )
+        )
+
+        self._keep(
+            self.zenoh_session.declare_subscriber(
+                "damagepanel",
+                self.damagepanel.on_sample,
+            )
+        )
+
+    def _keep(self, entity: T) -> T:
+        """宣言したものを、close() で取り消せるように記録する"""
+        self._declared.append(entity)
+        return entity
+
+    def _publisher_options(self, key: str) -> dict[str, Any]:
+        """プレフィックスからの相対パス `key` に設定された QoS の引数を返す"""
+        return publisher_options(find_publisher_qos(self.publish_qos, key))
+
+    def publish(
+        self, robot_state: RobotState | RobotStateSnapshot, force: bool = False
+    ) -> None:
         """Transmit data to the specified topic."""
-        for key in RobotState.model_fields.keys():
-            value = getattr(robot_state, key)
+        snapshot = as_snapshot(robot_state)
+        timestamp = time()
+        self._latest_state = (snapshot, timestamp)
+        if self.history is not None:
+            self.history.append(timestamp, snapshot)
 
-            if not force and value == getattr(self.robot_state, key):
-                continue
+        selected = self.publish_policy.select(snapshot, monotonic(), force)
+        if not selected:
+            return
 
-            setattr(self.robot_state, key, value)
+        self.state_seq += 1
+        self.state_publisher.put(pack_state(snapshot, self.state_seq, timestamp))
+        if self.stats is not None:
+            self.stats.record_publish(monotonic())
 
-            if key == "state_id":
-                value = value.value
-            elif key == "pitch_deg":
-                value = value / 10
-            elif key == "muzzle_velocity":
-                value = value / 1000
-            self.publishers[key].put(f"{value}")
-            print(f"Published {key}: {value}")
+        if not self.publishers:
+            return
 
-    def recognition_damagepanel_subscriber(self, sample: zenoh.Sample) -> None:
-        d = DamagePanelRecognition.model_validate_json(sample.payload.to_string())
+        for index in selected:
+            key, value = RobotStateSnapshot._fields[index], snapshot[index]
+            text = format_state_field(key, value)
+            self.publishers[key].put(text)
+            _logger.debug("published %s: %s", key, text)
 
-        self.robot_command.target_x = d.target_x
-        self.robot_command.target_y = d.target_y
-        self.robot_command.target_distance = d.target_distance
+    @property
+    def robot_state(self) -> RobotStateSnapshot:
+        """最後に受け取った状態"""
+        return self._latest_state[0]
 
-    def lidar_subscriber(self, sample: zenoh.Sample) -> None:
-        m = LiDARMessage.model_validate_json(sample.payload.to_string())
-        self.robot_command.force_linear = int(m.linear)
-        self.robot_command.force_angular = int(m.angular * 10)
+    def publish_connection(self, connected: bool) -> None:
+        """シリアルの接続状態の変化を配信する"""
+        self.connected = connected
+        self.connection_publisher.put(format_connection(connected))
 
     def subscribe(self) -> RobotCommand:
+        """各入力元に届いた最新の値から、コマンドをまとめて作る"""
+        now = monotonic()
+        sources = (self.damagepanel, self.force_vector)
+        received_at = [source.received_at for source in sources]
+        damagepanel = self.damagepanel.poll(now)
+        force_vector = self.force_vector.poll(now)
+        if (damagepanel, force_vector) == self._command_inputs:
+            return self.robot_command
+
+        if self.stats is not None:
+            self._record_command_intake(sources, received_at, monotonic())
+
+        self._command_inputs = (damagepanel, force_vector)
+        target_x, target_y, target_distance = damagepanel
+        linear, angular = force_vector
+        self.robot_command = RobotCommand(
+            target_x=target_x,
+            target_y=target_y,
+            target_distance=target_distance,
+            force_linear=int(linear),
+            force_angular=int(angular * ANGULAR_SCALE),
+        )
         return self.robot_command
 
+    def target_received_at(self) -> float | None:
+        """照準（`damagepanel`）の最新の値を受信した時刻"""
+        return self.damagepanel.received_at
+
+    def _record_command_intake(
+        self,
+        sources: tuple[CommandSource[Any], ...],
+        previous: list[float | None],
+        now: float,
+    ) -> None:
+        """新しい値を取り込んだ入力元の到着からの時間を記録する"""
+        assert self.stats is not None
+        arrivals = [
+            source.received_at
+            for source, received_at in zip(sources, previous)
+            if source.received_at is not None and source.received_at != received_at
+        ]
+        for arrival in arrivals:
+            self.stats.record("cmd_intake", arrival, now)
+        if arrivals:
+            self.stats.mark_command_received(min(arrivals))
+
+    def next_deadline(self) -> float | None:
+        """いずれかの入力元が古くなり、既定値に戻る時刻"""
+        deadlines = [
+            deadline
+            for deadline in (
+                self.damagepanel.stale_deadline(),
+                self.force_vector.stale_deadline(),
+            )
+            if deadline is not None
+        ]
+        return min(deadlines, default=None)
+
+    def _queryable_callback_state(self, query: zenoh.Query) -> None:
+        """最新の状態を問い合わせ元にだけ返す
+
+        `robot/state` にはまとめた msgpack を、`robot/state/<key>` には
+        各フィールドを、セレクタに一致するものだけ返す。
+        `timestamp` は問い合わせの時刻ではなく、状態を受け取った時刻。
+        """
+        snapshot, timestamp = self._latest_state
+
+        if query.key_expr.intersects(self.state_key):
+            payload = pack_state(snapshot, self.state_seq, timestamp)
+            query.reply(self.state_key, payload, encoding=ENCODING)
+
+        for key, value in zip(RobotStateSnapshot._fields, snapshot):
+            key_expr = self.state_field_keys[key]
+            if query.key_expr.intersects(key_expr):
+                query.reply(key_expr, format_state_field(key, value))
+
+    def _queryable_callback_connection(self, query: zenoh.Query) -> None:
+        """シリアルの接続状態を返す（まだ分からない場合は返さない）"""
+        if self.connected is not None:
+            query.reply(
+                self.connection_key,
+                format_connection(self.connected),
+                encoding=zenoh.Encoding.TEXT_PLAIN,
+            )
+
+    def _queryable_callback_stats(self, query: zenoh.Query) -> None:
+        """レイテンシなどの統計を JSON で返す"""
+        assert self.stats is not None
+        query.reply(
+            query.key_expr,
+            json.dumps(self.stats.summary()),
+            encoding=zenoh.Encoding.APPLICATION_JSON,
+        )
+
+    def _queryable_callback_history(self, query: zenoh.Query) -> None:
+        """状態の履歴をセレクタのパラメータで絞り込み、列ごとのバイト列で返す"""
+        assert self.history is not None
+        try:
+            columns = self.history.select(**parse_history_parameters(query.parameters))
+        except ValueError as err:
+            query.reply_err(str(err))
+            return
+        query.reply(self.history_key, pack_history(columns), encoding=ENCODING)
+
     def _subscriber_callback_request(self, sample: zenoh.Sample) -> None:
-        self.publish(self.robot_state, force=True)
+        """最新の状態をすべてのフィールドで配信し直す
+
+        Zenoh のスレッドで呼ばれるので、配信ポリシー・履歴・seq は変更せず、
+        メインループが最後に受け取った状態を、受け取った時刻のまま送る。
+        """
+        snapshot, timestamp = self._latest_state
+        self.state_publisher.put(pack_state(snapshot, self.state_seq, timestamp))
+        for key, value in zip(RobotStateSnapshot._fields, snapshot):
+            publisher = self.publishers.get(key)
+            if publisher is not None:
+                publisher.put(format_state_field(key, value))
 
     def close(self) -> None:
-        """Close the Zenoh session."""
-        self.zenoh_session.close()  # type: ignore
+        """Close the Zenoh session, or undeclare the entities on a shared one."""
+        if self._owns_session:
+            self.zenoh_session.close()  # type: ignore
+            return
+        for entity in reversed(self._declared):
+            entity.undeclare()
+        self._declared.clear()
@@ -1,10 +1,46 @@
 import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import signal
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from types import FrameType
 
-from uart_bridge.application.application import Application
-from uart_bridge.domain.config import load_and_parse_config
+import zenoh
+
+from uart_bridge.application.application import Application, AsyncApplication
+from uart_bridge.application.async_adapters import (
+    AsyncRobotDriverAdapter,
+    AsyncTransmitterAdapter,
+)
+from uart_bridge.application.interfaces import AsyncRobotDriver, RobotDriver
+from uart_bridge.domain.config import (
+    UartConfig,
+    UartDeviceConfig,
+    load_and_parse_config,
+)
+from uart_bridge.infra.app_logging import configure_logging, create_frame_history
+from uart_bridge.infra.async_serial_robot_driver import AsyncSerialRobotDriver
+from uart_bridge.infra.codec import CodecName, create_codec
+from uart_bridge.infra.process_robot_driver import ProcessRobotDriver
+from uart_bridge.infra.publish_policy import StatePublishPolicy
+from uart_bridge.infra.serial_io_loop import SerialIoLoop
+from uart_bridge.infra.serial_log import SerialRecorder
 from uart_bridge.infra.serial_robot_driver import SerialRobotDriver
+from uart_bridge.infra.state_history import StateHistory
+from uart_bridge.infra.stats import BridgeStats
+from uart_bridge.infra.target_predictor import create_target_predictor
+from uart_bridge.infra.thread_scheduling import apply_thread_scheduling
+from uart_bridge.infra.tx_scheduler import TxScheduler
+from uart_bridge.infra.zenoh_session import create_zenoh_config
 from uart_bridge.infra.zenoh_transmitter import ZenohTransmitter
 
+_logger = logging.getLogger(__name__)
+
 
 def parse_args() -> argparse.Namespace:
     """コマンドライン引数をパースする"""
@@ -19,17 +55,264 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def create_tx_scheduler(uart_config: UartConfig) -> TxScheduler:
+    """設定からコマンド送信のスケジューラを生成する"""
+    return TxScheduler(
+        mode=uart_config.tx_mode,
+        rate_hz=uart_config.tx_rate_hz,
+        min_interval=uart_config.tx_min_interval_ms / 1000,
+        overrun=uart_config.tx_overrun,
+    )
+
+
+def record_path(uart_config: UartConfig, name: str = "") -> Path | None:
+    """送受信したバイト列の記録先（設定に無ければ None）
+
+    名前のあるデバイスは、ファイル名の拡張子の前に `-<name>` を付けて分ける。
+    """
+    if uart_config.record_path is None:
+        return None
+    path = Path(time.strftime(uart_config.record_path))
+    if name:
+        path = path.with_stem(f"{path.stem}-{name}")
+    return path
+
+
+def create_recorder(
+    uart_config: UartConfig, name: str = "", codec: CodecName | None = None
+) -> SerialRecorder | None:
+    """設定に記録先があれば、送受信したバイト列の記録を開始する"""
+    path = record_path(uart_config, name)
+    if path is None:
+        return None
+    recorder = SerialRecorder(
+        path, codec=codec if codec is not None else uart_config.codec
+    )
+    _logger.info("recording serial traffic to %s", recorder.path)
+    return recorder
+
+
+def join_prefix(zenoh_prefix: str, device_prefix: str | None) -> str:
+    """全体のプレフィックスとデバイスのプレフィックスをつなげる"""
+    return "/".join(p.strip("/") for p in (zenoh_prefix, device_prefix or "") if p)
+
+
+def install_stats_dump(stats: Mapping[str, BridgeStats]) -> None:
+    """SIGUSR1 を受け取ったら統計を標準出力に書き出す
+
+    デバイスが1つ（名前 ""）だけならその統計を、複数ならデバイス名ごとに書き出す。
+    """
+
+    def dump(signum: int, frame: FrameType | None) -> None:
+        if list(stats) == [""]:
+            summary = stats[""].summary()
+        else:
+            summary = {name: s.summary() for name, s in stats.items()}
+        print(json.dumps(summary, indent=2))
+
+    signal.signal(signal.SIGUSR1, dump)
+
+
+def create_zenoh_transmitter(
+    uart_config: UartConfig,
+    zenoh_prefix: str = "",
+    stats: BridgeStats | None = None,
+    session: zenoh.Session | None = None,
+    input_prefix: str | None = None,
+) -> ZenohTransmitter:
+    """設定から Zenoh の送受信クラスを生成する（session を渡すと共有する）
+
+    `input_prefix` は入力（`lidar/force_vector`）のプレフィックス（None で
+    `zenoh_prefix` と同じ）。
+    """
+    return ZenohTransmitter(
+        prefix=zenoh_prefix,
+        input_prefix=input_prefix,
+        per_field=uart_config.publish_per_field,
+        publish_policy=StatePublishPolicy(
+            fields=uart_config.publish_fields,
+            keyframe_interval=uart_config.publish_keyframe_interval_ms / 1000,
+        ),
+        session_config=uart_config.zenoh,
+        publish_qos=uart_config.publish_qos,
+        command_timeout=uart_config.command_timeout_ms / 1000,
+        stats=stats,
+        session=session,
+        history=(
+            StateHistory(uart_config.history_size) if uart_config.history_size else None
+        ),
+    )
+
+
+@contextlib.contextmanager
+def open_recorder(
+    uart_config: UartConfig, name: str = "", codec: CodecName | None = None
+) -> Iterator[SerialRecorder | None]:
+    """`create_recorder` で記録を開始し、終了時に閉じる"""
+    recorder = create_recorder(uart_config, name, codec)
+    try:
+        yield recorder
+    finally:
+        if recorder is not None:
+            recorder.close()
+
+
+def create_serial_robot_driver(
+    uart_config: UartConfig,
+    device: UartDeviceConfig,
+    stats: BridgeStats | None = None,
+    recorder: SerialRecorder | None = None,
+    io_loop: SerialIoLoop | None = None,
+) -> SerialRobotDriver:
+    """設定から1台分のシリアル通信のドライバを生成する"""
+    return SerialRobotDriver(
+        device.device,
+        reconnect_max=uart_config.reconnect_max_interval_ms / 1000,
+        codec=create_codec(device.codec or uart_config.codec),
+        tx_scheduler=create_tx_scheduler(uart_config),
+        stats=stats,
+        recorder=recorder,
+        frame_history=create_frame_history(uart_config.log),
+        predictor=create_target_predictor(uart_config.target_prediction),
+        io_loop=io_loop,
+    )
+
+
+def create_process_robot_driver(
+    uart_config: UartConfig,
+    name: str,
+    device: UartDeviceConfig,
+    stats: BridgeStats | None = None,
+) -> ProcessRobotDriver:
+    """設定から、シリアル通信を子プロセスで行うドライバを生成する"""
+    path = record_path(uart_config, name)
+    if path is not None:
+        _logger.info("recording serial traffic to %s", path)
+    return ProcessRobotDriver(
+        device.device,
+        reconnect_max=uart_config.reconnect_max_interval_ms / 1000,
+        codec=device.codec or uart_config.codec,
+        tx_scheduler=create_tx_scheduler(uart_config),
+        stats=stats,
+        record_path=None if path is None else str(path),
+        scheduling=uart_config.scheduling,
+        log=uart_config.log,
+        target_prediction=uart_config.target_prediction,
+    )
+
+
 def run_application(
-    robot_port: str,
+    uart_config: UartConfig,
     zenoh_prefix: str = "",
 ) -> None:
-    """アプリケーションを実行する"""
-    with (
-        SerialRobotDriver(robot_port) as robot_driver,
-        ZenohTransmitter(prefix=zenoh_prefix) as transmitter,
-    ):
-        app = Application(robot_driver, transmitter)
-        app.spin()
+    """アプリケーションを実行する
+
+    すべてのデバイスを1つの `SerialIoLoop` と Zenoh セッションで扱い、
+    デバイスごとの Application をそれぞれのスレッドで動かす。
+    `serial_process` が有効な場合は、デバイスごとの子プロセスで通信する。
+    """
+    devices = uart_config.device_configs()
+    stats = {name: BridgeStats() for name in devices}
+    install_stats_dump(stats)
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(configure_logging(uart_config.log))
+        io_loop = stack.enter_context(SerialIoLoop())
+        if not uart_config.serial_process:
+            io_loop.call(lambda: apply_thread_scheduling(uart_config.scheduling))
+        session = zenoh.open(create_zenoh_config(uart_config.zenoh))
+        stack.callback(session.close)
+        apps = []
+        for name, device in devices.items():
+            robot_driver: RobotDriver
+            if uart_config.serial_process:
+                robot_driver = stack.enter_context(
+                    create_process_robot_driver(uart_config, name, device, stats[name])
+                )
+            else:
+                recorder = stack.enter_context(
+                    open_recorder(uart_config, name, device.codec)
+                )
+                robot_driver = stack.enter_context(
+                    create_serial_robot_driver(
+                        uart_config, device, stats[name], recorder, io_loop
+                    )
+                )
+            transmitter = stack.enter_context(
+                create_zenoh_transmitter(
+                    uart_config,
+                    join_prefix(zenoh_prefix, device.prefix),
+                    stats[name],
+                    session,
+                    input_prefix=zenoh_prefix,
+                )
+            )
+            apps.append(Application(robot_driver, transmitter))
+        for app in apps[1:]:
+            threading.Thread(target=app.spin, daemon=True).start()
+        apps[0].spin()
+
+
+async def run_application_async(
+    uart_config: UartConfig,
+    zenoh_prefix: str = "",
+) -> None:
+    """アプリケーションを asyncio のイベントループ上で実行する
+
+    すべてのデバイスを同じイベントループと Zenoh セッションで扱う。
+    """
+    devices = uart_config.device_configs()
+    stats = {name: BridgeStats() for name in devices}
+    install_stats_dump(stats)
+    async with contextlib.AsyncExitStack() as stack:
+        stack.enter_context(configure_logging(uart_config.log))
+        if not uart_config.serial_process:
+            apply_thread_scheduling(uart_config.scheduling)
+        session = zenoh.open(create_zenoh_config(uart_config.zenoh))
+        stack.callback(session.close)
+        apps = []
+        for name, device in devices.items():
+            robot_driver: AsyncRobotDriver
+            if uart_config.serial_process:
+                robot_driver = await stack.enter_async_context(
+                    AsyncRobotDriverAdapter(
+                        create_process_robot_driver(
+                            uart_config, name, device, stats[name]
+                        )
+                    )
+                )
+            else:
+                recorder = stack.enter_context(
+                    open_recorder(uart_config, name, device.codec)
+                )
+                robot_driver = await stack.enter_async_context(
+                    AsyncSerialRobotDriver(
+                        device.device,
+                        reconnect_max=uart_config.reconnect_max_interval_ms / 1000,
+                        codec=create_codec(device.codec or uart_config.codec),
+                        tx_scheduler=create_tx_scheduler(uart_config),
+                        stats=stats[name],
+                        recorder=recorder,
+                        frame_history=create_frame_history(uart_config.log),
+                        predictor=create_target_predictor(
+                            uart_config.target_prediction
+                        ),
+                    )
+                )
+            transmitter = await stack.enter_async_context(
+                AsyncTransmitterAdapter(
+                    create_zenoh_transmitter(
+                        uart_config,
+                        join_prefix(zenoh_prefix, device.prefix),
+                        stats[name],
+                        session,
+                        input_prefix=zenoh_prefix,
+                    )
+                )
+            )
+            apps.append(AsyncApplication(robot_driver, transmitter))
+        async with asyncio.TaskGroup() as tg:
+            for app in apps:
+                tg.create_task(app.spin())
 
 
 def main() -> None:
@@ -40,10 +323,18 @@ def main() -> None:
     if config.uart is None:
         raise ValueError("設定ファイルに [uart] セクションが見つかりません")
 
-    run_application(
-        robot_port=config.uart.device,
-        zenoh_prefix=config.global_.zenoh_prefix,
-    )
+    if config.uart.runtime == "asyncio":
+        asyncio.run(
+            run_application_async(
+                uart_config=config.uart,
+                zenoh_prefix=config.global_.zenoh_prefix,
+            )
+        )
+    else:
+        run_application(
+            uart_config=config.uart,
+            zenoh_prefix=config.global_.zenoh_prefix,
+        )
 
 
 if __name__ == "__main__":
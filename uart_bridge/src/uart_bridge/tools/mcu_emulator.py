@@ -0,0 +1,292 @@
+"""疑似端末(pty)でマイコンのふりをするエミュレータ
+
+実機が無くても `SerialRobotDriver` や `run_application` を動かせるよう、
+疑似端末を作ってマイコンと同じ通信フォーマットで状態を送信し、
+受信したコマンドを検証する。
+
+    uv run python3 -m uart_bridge.tools.mcu_emulator --link /tmp/roboapp_uart
+
+`--link` のパスを設定ファイルの `[uart] device` に指定すると、
+`mise start` でそのまま接続できる。
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import selectors
+import time
+import tty
+from pathlib import Path
+from threading import Event, Thread
+from typing import Any, Self
+
+from uart_bridge.domain.messages import RobotCommand, RobotStateId, RobotStateSnapshot
+from uart_bridge.infra.codec import CodecName, RobotCodec, create_codec
+
+
+class McuEmulator:
+    """疑似端末でマイコンの通信を模擬するクラス
+
+    状態は `rate_hz` の一定周期（`jitter` 秒以内のゆらぎ付き）で送信する。
+    `reserved` には送信ごとに増える番号（下位8bit）を入れるので、
+    受信側で取りこぼしを数えられる。
+
+    Args:
+        codec: 通信フォーマット
+        rate_hz: 状態の送信レート[Hz]
+        jitter: 送信タイミングのゆらぎの最大値[秒]
+        garbage_rate: 送信ごとに不正なフレームを混ぜる確率（0〜1）
+        disconnect_interval: 切断する間隔[秒]（0で切断しない）
+        disconnect_duration: 切断している時間[秒]
+        link: 疑似端末へのシンボリックリンクを作るパス
+        echo: 受信したコマンドを表示する
+        seed: 乱数のシード
+    """
+
+    #: 送信が遅れたときにまとめて送る最大の時間[秒]
+    MAX_CATCH_UP = 0.01
+
+    def __init__(
+        self,
+        codec: CodecName = "csv",
+        rate_hz: float = 100.0,
+        jitter: float = 0.0,
+        garbage_rate: float = 0.0,
+        disconnect_interval: float = 0.0,
+        disconnect_duration: float = 0.5,
+        link: str | None = None,
+        echo: bool = False,
+        seed: int | None = None,
+    ) -> None:
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be positive")
+        self._codec: RobotCodec = create_codec(codec)
+        self._period = 1.0 / rate_hz
+        self._jitter = jitter
+        self._garbage_rate = garbage_rate
+        self._disconnect_interval = disconnect_interval
+        self._disconnect_duration = disconnect_duration
+        self._link = Path(link) if link else None
+        self._echo = echo
+        self._random = random.Random(seed)
+
+        self._master = -1
+        self._slave = -1
+        self._port = ""
+        self._buffer = bytearray()
+        self._selector = selectors.DefaultSelector()
+        self._open_pty()
+
+        self.last_command = RobotCommand()
+        self.sent_states = 0  # 送信した状態の数
+        self.injected_garbage = 0  # 混ぜた不正なフレームの数
+        self.tx_overruns = 0  # 受信側が読み出さず書き込めなかった送信の数
+        self.received_commands = 0  # 受信した正しいコマンドの数
+        self.invalid_commands = 0  # 受信した不正なコマンドの数
+        self.disconnects = 0  # 切断した回数
+
+        self._stop = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close()
+
+    @property
+    def port(self) -> str:
+        """接続するデバイスのパス（`link` を指定した場合はそのパス）"""
+        return str(self._link) if self._link else self._port
+
+    def _open_pty(self) -> None:
+        """疑似端末を作り、リンクを張り直す"""
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._master)
+        os.set_blocking(self._master, False)
+        self._selector.register(self._master, selectors.EVENT_READ)
+
+        port = os.ttyname(self._slave)
+        if self._port and port != self._port:
+            print(f"pty was reopened as {port} (was {self._port})")
+        self._port = port
+
+        if self._link:
+            self._link.unlink(missing_ok=True)
+            self._link.symlink_to(port)
+
+    def _close_pty(self) -> None:
+        """疑似端末を閉じる。受信側からは切断に見える"""
+        self._selector.unregister(self._master)
+        os.close(self._master)
+        os.close(self._slave)
+        self._buffer.clear()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        """送信時刻まで受信を処理し、時刻になったら状態を送信する"""
+        started_at = time.monotonic()
+        next_disconnect = (
+            started_at + self._disconnect_interval
+            if self._disconnect_interval > 0
+            else math.inf
+        )
+        seq = 0
+        next_send = started_at
+        send_at = next_send
+
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now >= next_disconnect:
+                self._close_pty()
+                self.disconnects += 1
+                self._stop.wait(self._disconnect_duration)
+                self._open_pty()
+                next_disconnect = time.monotonic() + self._disconnect_interval
+                continue
+
+            for _ in self._selector.select(max(send_at - now, 0.0)):
+                self._receive()
+
+            # select の待ち時間は1ms単位なので、高いレートでは送信時刻を過ぎた分を
+            # まとめて送る。大きく遅れた場合は追いつこうとせず、現在時刻から送り直す
+            now = time.monotonic()
+            if now - next_send > self.MAX_CATCH_UP:
+                next_send = send_at = now
+            while now >= send_at:
+                self._send_state(seq, send_at - started_at)
+                seq += 1
+                next_send += self._period
+                send_at = next_send + self._random.uniform(0, self._jitter)
+
+    def make_state(self, seq: int, t: float) -> RobotStateSnapshot:
+        """送信する状態を作る。ピッチ角は 0.5Hz で±30度の正弦波"""
+        return RobotStateSnapshot(
+            state_id=RobotStateId.NORMAL.value,
+            pitch_deg=round(30 * math.sin(math.pi * t), 1),
+            muzzle_velocity=15.0,
+            reloaded_left_disks=3,
+            reloaded_right_disks=3,
+            ready_to_fire=(seq // 100) % 2 == 0,
+            reserved=seq & 0xFF,
+        )
+
+    def _send_state(self, seq: int, t: float) -> None:
+        data = self._codec.pack_state(self.make_state(seq, t), seq & 0xFF)
+        if self._random.random() < self._garbage_rate:
+            data = self._make_garbage() + data
+            self.injected_garbage += 1
+        try:
+            written = os.write(self._master, data)
+        except BlockingIOError:
+            written = 0
+        if written < len(data):
+            self.tx_overruns += 1
+        self.sent_states += 1
+
+    def _make_garbage(self) -> bytes:
+        """区切り文字を含まない不正なフレームを作る"""
+        delimiter = self._codec.delimiter[0]
+        body = bytes(
+            b
+            for b in self._random.randbytes(self._random.randint(1, 16))
+            if b != delimiter
+        )
+        return b"\xff" + body + self._codec.delimiter
+
+    def _receive(self) -> None:
+        """受信したコマンドを検証する"""
+        try:
+            self._buffer += os.read(self._master, 4096)
+        except (BlockingIOError, OSError):
+            return
+
+        delimiter = self._codec.delimiter
+        while (end := self._buffer.find(delimiter)) >= 0:
+            frame = bytes(self._buffer[:end])
+            del self._buffer[: end + len(delimiter)]
+            if not frame:
+                continue
+            command = self._codec.decode_command(frame)
+            if command is None:
+                self.invalid_commands += 1
+                print(f"invalid command: {frame!r}")
+                continue
+            self.received_commands += 1
+            self.last_command = command
+            if self._echo:
+                print(f"command: {command}")
+
+    def summary(self) -> dict[str, int]:
+        """送受信の統計を返す"""
+        return {
+            "sent_states": self.sent_states,
+            "injected_garbage": self.injected_garbage,
+            "tx_overruns": self.tx_overruns,
+            "received_commands": self.received_commands,
+            "invalid_commands": self.invalid_commands,
+            "disconnects": self.disconnects,
+        }
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self._close_pty()
+        self._selector.close()
+        if self._link:
+            self._link.unlink(missing_ok=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--codec", choices=("csv", "binary"), default="csv")
+    parser.add_argument("--rate", type=float, default=100.0, help="送信レート[Hz]")
+    parser.add_argument(
+        "--jitter-ms", type=float, default=0.0, help="送信タイミングのゆらぎ[ms]"
+    )
+    parser.add_argument(
+        "--garbage-rate", type=float, default=0.0, help="不正なフレームを混ぜる確率"
+    )
+    parser.add_argument(
+        "--disconnect-interval", type=float, default=0.0, help="切断する間隔[秒]"
+    )
+    parser.add_argument(
+        "--disconnect-duration", type=float, default=0.5, help="切断している時間[秒]"
+    )
+    parser.add_argument("--link", default=None, help="疑似端末へのリンクを作るパス")
+    parser.add_argument("--duration", type=float, default=0.0, help="実行時間[秒]")
+    parser.add_argument("--echo", action="store_true", help="受信したコマンドを表示")
+    parser.add_argument("--seed", type=int, default=None, help="乱数のシード")
+    args = parser.parse_args()
+
+    with McuEmulator(
+        codec=args.codec,
+        rate_hz=args.rate,
+        jitter=args.jitter_ms / 1000,
+        garbage_rate=args.garbage_rate,
+        disconnect_interval=args.disconnect_interval,
+        disconnect_duration=args.disconnect_duration,
+        link=args.link,
+        echo=args.echo,
+        seed=args.seed,
+    ) as emulator:
+        print(f"emulating MCU on {emulator.port}")
+        try:
+            if args.duration > 0:
+                time.sleep(args.duration)
+            else:
+                while True:
+                    time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    print(json.dumps(emulator.summary()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""記録したシリアル通信を再生し、uart_bridge と同じ経路で配信する
+
+`[uart] record_path` で記録したファイルを `ReplayRobotDriver` で再生し、
+`Application` と `ZenohTransmitter` で `robot/state` に配信する。
+実機や試合のデータで、デコードから配信までの処理を再現・計測できる。
+
+    uv run python3 -m uart_bridge.tools.serial_replay match.ublog --speed 2
+
+終了時に、再生した状態の数・配信した数・経過時間と、`BridgeStats` の統計を
+JSON で出力する。
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from typing import Any
+
+from uart_bridge.application.application import Application
+from uart_bridge.domain.config import load_and_parse_config
+from uart_bridge.infra.replay_robot_driver import ReplayRobotDriver
+from uart_bridge.infra.stats import BridgeStats
+from uart_bridge.infra.zenoh_transmitter import ZenohTransmitter
+from uart_bridge.main import create_zenoh_transmitter
+
+
+def replay(
+    path: str,
+    speed: float = 1.0,
+    config_file: str | None = None,
+    prefix: str | None = None,
+) -> dict[str, Any]:
+    """記録したファイルを最後まで再生し、結果を返す
+
+    Args:
+        path: 記録したファイルのパス
+        speed: 再生速度の倍率（0 で最速）
+        config_file: 配信の設定に使う設定ファイル（None で既定の設定）
+        prefix: Zenoh のプレフィックス（None で設定ファイルの値）
+    """
+    stats = BridgeStats()
+    if config_file is not None:
+        config = load_and_parse_config(config_file)
+        zenoh_prefix = config.global_.zenoh_prefix if prefix is None else prefix
+        if config.uart is None:
+            raise ValueError("設定ファイルに [uart] セクションが見つかりません")
+        transmitter = create_zenoh_transmitter(config.uart, zenoh_prefix, stats)
+    else:
+        transmitter = ZenohTransmitter(prefix=prefix or "", stats=stats)
+
+    with (
+        ReplayRobotDriver(path, speed=speed, stats=stats) as driver,
+        transmitter,
+    ):
+        app = Application(driver, transmitter)
+        stop = threading.Event()
+
+        def spin() -> None:
+            while not stop.is_set():
+                app.spin_once(timeout=0.1)
+
+        started_at = time.monotonic()
+        thread = threading.Thread(target=spin, daemon=True)
+        thread.start()
+        driver.wait_finished()
+        elapsed = time.monotonic() - started_at
+        stop.set()
+        thread.join()
+
+        return {
+            "elapsed_s": elapsed,
+            "states": driver.state_version,
+            "published": transmitter.state_seq,
+            "corrupt_frames": driver.corrupt_frames,
+            "recorded_commands": len(driver.recorded_commands),
+            "sent_commands": len(driver.sent_commands),
+            "stats": stats.summary(),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="記録したファイルのパス")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="再生速度の倍率（0 で最速）"
+    )
+    parser.add_argument("--config-file", default=None, help="設定ファイルのパス")
+    parser.add_argument("--prefix", default=None, help="Zenoh のプレフィックス")
+    parser.add_argument(
+        "--quiet", action="store_true", help="再生中は ERROR 以外のログを表示しない"
+    )
+    args = parser.parse_args()
+
+    if args.quiet:
+        logging.getLogger("uart_bridge").setLevel(logging.ERROR)
+    result = replay(args.path, args.speed, args.config_file, args.prefix)
+    json.dump(result, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
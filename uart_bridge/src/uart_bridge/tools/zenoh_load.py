@@ -0,0 +1,430 @@
+"""uart_bridge の入力と下流の利用者に、Zenoh で負荷をかける
+
+`damagepanel`, `lidar/force_vector`, `robot/state` をそれぞれのレートで配信し、
+達成した配信レートと、購読側で受信したレートを比べる。
+試合相当の負荷（`--profile match`）や kHz の最悪ケース（`--profile worst`）で、
+`ZenohTransmitter` のコールバックや UI がどこまで追いつくかを確かめられる。
+
+    uv run python3 -m uart_bridge.tools.zenoh_load --profile worst --duration 10
+
+`--bridge-stats` を付けると、開始前と終了後に uart_bridge の `robot/stats` を
+問い合わせ、入力元ごとの受信・読み飛ばし・不正なサンプル数の増分も出力する。
+`robot/state` を配信すると uart_bridge の配信と混ざるので、UI を試す場合は
+uart_bridge を止めるか、`--prefix` を分けること。
+"""
+
+import argparse
+import json
+import math
+import random
+import time
+from collections.abc import Callable, Sequence
+from threading import Event, Lock, Thread
+from typing import Any, Literal, NamedTuple, Self
+
+import zenoh
+
+from uart_bridge.domain.config import ZenohSessionConfig
+from uart_bridge.domain.messages import (
+    DamagePanelRecognition,
+    LiDARMessage,
+    RobotStateId,
+    RobotStateSnapshot,
+)
+from uart_bridge.infra.command_payload import (
+    MSGPACK_ENCODING,
+    STRUCT_ENCODING,
+    encode_damagepanel,
+    encode_force_vector,
+)
+from uart_bridge.infra.state_payload import ENCODING as STATE_ENCODING
+from uart_bridge.infra.state_payload import pack_state
+from uart_bridge.infra.zenoh_session import create_zenoh_config
+from uart_bridge.infra.zenoh_transmitter import format_state_field
+
+EncodingName = Literal["json", "msgpack", "struct"]
+
+ENCODINGS: dict[EncodingName, zenoh.Encoding] = {
+    "json": zenoh.Encoding.APPLICATION_JSON,
+    "msgpack": MSGPACK_ENCODING,
+    "struct": STRUCT_ENCODING,
+}
+
+
+class LoadProfile(NamedTuple):
+    """入力ごとの配信レート[Hz]（0 で配信しない）"""
+
+    damagepanel_hz: float
+    force_vector_hz: float
+    state_hz: float
+
+
+PROFILES = {
+    # カメラ 30fps・LiDAR 20Hz・マイコン 100Hz
+    "match": LoadProfile(damagepanel_hz=30, force_vector_hz=20, state_hz=100),
+    "worst": LoadProfile(damagepanel_hz=1000, force_vector_hz=1000, state_hz=1000),
+}
+
+
+class TrafficModel:
+    """試合中に近い値の動きを時刻 `t`[秒] から作る
+
+    照準は周期の異なる正弦波の和で動き、±1px 程度の誤差を加える。
+    約 10 秒ごとに照準を外し（`DamagePanelRecognition` の既定値）、
+    ロボットの状態はピッチ角の揺れ・弾速のばらつき・装填数の減少を模擬する。
+
+    Args:
+        seed: 乱数のシード
+    """
+
+    def __init__(self, seed: int | None = None) -> None:
+        self._random = random.Random(seed)
+
+    def damagepanel(self, t: float) -> DamagePanelRecognition:
+        if math.sin(2 * math.pi * 0.1 * t) > 0.95:
+            return DamagePanelRecognition()
+        x = 640 + 250 * math.sin(2 * math.pi * 0.4 * t) + 80 * math.sin(5.3 * t)
+        y = 360 + 60 * math.sin(2 * math.pi * 0.7 * t)
+        return DamagePanelRecognition(
+            target_x=round(x + self._random.gauss(0, 1.0)),
+            target_y=round(y + self._random.gauss(0, 1.0)),
+            target_distance=round(1500 + 300 * math.sin(0.8 * t)),
+        )
+
+    def force_vector(self, t: float) -> LiDARMessage:
+        return LiDARMessage(
+            linear=0.5 * math.sin(0.3 * t) + self._random.gauss(0, 0.02),
+            angular=0.8 * math.sin(0.9 * t) + self._random.gauss(0, 0.02),
+        )
+
+    def state(self, seq: int, t: float) -> RobotStateSnapshot:
+        fired = int(t * 2)  # 0.5 秒ごとに1枚撃ち、20枚で装填し直す
+        return RobotStateSnapshot(
+            state_id=RobotStateId.NORMAL.value,
+            pitch_deg=round(10 + 5 * math.sin(math.pi * t), 1),
+            muzzle_velocity=round(15 + self._random.gauss(0, 0.3), 2),
+            reloaded_left_disks=10 - (fired + 1) // 2 % 11,
+            reloaded_right_disks=10 - fired // 2 % 11,
+            video_id=int(t / 5) % 4,
+            target_panel=math.sin(2 * math.pi * 0.1 * t) <= 0.95,
+            auto_aim=True,
+            ready_to_fire=(seq // 50) % 2 == 0,
+            reserved=seq & 0xFF,
+        )
+
+
+class _Stream:
+    """一定のレートで配信する1つの入力"""
+
+    def __init__(
+        self,
+        name: str,
+        rate_hz: float,
+        send: Callable[[int, float], None],
+        key: str,
+    ) -> None:
+        self.name = name
+        self.key = key
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.send = send
+        self.next_send = 0.0
+        self.sent = 0
+        self.skipped = 0  # 送信が遅れて送らなかった回数
+
+
+class _ReceiveCounter:
+    """購読したキーに届いたサンプルを数える"""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.count = 0
+
+    def on_sample(self, sample: zenoh.Sample) -> None:
+        with self._lock:
+            self.count += 1
+
+
+class ZenohLoadGenerator:
+    """uart_bridge の入力と `robot/state` を一定のレートで配信し、受信数を数える
+
+    各入力の publisher は最初に1回だけ宣言し、1つのスレッドで入力ごとの
+    送信時刻（絶対時刻）になったものから送る。大きく遅れた場合は追いつこうとせず、
+    送らなかった回数を `skipped` に数えて現在時刻から送り直す。
+
+    配信する各キーと `watch` のキーを同じセッションで購読し、届いたサンプルを数える。
+    `damagepanel` は uart_bridge と同じく `prefix` を付けずに配信する。
+
+    Args:
+        profile: 入力ごとの配信レート
+        encoding: `damagepanel` と `lidar/force_vector` のペイロードの形式
+        state_per_field: `robot/state/<key>` にもフィールドごとに配信する
+        watch: 受信数を数える他のキー（`prefix` からの相対パス）
+        prefix: Zenoh のプレフィックス
+        session: 共有する Zenoh のセッション（None で開く）
+        session_config: セッションを開く場合の設定
+        seed: 乱数のシード
+    """
+
+    #: 送信が遅れたときにまとめて送る最大の時間[秒]
+    MAX_CATCH_UP = 0.01
+
+    def __init__(
+        self,
+        profile: LoadProfile = PROFILES["match"],
+        encoding: EncodingName = "json",
+        state_per_field: bool = False,
+        watch: Sequence[str] = (),
+        prefix: str = "",
+        session: zenoh.Session | None = None,
+        session_config: ZenohSessionConfig | None = None,
+        seed: int | None = None,
+    ) -> None:
+        self._owns_session = session is None
+        self._session = (
+            session
+            if session is not None
+            else zenoh.open(create_zenoh_config(session_config))
+        )
+        self._prefix = prefix.rstrip("/") + "/" if prefix else ""
+        self._encoding = ENCODINGS[encoding]
+        self._model = TrafficModel(seed)
+        self._declared: list[Any] = []
+        self._publishers: dict[str, zenoh.Publisher] = {}
+
+        self.streams: list[_Stream] = []
+        if profile.damagepanel_hz > 0:
+            self._add_stream(
+                "damagepanel", profile.damagepanel_hz, self._send_damagepanel
+            )
+        if profile.force_vector_hz > 0:
+            self._add_stream(
+                "force_vector", profile.force_vector_hz, self._send_force_vector
+            )
+        if profile.state_hz > 0:
+            self._add_stream("state", profile.state_hz, self._send_state)
+            if state_per_field:
+                for field in RobotStateSnapshot._fields:
+                    self._publishers[field] = self._declare_publisher(
+                        f"{self._prefix}robot/state/{field}"
+                    )
+
+        self.received: dict[str, _ReceiveCounter] = {}
+        keys = [stream.key for stream in self.streams]
+        keys += [f"{self._prefix}{key}" for key in watch]
+        for key in keys:
+            counter = self.received.setdefault(key, _ReceiveCounter())
+            self._declared.append(
+                self._session.declare_subscriber(key, counter.on_sample)
+            )
+
+        self.started_at = 0.0
+        self.stopped_at = 0.0
+        self._stop = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close()
+
+    @property
+    def session(self) -> zenoh.Session:
+        return self._session
+
+    def _declare_publisher(
+        self, key: str, encoding: zenoh.Encoding | None = None
+    ) -> zenoh.Publisher:
+        publisher = self._session.declare_publisher(key, encoding=encoding)
+        self._declared.append(publisher)
+        return publisher
+
+    def _add_stream(
+        self, name: str, rate_hz: float, send: Callable[[int, float], None]
+    ) -> None:
+        key = {
+            "damagepanel": "damagepanel",
+            "force_vector": f"{self._prefix}lidar/force_vector",
+            "state": f"{self._prefix}robot/state",
+        }[name]
+        encoding = STATE_ENCODING if name == "state" else self._encoding
+        self._publishers[name] = self._declare_publisher(key, encoding)
+        self.streams.append(_Stream(name, rate_hz, send, key))
+
+    def _send_damagepanel(self, seq: int, t: float) -> None:
+        d = self._model.damagepanel(t)
+        self._publishers["damagepanel"].put(encode_damagepanel(d, self._encoding))
+
+    def _send_force_vector(self, seq: int, t: float) -> None:
+        m = self._model.force_vector(t)
+        self._publishers["force_vector"].put(encode_force_vector(m, self._encoding))
+
+    def _send_state(self, seq: int, t: float) -> None:
+        snapshot = self._model.state(seq, t)
+        self._publishers["state"].put(pack_state(snapshot, seq + 1, time.time()))
+        for key, value in zip(RobotStateSnapshot._fields, snapshot):
+            publisher = self._publishers.get(key)
+            if publisher is not None:
+                publisher.put(format_state_field(key, value))
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        """次の送信時刻まで待ち、時刻になった入力から送る"""
+        self.started_at = time.monotonic()
+        for stream in self.streams:
+            stream.next_send = self.started_at
+        while self.streams and not self._stop.is_set():
+            now = time.monotonic()
+            for stream in self.streams:
+                if now - stream.next_send > self.MAX_CATCH_UP:
+                    missed = int((now - stream.next_send) / stream.period)
+                    stream.skipped += missed
+                    stream.next_send += missed * stream.period
+                while now >= stream.next_send:
+                    stream.send(stream.sent, stream.next_send - self.started_at)
+                    stream.sent += 1
+                    stream.next_send += stream.period
+            next_send = min(stream.next_send for stream in self.streams)
+            self._stop.wait(max(next_send - time.monotonic(), 0.0))
+        self.stopped_at = time.monotonic()
+
+    def stop(self) -> None:
+        """配信を止める"""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def summary(self) -> dict[str, Any]:
+        """入力ごとの配信・受信の数とレートを返す"""
+        elapsed = (self.stopped_at or time.monotonic()) - self.started_at
+        streams = {}
+        for stream in self.streams:
+            received = self.received[stream.key].count
+            streams[stream.name] = {
+                "key": stream.key,
+                "target_hz": stream.rate_hz,
+                "sent": stream.sent,
+                "sent_hz": stream.sent / elapsed,
+                "skipped": stream.skipped,
+                "received": received,
+                "received_hz": received / elapsed,
+                "lost": max(stream.sent - received, 0),
+            }
+        stream_keys = {stream.key for stream in self.streams}
+        watched = {
+            key: {"received": counter.count, "received_hz": counter.count / elapsed}
+            for key, counter in self.received.items()
+            if key not in stream_keys
+        }
+        return {"elapsed_s": elapsed, "streams": streams, "watch": watched}
+
+    def query_bridge_counters(self, timeout: float = 1.0) -> dict[str, int] | None:
+        """uart_bridge の `robot/stats` のカウンタを返す（返信が無ければ None）"""
+        for reply in self._session.get(f"{self._prefix}robot/stats", timeout=timeout):
+            if reply.ok is not None:
+                counters: dict[str, int] = json.loads(reply.ok.payload.to_string())[
+                    "counters"
+                ]
+                return counters
+        return None
+
+    def close(self) -> None:
+        self.stop()
+        if self._owns_session:
+            self._session.close()  # type: ignore
+            return
+        for entity in reversed(self._declared):
+            entity.undeclare()
+        self._declared.clear()
+
+
+def bridge_counter_deltas(
+    before: dict[str, int], after: dict[str, int], elapsed: float
+) -> dict[str, dict[str, float]]:
+    """入力元ごとの uart_bridge のカウンタの増分とレートを返す"""
+    deltas: dict[str, dict[str, float]] = {}
+    for source in ("damagepanel", "force_vector"):
+        values: dict[str, float] = {}
+        for name in ("received", "skipped", "invalid"):
+            key = f"{source}_{name}"
+            if key in after:
+                values[name] = after[key] - before.get(key, 0)
+        if "received" in values:
+            values["received_hz"] = values["received"] / elapsed
+        deltas[source] = values
+    return deltas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--profile", choices=PROFILES, default="match", help="既定の配信レート"
+    )
+    parser.add_argument("--damagepanel-hz", type=float, default=None)
+    parser.add_argument("--force-vector-hz", type=float, default=None)
+    parser.add_argument("--state-hz", type=float, default=None)
+    parser.add_argument(
+        "--encoding", choices=ENCODINGS, default="json", help="入力のペイロードの形式"
+    )
+    parser.add_argument(
+        "--state-per-field",
+        action="store_true",
+        help="robot/state/<key> にもフィールドごとに配信する",
+    )
+    parser.add_argument(
+        "--watch", action="append", default=[], help="受信数を数える他のキー"
+    )
+    parser.add_argument("--prefix", default="", help="Zenoh のプレフィックス")
+    parser.add_argument("--connect", action="append", default=[], help="接続先")
+    parser.add_argument("--duration", type=float, default=10.0, help="実行時間[秒]")
+    parser.add_argument(
+        "--bridge-stats",
+        action="store_true",
+        help="uart_bridge の robot/stats のカウンタの増分も出力する",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="乱数のシード")
+    args = parser.parse_args()
+
+    profile = PROFILES[args.profile]._replace(
+        **{
+            name: getattr(args, name)
+            for name in LoadProfile._fields
+            if getattr(args, name) is not None
+        }
+    )
+    generator = ZenohLoadGenerator(
+        profile=profile,
+        encoding=args.encoding,
+        state_per_field=args.state_per_field,
+        watch=args.watch,
+        prefix=args.prefix,
+        session_config=ZenohSessionConfig(connect=args.connect),
+        seed=args.seed,
+    )
+    try:
+        before = generator.query_bridge_counters() if args.bridge_stats else None
+        generator.start()
+        try:
+            time.sleep(args.duration)
+        except KeyboardInterrupt:
+            pass
+        generator.stop()
+        time.sleep(0.2)  # 配信済みのサンプルが届くのを待つ
+        result = generator.summary()
+        if before is not None:
+            after = generator.query_bridge_counters()
+            if after is not None:
+                result["bridge"] = bridge_counter_deltas(
+                    before, after, result["elapsed_s"]
+                )
+    finally:
+        generator.close()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
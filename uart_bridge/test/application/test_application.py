@@ -0,0 +1,194 @@
+import asyncio
+from time import monotonic
+
+from uart_bridge.application.application import Application, AsyncApplication
+from uart_bridge.application.async_adapters import (
+    AsyncRobotDriverAdapter,
+    AsyncTransmitterAdapter,
+)
+from uart_bridge.application.interfaces import RobotDriver, Transmitter
+from uart_bridge.domain.messages import (
+    RobotCommand,
+    RobotState,
+    RobotStateSnapshot,
+    as_snapshot,
+)
+
+
+class FakeRobotDriver(RobotDriver):
+    def __init__(self) -> None:
+        self.state = RobotState()
+        self.sent: list[RobotCommand] = []
+        self.received_at: list[float | None] = []
+        self.connected = True
+
+    def receive(self, state: RobotState) -> None:
+        self.state = state
+        self._notify_update()
+
+    def set_connected(self, connected: bool) -> None:
+        self.connected = connected
+        self._notify_update()
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def get_robot_state(self) -> RobotState:
+        return self.state
+
+    def set_send_values(
+        self, value: RobotCommand, received_at: float | None = None
+    ) -> None:
+        self.sent.append(value)
+        self.received_at.append(received_at)
+
+    def close(self) -> None:
+        pass
+
+
+class FakeTransmitter(Transmitter):
+    def __init__(self) -> None:
+        self.command = RobotCommand()
+        self.published: list[RobotStateSnapshot] = []
+        self.connections: list[bool] = []
+        self.deadline: float | None = None
+        self.received_at: float | None = None
+
+    def receive(self, command: RobotCommand, received_at: float | None = None) -> None:
+        self.command = command
+        self.received_at = received_at
+        self._notify_update()
+
+    def publish(self, robot_state: RobotState | RobotStateSnapshot) -> None:
+        self.published.append(as_snapshot(robot_state))
+
+    def publish_connection(self, connected: bool) -> None:
+        self.connections.append(connected)
+
+    def subscribe(self) -> RobotCommand:
+        if self.deadline is not None and monotonic() >= self.deadline:
+            self.command = RobotCommand()
+            self.deadline = None
+        return self.command
+
+    def next_deadline(self) -> float | None:
+        return self.deadline
+
+    def target_received_at(self) -> float | None:
+        return self.received_at
+
+    def close(self) -> None:
+        pass
+
+
+def test_spin_once_initial() -> None:
+    driver = FakeRobotDriver()
+    transmitter = FakeTransmitter()
+    app = Application(driver, transmitter)
+
+    assert app.spin_once(timeout=0)
+    assert transmitter.published == [RobotStateSnapshot()]
+    assert driver.sent == [RobotCommand()]
+
+
+def test_spin_once_waits_for_update() -> None:
+    driver = FakeRobotDriver()
+    transmitter = FakeTransmitter()
+    app = Application(driver, transmitter)
+    app.spin_once(timeout=0)
+
+    assert not app.spin_once(timeout=0.01)
+    assert len(transmitter.published) == 1
+    assert len(driver.sent) == 1
+
+
+def test_spin_once_only_updated_source() -> None:
+    driver = FakeRobotDriver()
+    transmitter = FakeTransmitter()
+    app = Application(driver, transmitter)
+    app.spin_once(timeout=0)
+
+    driver.receive(RobotState(reserved=1))
+    assert app.spin_once(timeout=0)
+    assert transmitter.published[-1].reserved == 1
+    assert len(driver.sent) == 1
+
+    transmitter.receive(RobotCommand(target_x=1))
+    assert app.spin_once(timeout=0)
+    assert driver.sent[-1].target_x == 1
+    assert len(transmitter.published) == 2
+
+
+def test_spin_once_passes_target_arrival() -> None:
+    driver = FakeRobotDriver()
+    transmitter = FakeTransmitter()
+    app = Application(driver, transmitter)
+    app.spin_once(timeout=0)
+
+    # 同じ照準でも、届くたびに到着時刻と一緒にドライバに渡す
+    for received_at in (1.0, 2.0):
+        transmitter.receive(RobotCommand(target_x=1), received_at)
+        assert app.spin_once(timeout=0)
+    assert driver.sent[-2:] == [RobotCommand(target_x=1)] * 2
+    assert driver.received_at[-2:] == [1.0, 2.0]
+
+
+def test_spin_once_wakes_at_deadline() -> None:
+    driver = FakeRobotDriver()
+    transmitter = FakeTransmitter()
+    app = Application(driver, transmitter)
+    app.spin_once(timeout=0)
+
+    transmitter.receive(RobotCommand(target_x=1))
+    transmitter.deadline = monotonic() + 0.02
+    assert app.spin_once(timeout=0)
+    assert driver.sent[-1].target_x == 1
+
+    # 期限になると通知が無くてもコマンドを作り直す
+    assert app.spin_once()
+    assert driver.sent[-1] == RobotCommand()
+    assert not app.spin_once(timeout=0.01)
+
+
+def test_spin_once_publishes_connection_changes() -> None:
+    driver = FakeRobotDriver()
+    transmitter = FakeTransmitter()
+    app = Application(driver, transmitter)
+
+    assert app.spin_once(timeout=0)
+    assert transmitter.connections == [True]
+
+    driver.set_connected(False)
+    assert app.spin_once(timeout=0)
+    driver.receive(RobotState(reserved=1))
+    assert app.spin_once(timeout=0)
+    driver.set_connected(True)
+    assert app.spin_once(timeout=0)
+
+    assert transmitter.connections == [True, False, True]
+
+
+def test_async_application_with_adapters() -> None:
+    driver = FakeRobotDriver()
+    transmitter = FakeTransmitter()
+
+    async def run() -> None:
+        async with (
+            AsyncRobotDriverAdapter(driver) as async_driver,
+            AsyncTransmitterAdapter(transmitter) as async_transmitter,
+        ):
+            app = AsyncApplication(async_driver, async_transmitter)
+            task = asyncio.create_task(app.spin())
+
+            await asyncio.sleep(0.01)
+            driver.receive(RobotState(reserved=1))
+            transmitter.receive(RobotCommand(target_x=1))
+            await asyncio.sleep(0.01)
+
+            task.cancel()
+
+    asyncio.run(run())
+
+    assert [s.reserved for s in transmitter.published] == [0, 1]
+    assert [c.target_x for c in driver.sent] == [640, 1]
+    assert transmitter.connections == [True]
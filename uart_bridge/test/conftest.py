@@ -0,0 +1,55 @@
+import os
+import time
+import tty
+from typing import Callable, Iterator
+
+import pytest
+
+
+@pytest.fixture
+def pty_pair() -> Iterator[tuple[int, str]]:
+    """疑似端末を作り、(マスター側の fd, スレーブ側のデバイスのパス) を返す"""
+    master, slave = os.openpty()
+    tty.setraw(master)
+    yield master, os.ttyname(slave)
+    os.close(slave)
+    os.close(master)
+
+
+@pytest.fixture
+def pty_pairs() -> Iterator[list[tuple[int, str]]]:
+    """疑似端末を2つ作る"""
+    pairs = []
+    for _ in range(2):
+        master, slave = os.openpty()
+        tty.setraw(master)
+        pairs.append((master, slave))
+    yield [(master, os.ttyname(slave)) for master, slave in pairs]
+    for master, slave in pairs:
+        os.close(slave)
+        os.close(master)
+
+
+def wait_until(condition: Callable[[], bool], timeout: float = 2.0) -> bool:
+    """`condition` が真になるまで待つ。timeout までにならなければ False"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.001)
+    return False
+
+
+def wait_for_bytes(fd: int, expected: bytes, timeout: float = 2.0) -> bool:
+    """`fd` から `expected` を含むバイト列が届くまで読む"""
+    os.set_blocking(fd, False)
+    buffer = b""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            buffer += os.read(fd, 4096)
+        except BlockingIOError:
+            time.sleep(0.001)
+        if expected in buffer:
+            return True
+    return False
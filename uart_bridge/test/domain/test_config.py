@@ -4,6 +4,7 @@ import pytest
 from pydantic import ValidationError
 
 from uart_bridge.domain.config import (
+    Config,
     load_and_parse_config,
 )
 
@@ -49,8 +50,18 @@ def test_read_global_config_zenoh_prefix(get_resource_path: Path) -> None:
 def test_read_uart_config_with_not_exist(get_resource_path: Path) -> None:
     config_file = get_resource_path / "uart_device.toml"
 
+    # 起動時に無いデバイスも、現れたら接続するのでそのまま受け付ける
+    c = load_and_parse_config(config_file).uart
+
+    assert c is not None
+    assert c.device == "/tmp/roboapp_test_uart"
+
+
+def test_read_uart_config_with_empty_device() -> None:
     with pytest.raises(ValidationError):
-        load_and_parse_config(config_file)
+        Config.model_validate({"uart": {"device": ""}})
+    with pytest.raises(ValidationError):
+        Config.model_validate({"uart": {"devices": {"left": {"device": " "}}}})
 
 
 def test_read_uart_config(get_resource_path: Path) -> None:
@@ -66,7 +77,187 @@ def test_read_uart_config(get_resource_path: Path) -> None:
     if c is None:
         pytest.fail("UART config should not be None")
 
-    assert c.device == "/dev/tty0"
+    assert c.device == "/tmp/roboapp_test_uart"
+    assert c.codec == "csv"
+    assert c.reconnect_max_interval_ms == 1000.0
+    assert not c.serial_process
+    assert c.log.level == "INFO"
+    assert c.history_size == 0
+    assert not c.target_prediction.enabled
+    assert c.log.frame_history == 64
+
+    if p.exists():
+        p.unlink()
+
+
+def test_read_uart_config_codec(get_resource_path: Path) -> None:
+    p = Path("/tmp/roboapp_test_uart")
+
+    if not p.exists():
+        p.symlink_to("/dev/tty0")
+
+    c = load_and_parse_config(get_resource_path / "uart_codec_binary.toml").uart
+
+    if c is None:
+        pytest.fail("UART config should not be None")
+
+    assert c.codec == "binary"
+
+    with pytest.raises(ValidationError):
+        load_and_parse_config(get_resource_path / "uart_codec_unknown.toml")
+
+    if p.exists():
+        p.unlink()
+
+
+def test_read_uart_config_publish_fields(get_resource_path: Path) -> None:
+    p = Path("/tmp/roboapp_test_uart")
+
+    if not p.exists():
+        p.symlink_to("/dev/tty0")
+
+    c = load_and_parse_config(get_resource_path / "uart_publish_fields.toml").uart
+
+    if c is None:
+        pytest.fail("UART config should not be None")
+
+    assert c.publish_keyframe_interval_ms == 500
+    assert c.publish_fields["pitch_deg"].deadband_abs == 0.1
+    assert c.publish_fields["pitch_deg"].deadband_rel == 0.0
+    assert c.publish_fields["pitch_deg"].max_rate_hz == 20
+
+    with pytest.raises(ValidationError):
+        load_and_parse_config(get_resource_path / "uart_publish_fields_unknown.toml")
+
+    if p.exists():
+        p.unlink()
+
+
+def test_read_uart_config_zenoh(get_resource_path: Path) -> None:
+    p = Path("/tmp/roboapp_test_uart")
+
+    if not p.exists():
+        p.symlink_to("/dev/tty0")
+
+    c = load_and_parse_config(get_resource_path / "uart_device.toml").uart
+
+    if c is None:
+        pytest.fail("UART config should not be None")
+
+    assert c.zenoh.mode == "peer"
+    assert c.zenoh.connect == []
+    assert c.publish_qos["robot/state/state_id"].priority == "interactive_high"
+    assert c.publish_qos["robot/state/ready_to_fire"].express
+    assert c.publish_qos["robot/connection"].express
+
+    c = load_and_parse_config(get_resource_path / "uart_zenoh.toml").uart
+
+    if c is None:
+        pytest.fail("UART config should not be None")
+
+    assert c.zenoh.mode == "client"
+    assert c.zenoh.connect == ["tcp/192.168.0.10:7447"]
+    assert c.zenoh.multicast_scouting is None
+    assert c.publish_qos["robot/state/*"].priority == "data_low"
+    assert c.publish_qos["robot/state/*"].congestion_control == "block"
+    assert not c.publish_qos["robot/state/*"].express
+    # 既定の QoS は残り、指定したキーだけが上書きされる
+    assert c.publish_qos["robot/state/state_id"].priority == "interactive_high"
+    assert c.publish_qos["robot/connection"].express
+    assert c.publish_qos["robot/state"].priority == "data"
+
+    with pytest.raises(ValidationError):
+        load_and_parse_config(get_resource_path / "uart_publish_qos_invalid.toml")
+
+    if p.exists():
+        p.unlink()
+
+
+def test_read_uart_config_record(get_resource_path: Path) -> None:
+    p = Path("/tmp/roboapp_test_uart")
+
+    if not p.exists():
+        p.symlink_to("/dev/tty0")
+
+    c = load_and_parse_config(get_resource_path / "uart_device.toml").uart
+
+    if c is None:
+        pytest.fail("UART config should not be None")
+
+    assert c.record_path is None
+
+    c = load_and_parse_config(get_resource_path / "uart_record.toml").uart
+
+    if c is None:
+        pytest.fail("UART config should not be None")
+
+    assert c.record_path == "/tmp/roboapp/uart-%Y%m%d-%H%M%S.ublog"
+
+    if p.exists():
+        p.unlink()
+
+
+def test_read_uart_config_devices(get_resource_path: Path) -> None:
+    p = Path("/tmp/roboapp_test_uart")
+
+    if not p.exists():
+        p.symlink_to("/dev/tty0")
+
+    c = load_and_parse_config(get_resource_path / "uart_devices.toml").uart
+
+    if c is None:
+        pytest.fail("UART config should not be None")
+
+    assert c.device is None
+    devices = c.device_configs()
+    assert list(devices) == ["left", "right"]
+    assert devices["left"].device == "/tmp/roboapp_test_uart"
+    assert devices["left"].codec == "binary"
+    assert devices["left"].prefix == "left"
+    assert devices["right"].codec == "csv"
+    assert devices["right"].prefix == "robot_r"
+
+    c = load_and_parse_config(get_resource_path / "uart_device.toml").uart
+
+    if c is None:
+        pytest.fail("UART config should not be None")
+
+    assert list(c.device_configs()) == [""]
+    assert c.device_configs()[""].prefix == ""
+
+    if p.exists():
+        p.unlink()
+
+
+def test_read_uart_config_without_device(get_resource_path: Path) -> None:
+    with pytest.raises(ValidationError):
+        load_and_parse_config(get_resource_path / "uart_no_device.toml")
+
+
+def test_read_uart_config_scheduling(get_resource_path: Path) -> None:
+    p = Path("/tmp/roboapp_test_uart")
+
+    if not p.exists():
+        p.symlink_to("/dev/tty0")
+
+    c = load_and_parse_config(get_resource_path / "uart_device.toml").uart
+
+    if c is None:
+        pytest.fail("UART config should not be None")
+
+    assert c.tx_overrun == "skip"
+    assert c.scheduling.cpu_affinity == []
+    assert c.scheduling.sched_fifo_priority is None
+
+    c = load_and_parse_config(get_resource_path / "uart_scheduling.toml").uart
+
+    if c is None:
+        pytest.fail("UART config should not be None")
+
+    assert c.tx_overrun == "catch_up"
+    assert c.scheduling.cpu_affinity == [0]
+    assert c.scheduling.sched_fifo_priority == 50
+    assert c.scheduling.nice == -5
 
     if p.exists():
         p.unlink()
@@ -0,0 +1,134 @@
+import json
+import logging
+import threading
+
+import pytest
+
+from uart_bridge.domain.config import LogConfig
+from uart_bridge.infra import app_logging
+from uart_bridge.infra.app_logging import (
+    FrameHistory,
+    JsonFormatter,
+    RateLimitFilter,
+    TextFormatter,
+    configure_logging,
+)
+
+
+def make_record(msg: str, *args: object) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 0, msg, args, None)
+
+
+def test_rate_limit_counts_suppressed(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 0.0
+    monkeypatch.setattr(app_logging, "monotonic", lambda: now)
+    limiter = RateLimitFilter(rate=1.0, burst=2)
+
+    passed = [limiter.filter(make_record("read %r", i)) for i in range(5)]
+    # 別のメッセージは別に数える
+    assert limiter.filter(make_record("other"))
+
+    assert passed == [True, True, False, False, False]
+
+    now = 1.0
+    record = make_record("read %r", 5)
+    assert limiter.filter(record)
+    assert getattr(record, "suppressed") == 3
+    assert not limiter.filter(make_record("read %r", 6))
+
+
+def test_rate_limit_separates_keys() -> None:
+    limiter = RateLimitFilter(rate=1.0, burst=1)
+
+    def record(port: str) -> logging.LogRecord:
+        record = make_record("corrupt frame from %s", port)
+        record.rate_limit_key = port
+        return record
+
+    assert limiter.filter(record("/dev/ttyUSB0"))
+    # 別のデバイスのエラーは間引かない
+    assert limiter.filter(record("/dev/ttyUSB1"))
+    dropped = record("/dev/ttyUSB0")
+    assert not limiter.filter(dropped)
+    assert getattr(dropped, "rate_limited")
+
+
+def test_rate_limit_disabled() -> None:
+    limiter = RateLimitFilter(rate=0.0)
+
+    assert all(limiter.filter(make_record("read %r", i)) for i in range(100))
+
+
+def test_formats_on_listener_thread(capsys: pytest.CaptureFixture[str]) -> None:
+    formatted_on: list[str] = []
+
+    class Value:
+        def __repr__(self) -> str:
+            formatted_on.append(threading.current_thread().name)
+            return "value"
+
+    logger = logging.getLogger("uart_bridge.test")
+    with configure_logging(LogConfig(format="json")):
+        logger.info("got %r", Value())
+        logger.debug("not shown")
+
+    lines = capsys.readouterr().err.splitlines()
+    assert len(lines) == 1
+    entry = json.loads(lines[0])
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "uart_bridge.test"
+    assert entry["message"] == "got value"
+    # pytest のハンドラとは別に、出力する文字列はリスナーのスレッドで整形する
+    assert formatted_on[-1] != threading.current_thread().name
+
+
+def test_frame_history_keeps_last_frames(caplog: pytest.LogCaptureFixture) -> None:
+    history = FrameHistory(3)
+    for i in range(5):
+        history.append(float(i), "rx" if i % 2 else "tx", bytes([0x30 + i]))
+
+    history.dump(logging.getLogger("test"), "corrupt frame from %s", "/dev/ttyUSB0")
+
+    assert len(history) == 0
+    (record,) = caplog.records
+    assert record.levelno == logging.ERROR
+    # 間引きのキーになるフォーマット文字列は、フレームの有無で変わらない
+    assert record.msg == "corrupt frame from %s"
+    assert record.getMessage() == "corrupt frame from /dev/ttyUSB0"
+    # フレームは出力するときに整形する
+    assert TextFormatter().format(record).splitlines()[1:] == [
+        "  -2.000000 tx b'2'",
+        "  -1.000000 rx b'3'",
+        "  +0.000000 tx b'4'",
+    ]
+    assert (
+        TextFormatter()
+        .format(record)
+        .splitlines()[0]
+        .endswith("corrupt frame from /dev/ttyUSB0; last 3 frames:")
+    )
+    assert json.loads(JsonFormatter().format(record))["frames"] == [
+        "-2.000000 tx b'2'",
+        "-1.000000 rx b'3'",
+        "+0.000000 tx b'4'",
+    ]
+
+
+def test_frame_history_kept_when_rate_limited(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    logger = logging.getLogger("uart_bridge.test.frames")
+    limiter = RateLimitFilter(rate=1.0, burst=1)
+    logger.addFilter(limiter)
+    history = FrameHistory(4)
+    try:
+        history.append(0.0, "rx", b"a")
+        history.dump(logger, "corrupt frame from %s", "/dev/ttyUSB0")
+        history.append(1.0, "rx", b"b")
+        history.dump(logger, "corrupt frame from %s", "/dev/ttyUSB0")
+    finally:
+        logger.removeFilter(limiter)
+
+    # 間引かれたエラーのフレームは次のエラーで書き出せるように残す
+    assert len(caplog.records) == 1
+    assert len(history) == 1
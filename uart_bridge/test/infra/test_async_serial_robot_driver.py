@@ -0,0 +1,102 @@
+import asyncio
+import os
+import tty
+from pathlib import Path
+
+import pytest
+
+from uart_bridge.domain.messages import RobotCommand
+from uart_bridge.infra.async_serial_robot_driver import AsyncSerialRobotDriver
+from uart_bridge.infra.codec import CsvCodec
+
+
+async def read_until(fd: int, expected: bytes) -> bytes:
+    buffer = b""
+    while expected not in buffer:
+        try:
+            buffer += os.read(fd, 4096)
+        except BlockingIOError:
+            await asyncio.sleep(0.001)
+    return buffer
+
+
+def test_receive_and_send() -> None:
+    master, slave = os.openpty()
+    tty.setraw(master)
+    os.set_blocking(master, False)
+
+    async def run() -> None:
+        async with AsyncSerialRobotDriver(os.ttyname(slave)) as driver:
+            assert (await driver.wait_for_state()).reserved == 0
+
+            os.write(master, b"2,0,0,0,")
+            os.write(master, b"0,0,0,3\n")
+            state = await asyncio.wait_for(driver.wait_for_state(), 1.0)
+            assert state.reserved == 3
+
+            driver.set_send_values(RobotCommand(target_x=1))
+            await asyncio.wait_for(read_until(master, b"\n1,360,0,0,0,0\n"), 1.0)
+
+    try:
+        asyncio.run(run())
+    finally:
+        os.close(slave)
+        os.close(master)
+
+
+def test_reconnect_when_device_appears(tmp_path: Path) -> None:
+    master, slave = os.openpty()
+    tty.setraw(master)
+    link = tmp_path / "ttyUSB0"
+
+    async def run() -> None:
+        async with AsyncSerialRobotDriver(
+            str(link), timeout=5.0, reconnect_max=5.0
+        ) as driver:
+            await driver.wait_for_state()
+            assert not driver.is_connected()
+
+            link.symlink_to(os.ttyname(slave))
+            await asyncio.wait_for(driver.wait_for_state(), 1.0)
+            assert driver.is_connected()
+
+    try:
+        asyncio.run(run())
+    finally:
+        os.close(slave)
+        os.close(master)
+
+
+class _FailOnceCodec(CsvCodec):
+    def __init__(self) -> None:
+        super().__init__()
+        self.failed = False
+
+    def encode(self, command: RobotCommand) -> bytes:
+        if not self.failed:
+            self.failed = True
+            raise RuntimeError("broken encode")
+        return super().encode(command)
+
+
+def test_error_in_service_keeps_running(caplog: pytest.LogCaptureFixture) -> None:
+    master, slave = os.openpty()
+    tty.setraw(master)
+    os.set_blocking(master, False)
+    codec = _FailOnceCodec()
+
+    async def run() -> None:
+        async with AsyncSerialRobotDriver(os.ttyname(slave), codec=codec) as driver:
+            # 最初の送信で例外が起きても、送信を続ける
+            await asyncio.wait_for(read_until(master, b"640,360,0,0,0,0\n"), 1.0)
+            driver.set_send_values(RobotCommand(target_x=1))
+            await asyncio.wait_for(read_until(master, b"1,360,0,0,0,0\n"), 1.0)
+
+    try:
+        asyncio.run(run())
+    finally:
+        os.close(slave)
+        os.close(master)
+
+    assert codec.failed
+    assert "broken encode" in caplog.text
@@ -0,0 +1,209 @@
+import pytest
+
+from uart_bridge.domain.messages import (
+    RobotCommand,
+    RobotState,
+    RobotStateId,
+    RobotStateSnapshot,
+)
+from uart_bridge.infra.codec import (
+    BinaryCodec,
+    CsvCodec,
+    cobs_decode,
+    cobs_encode,
+    create_codec,
+)
+
+STATE = RobotStateSnapshot(
+    state_id=RobotStateId.NORMAL.value,
+    pitch_deg=12.5,
+    muzzle_velocity=15.25,
+    reloaded_left_disks=3,
+    reloaded_right_disks=4,
+    video_id=1,
+    target_panel=True,
+    auto_aim=False,
+    record_video=True,
+    ready_to_fire=True,
+    reserved=7,
+)
+
+
+def test_csv_decode() -> None:
+    codec = CsvCodec()
+
+    assert codec.feed(b"2,125,15250,3,4,1,11,7\n") == [STATE]
+    assert codec.corrupt_frames == 0
+
+
+def test_csv_decode_split_line() -> None:
+    codec = CsvCodec()
+
+    assert codec.feed(b"2,125,152") == []
+    assert codec.feed(b"50,3,4,1,11,7\n2,0,0,0,0,0,0,0\n") == [
+        STATE,
+        RobotStateSnapshot(state_id=RobotStateId.NORMAL.value),
+    ]
+
+
+def test_csv_decode_corrupt() -> None:
+    codec = CsvCodec()
+
+    assert codec.feed(b"2,125,15250\n9,0,0,0,0,0,0,0\n\xff\n") == []
+    assert codec.corrupt_frames == 3
+
+
+def test_snapshot_to_model() -> None:
+    state = STATE.to_model()
+
+    assert isinstance(state, RobotState)
+    assert state.state_id == RobotStateId.NORMAL
+    assert RobotStateSnapshot.from_model(state) == STATE
+
+
+def test_csv_encode() -> None:
+    command = RobotCommand(target_x=1, target_y=2, target_distance=3)
+
+    assert CsvCodec().encode(command) == b"1,2,3,0,0,0\n"
+
+
+def test_cobs_round_trip() -> None:
+    for data in (
+        b"",
+        b"\x00",
+        b"\x11\x00\x00\x22",
+        b"\x01" * 253,
+        b"\x01" * 254,
+        b"\x01" * 254 + b"\x00\x02",
+        bytes(range(256)) * 2,
+    ):
+        encoded = cobs_encode(data)
+        assert b"\x00" not in encoded
+        assert cobs_decode(encoded) == data
+
+
+def test_cobs_encode_known_frames() -> None:
+    assert cobs_encode(b"") == b"\x01"
+    assert cobs_encode(b"\x11\x00\x00\x22") == b"\x02\x11\x01\x02\x22"
+    assert cobs_encode(b"\x01" * 254) == b"\xff" + b"\x01" * 254 + b"\x01"
+
+
+def test_cobs_decode_invalid() -> None:
+    for data in (b"\x03\x11", b"\x02\x00"):
+        with pytest.raises(ValueError):
+            cobs_decode(data)
+
+
+def test_binary_decode() -> None:
+    codec = BinaryCodec()
+
+    frames = BinaryCodec.pack_state(STATE, 0) + BinaryCodec.pack_state(STATE, 1)
+
+    assert codec.feed(frames[:5]) == []
+    assert codec.feed(frames[5:]) == [STATE, STATE]
+    assert codec.dropped_frames == 0
+    assert codec.corrupt_frames == 0
+
+
+def test_binary_decode_dropped() -> None:
+    codec = BinaryCodec()
+
+    codec.feed(BinaryCodec.pack_state(STATE, 254))
+    codec.feed(BinaryCodec.pack_state(STATE, 2))
+
+    assert codec.dropped_frames == 3
+
+
+def test_binary_decode_repeated_seq() -> None:
+    codec = BinaryCodec()
+
+    codec.feed(BinaryCodec.pack_state(STATE, 7))
+    assert codec.feed(BinaryCodec.pack_state(STATE, 7)) == [STATE]
+    codec.feed(BinaryCodec.pack_state(STATE, 8))
+
+    assert codec.dropped_frames == 0
+
+
+def test_binary_decode_corrupt() -> None:
+    codec = BinaryCodec()
+
+    frame = bytearray(BinaryCodec.pack_state(STATE, 0))
+    frame[3] ^= 0x01
+
+    assert codec.feed(bytes(frame)) == []
+    assert codec.feed(b"\x05\x01\x00") == []
+    assert codec.corrupt_frames == 2
+
+
+def test_binary_encode() -> None:
+    codec = BinaryCodec()
+    command = RobotCommand(target_x=-1, target_distance=100)
+
+    first = codec.encode(command)
+    second = codec.encode(command)
+
+    assert first.endswith(b"\x00")
+    # CSV の既定のコマンド（16バイト）より短い
+    assert len(codec.encode(RobotCommand())) == 15
+    assert BinaryCodec.unpack_frame(first[:-1]) == (
+        0,
+        BinaryCodec.COMMAND.pack(-1, 360, 100, 0, 0),
+    )
+    unpacked = BinaryCodec.unpack_frame(second[:-1])
+    assert unpacked is not None
+    assert unpacked[0] == 1
+
+
+def test_binary_encode_clamps_to_int16() -> None:
+    codec = BinaryCodec()
+    command = RobotCommand(target_distance=40000, force_linear=-40000)
+
+    frame = codec.encode(command)
+
+    unpacked = BinaryCodec.unpack_frame(frame[:-1])
+    assert unpacked is not None
+    assert unpacked[1] == BinaryCodec.COMMAND.pack(640, 360, 32767, -32768, 0)
+
+
+def test_feed_drops_overlong_frame() -> None:
+    codec = CsvCodec()
+
+    # 区切り文字が届かないまま溜まり続ける（フォーマットの設定違いなど）
+    for _ in range(10):
+        assert codec.feed(b"\xff" * 100) == []
+    assert codec.corrupt_frames >= 1
+    assert len(codec._buffer) <= codec.max_frame_length
+
+    codec.feed(b"\n")
+    corrupt = codec.corrupt_frames
+    assert codec.feed(CsvCodec.pack_state(STATE)) == [STATE]
+    assert codec.corrupt_frames == corrupt
+
+
+def test_feed_many_frames_at_once() -> None:
+    codec = BinaryCodec()
+    data = b"".join(BinaryCodec.pack_state(STATE, seq) for seq in range(100))
+
+    assert codec.feed(data[:-5]) == [STATE] * 99
+    assert codec.feed(data[-5:]) == [STATE]
+    assert codec.dropped_frames == 0
+
+
+def test_create_codec() -> None:
+    assert isinstance(create_codec("csv"), CsvCodec)
+    assert isinstance(create_codec("binary"), BinaryCodec)
+
+
+def test_mcu_side_round_trip() -> None:
+    command = RobotCommand(target_x=-1, target_y=360, target_distance=100)
+
+    csv = CsvCodec()
+    assert CsvCodec.pack_state(STATE) == b"2,125,15250,3,4,1,11,7\n"
+    assert csv.feed(CsvCodec.pack_state(STATE)) == [STATE]
+    assert csv.decode_command(csv.encode(command).rstrip(b"\n")) == command
+    assert csv.decode_command(b"1,2,3") is None
+    assert csv.decode_command(b"1,2,3,4,5,x") is None
+
+    binary = BinaryCodec()
+    assert binary.decode_command(binary.encode(command)[:-1]) == command
+    assert binary.decode_command(BinaryCodec.pack_frame(0, b"\x01\x02")[:-1]) is None
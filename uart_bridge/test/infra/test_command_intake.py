@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+
+import zenoh
+
+from uart_bridge.infra.command_intake import CommandSource
+from uart_bridge.infra.command_payload import (
+    DAMAGEPANEL,
+    STRUCT_ENCODING,
+    decode_damagepanel,
+)
+
+
+@dataclass
+class FakeSample:
+    payload: zenoh.ZBytes
+    encoding: zenoh.Encoding
+
+
+def sample(target_x: int) -> zenoh.Sample:
+    payload = zenoh.ZBytes(DAMAGEPANEL.pack(target_x, 0, 0))
+    return FakeSample(payload, STRUCT_ENCODING)  # type: ignore[return-value]
+
+
+def test_poll_uses_newest_sample() -> None:
+    notified: list[None] = []
+    source = CommandSource(
+        decode_damagepanel, (640, 360, 0), on_received=lambda: notified.append(None)
+    )
+
+    assert source.poll(0.0) == (640, 360, 0)
+
+    for target_x in (1, 2, 3):
+        source.on_sample(sample(target_x))
+
+    assert len(notified) == 3
+    assert source.poll(0.0) == (3, 0, 0)
+    assert source.received_samples == 3
+    assert source.skipped_samples == 2
+
+    # 新しいサンプルが無ければ最新の値を保持する
+    assert source.poll(0.0) == (3, 0, 0)
+
+
+def test_ring_is_bounded() -> None:
+    source = CommandSource(decode_damagepanel, (640, 360, 0), capacity=2)
+
+    for target_x in range(10):
+        source.on_sample(sample(target_x))
+
+    assert source.poll(0.0) == (9, 0, 0)
+    assert source.received_samples == 2
+
+
+def test_invalid_sample_falls_back_to_older() -> None:
+    source = CommandSource(decode_damagepanel, (640, 360, 0))
+
+    source.on_sample(sample(1))
+    source.on_sample(FakeSample(zenoh.ZBytes(b"x"), STRUCT_ENCODING))  # type: ignore[arg-type]
+
+    assert source.poll(0.0) == (1, 0, 0)
+    assert source.invalid_samples == 1
+
+
+def test_stale_falls_back_to_default() -> None:
+    source = CommandSource(decode_damagepanel, (640, 360, 0), timeout=0.1)
+    assert source.stale_deadline() is None
+
+    source.on_sample(sample(1))
+    assert source.poll(0.0) == (1, 0, 0)
+
+    received_at = source.received_at
+    assert received_at is not None
+    assert source.stale_deadline() == received_at + 0.1
+    assert source.poll(received_at + 0.05) == (1, 0, 0)
+    assert source.poll(received_at + 0.1) == (640, 360, 0)
+
+    # 既定値に戻したら、次のサンプルが届くまで期限は無い
+    assert source.stale_deadline() is None
+
+    source.on_sample(sample(2))
+    assert source.poll(received_at + 0.1) == (2, 0, 0)
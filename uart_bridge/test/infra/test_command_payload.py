@@ -0,0 +1,102 @@
+import math
+
+import msgpack  # type: ignore[import-untyped]
+import pytest
+import zenoh
+
+from uart_bridge.domain.messages import DamagePanelRecognition, LiDARMessage
+from uart_bridge.infra.command_payload import (
+    DAMAGEPANEL,
+    FORCE_VECTOR,
+    MSGPACK_ENCODING,
+    STRUCT_ENCODING,
+    decode_damagepanel,
+    decode_force_vector,
+    encode_damagepanel,
+    encode_force_vector,
+)
+
+ENCODINGS = [zenoh.Encoding.APPLICATION_JSON, MSGPACK_ENCODING, STRUCT_ENCODING]
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS, ids=str)
+def test_damagepanel_round_trip(encoding: zenoh.Encoding) -> None:
+    d = DamagePanelRecognition(target_x=100, target_y=200, target_distance=30)
+
+    payload = encode_damagepanel(d, encoding)
+
+    assert decode_damagepanel(payload, encoding) == (100, 200, 30)
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS, ids=str)
+def test_force_vector_round_trip(encoding: zenoh.Encoding) -> None:
+    m = LiDARMessage(linear=1.5, angular=-0.25)
+
+    payload = encode_force_vector(m, encoding)
+
+    assert decode_force_vector(payload, encoding) == (1.5, -0.25)
+
+
+def test_unknown_encoding_falls_back_to_json() -> None:
+    payload = b'{"target_x": 1, "target_y": 2, "target_distance": 3}'
+
+    assert decode_damagepanel(payload, zenoh.Encoding.ZENOH_BYTES) == (1, 2, 3)
+    assert decode_damagepanel(payload, zenoh.Encoding.TEXT_PLAIN) == (1, 2, 3)
+
+
+@pytest.mark.parametrize(
+    ("payload", "encoding"),
+    [
+        (DAMAGEPANEL.pack(1, 2, 3)[:-1], STRUCT_ENCODING),
+        (b"\x81\xa1a\x01", MSGPACK_ENCODING),  # {"a": 1}
+        (b"\xc1", MSGPACK_ENCODING),
+        (b"{}}", zenoh.Encoding.APPLICATION_JSON),
+    ],
+)
+def test_invalid_payload_raises_value_error(
+    payload: bytes, encoding: zenoh.Encoding
+) -> None:
+    with pytest.raises(ValueError):
+        decode_damagepanel(payload, encoding)
+
+
+@pytest.mark.parametrize(
+    ("payload", "encoding"),
+    [
+        (FORCE_VECTOR.pack(math.nan, 0.0), STRUCT_ENCODING),
+        (FORCE_VECTOR.pack(0.0, math.inf), STRUCT_ENCODING),
+        (FORCE_VECTOR.pack(1e6, 0.0), STRUCT_ENCODING),
+        (msgpack.packb({"linear": math.nan, "angular": 0.0}), MSGPACK_ENCODING),
+        (b'{"linear": NaN, "angular": 0}', zenoh.Encoding.APPLICATION_JSON),
+        (b'{"linear": 0, "angular": Infinity}', zenoh.Encoding.APPLICATION_JSON),
+    ],
+)
+def test_non_finite_force_vector_raises_value_error(
+    payload: bytes, encoding: zenoh.Encoding
+) -> None:
+    with pytest.raises(ValueError):
+        decode_force_vector(payload, encoding)
+
+
+@pytest.mark.parametrize(
+    ("payload", "encoding"),
+    [
+        (
+            msgpack.packb({"target_x": math.inf, "target_y": 0, "target_distance": 0}),
+            MSGPACK_ENCODING,
+        ),
+        (
+            msgpack.packb({"target_x": 0, "target_y": 0, "target_distance": 40000}),
+            MSGPACK_ENCODING,
+        ),
+        (
+            b'{"target_x": 0, "target_y": 0, "target_distance": 40000}',
+            zenoh.Encoding.APPLICATION_JSON,
+        ),
+    ],
+)
+def test_out_of_range_damagepanel_raises_value_error(
+    payload: bytes, encoding: zenoh.Encoding
+) -> None:
+    with pytest.raises(ValueError):
+        decode_damagepanel(payload, encoding)
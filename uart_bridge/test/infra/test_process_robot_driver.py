@@ -0,0 +1,46 @@
+import os
+
+from conftest import wait_for_bytes, wait_until
+
+from uart_bridge.domain.messages import RobotCommand, RobotStateId
+from uart_bridge.infra.process_robot_driver import ProcessRobotDriver
+from uart_bridge.infra.stats import BridgeStats
+
+
+def test_exchange_state_and_command(pty_pair: tuple[int, str]) -> None:
+    master, port = pty_pair
+    stats = BridgeStats()
+    updates: list[None] = []
+
+    with ProcessRobotDriver(port, stats=stats) as driver:
+        driver.set_update_callback(lambda: updates.append(None))
+        # 子プロセスの起動を待つ（spawn なので時間がかかる）
+        assert wait_until(driver.is_connected, timeout=5.0)
+
+        os.write(master, b"2,100,2000,1,2,0,1,5\n")
+
+        assert wait_until(lambda: driver.state_version == 1)
+        state = driver.get_robot_state()
+        assert state.state_id == RobotStateId.NORMAL
+        assert state.pitch_deg == 10.0
+        assert state.reserved == 5
+        assert updates
+        assert stats.state_received_at is not None
+
+        driver.set_send_values(RobotCommand(target_x=1, target_y=2))
+
+        assert wait_for_bytes(master, b"1,2,0,0,0,0\n")
+
+        # カウンタは次に状態を受信したときに共有メモリに書き込まれる
+        os.write(master, b"garbage\n2,100,2000,1,2,0,1,6\n")
+
+        assert wait_until(lambda: driver.state_version == 2)
+        assert driver.corrupt_frames == 1
+        assert stats.summary()["counters"]["rx_corrupt_frames"] == 1
+
+        # 子プロセスで計測した送信の統計も集計する
+        summary = stats.summary()
+        assert summary["latency"]["tx_period"]["count"] >= 1
+        assert {"tx_overruns", "tx_skipped"} <= summary["counters"].keys()
+
+    assert not driver.is_connected()
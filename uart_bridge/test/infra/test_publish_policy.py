@@ -0,0 +1,71 @@
+from uart_bridge.domain.config import FieldPublishConfig
+from uart_bridge.domain.messages import RobotStateSnapshot
+from uart_bridge.infra.publish_policy import StatePublishPolicy
+
+PITCH = RobotStateSnapshot._fields.index("pitch_deg")
+VELOCITY = RobotStateSnapshot._fields.index("muzzle_velocity")
+READY = RobotStateSnapshot._fields.index("ready_to_fire")
+
+
+def test_first_publish_sends_all() -> None:
+    policy = StatePublishPolicy()
+
+    assert policy.select(RobotStateSnapshot(), 0.0) == list(
+        range(len(RobotStateSnapshot._fields))
+    )
+    assert policy.select(RobotStateSnapshot(), 0.1) == []
+
+
+def test_exact_change_by_default() -> None:
+    policy = StatePublishPolicy()
+    policy.select(RobotStateSnapshot(), 0.0)
+
+    assert policy.select(RobotStateSnapshot(ready_to_fire=True), 0.1) == [READY]
+
+
+def test_deadband() -> None:
+    policy = StatePublishPolicy(
+        fields={
+            "pitch_deg": FieldPublishConfig(deadband_abs=0.5),
+            "muzzle_velocity": FieldPublishConfig(deadband_rel=0.1),
+        }
+    )
+    state = RobotStateSnapshot(muzzle_velocity=10.0)
+    policy.select(state, 0.0)
+
+    assert policy.select(state._replace(pitch_deg=0.3), 0.1) == []
+    # 抑制された変化は前回配信値と比較し続ける
+    assert policy.select(state._replace(pitch_deg=0.6), 0.2) == [PITCH]
+
+    state = state._replace(pitch_deg=0.6)
+    assert policy.select(state._replace(muzzle_velocity=10.5), 0.3) == []
+    assert policy.select(state._replace(muzzle_velocity=11.5), 0.4) == [VELOCITY]
+
+
+def test_max_rate() -> None:
+    policy = StatePublishPolicy(
+        fields={"pitch_deg": FieldPublishConfig(max_rate_hz=10)}
+    )
+    policy.select(RobotStateSnapshot(), 0.0)
+
+    assert policy.select(RobotStateSnapshot(pitch_deg=1.0), 0.05) == []
+    assert policy.select(RobotStateSnapshot(pitch_deg=2.0), 0.1) == [PITCH]
+
+
+def test_keyframe() -> None:
+    policy = StatePublishPolicy(keyframe_interval=1.0)
+    policy.select(RobotStateSnapshot(), 0.0)
+
+    assert policy.select(RobotStateSnapshot(), 0.5) == []
+    assert len(policy.select(RobotStateSnapshot(), 1.0)) == len(
+        RobotStateSnapshot._fields
+    )
+
+
+def test_force() -> None:
+    policy = StatePublishPolicy()
+    policy.select(RobotStateSnapshot(), 0.0)
+
+    assert len(policy.select(RobotStateSnapshot(), 0.0, force=True)) == len(
+        RobotStateSnapshot._fields
+    )
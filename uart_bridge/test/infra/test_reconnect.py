@@ -0,0 +1,53 @@
+import os
+import selectors
+from pathlib import Path
+
+from uart_bridge.infra.reconnect import DeviceWatcher, ReconnectBackoff
+
+
+def wait_readable(watcher: DeviceWatcher, timeout: float = 1.0) -> bool:
+    with selectors.DefaultSelector() as selector:
+        selector.register(watcher.fileno(), selectors.EVENT_READ)
+        return bool(selector.select(timeout))
+
+
+def test_backoff() -> None:
+    backoff = ReconnectBackoff(0.01, 0.05)
+
+    assert [backoff.next_delay() for _ in range(5)] == [0.01, 0.02, 0.04, 0.05, 0.05]
+    backoff.reset()
+    assert backoff.next_delay() == 0.01
+
+
+def test_watcher_detects_device(tmp_path: Path) -> None:
+    device = tmp_path / "ttyUSB0"
+
+    with DeviceWatcher(device) as watcher:
+        assert not wait_readable(watcher, 0.01)
+
+        (tmp_path / "other").touch()
+        assert wait_readable(watcher)
+        assert not watcher.read()
+
+        device.symlink_to(os.devnull)
+        assert wait_readable(watcher)
+        assert watcher.read()
+
+
+def test_watcher_follows_created_directory(tmp_path: Path) -> None:
+    # /dev/serial/by-id のようにデバイスが無い間はディレクトリごと無いパス
+    by_id = tmp_path / "serial" / "by-id"
+    device = by_id / "usb-STM32-if00"
+
+    with DeviceWatcher(device) as watcher:
+        by_id.parent.mkdir()
+        assert wait_readable(watcher)
+        assert not watcher.read()
+
+        by_id.mkdir()
+        assert wait_readable(watcher)
+        assert not watcher.read()
+
+        device.symlink_to(os.devnull)
+        assert wait_readable(watcher)
+        assert watcher.read()
@@ -0,0 +1,62 @@
+import time
+from pathlib import Path
+
+from uart_bridge.domain.messages import RobotCommand, RobotStateSnapshot
+from uart_bridge.infra.codec import BinaryCodec
+from uart_bridge.infra.replay_robot_driver import ReplayRobotDriver
+from uart_bridge.infra.serial_log import SerialRecorder
+
+
+def record_states(path: Path, count: int, interval: float) -> None:
+    with SerialRecorder(path, codec="binary") as recorder:
+        for seq in range(count):
+            frame = BinaryCodec.pack_state(RobotStateSnapshot(reserved=seq), seq)
+            # フレームの途中で区切られた受信も再現する
+            recorder.record_rx(seq * interval, frame[:3])
+            recorder.record_rx(seq * interval, frame[3:])
+        recorder.record_tx(count * interval, b"command")
+
+
+def test_replay_at_max_speed(tmp_path: Path) -> None:
+    path = tmp_path / "serial.ublog"
+    record_states(path, count=100, interval=1.0)
+    updates = 0
+
+    def on_update() -> None:
+        nonlocal updates
+        updates += 1
+
+    with ReplayRobotDriver(path, speed=0) as driver:
+        driver.set_update_callback(on_update)
+        assert driver.wait_finished(timeout=1.0)
+        driver.set_send_values(RobotCommand(target_x=1))
+        driver.set_send_values(RobotCommand(target_x=1))
+
+    assert driver.state_version == 100
+    assert driver.get_state_snapshot().reserved == 99
+    assert driver.corrupt_frames == 0
+    assert driver.recorded_commands == [b"command"]
+    assert driver.sent_commands == [RobotCommand(target_x=1)]
+
+
+def test_replay_keeps_recorded_timing(tmp_path: Path) -> None:
+    path = tmp_path / "serial.ublog"
+    record_states(path, count=11, interval=0.02)
+
+    started_at = time.monotonic()
+    with ReplayRobotDriver(path, speed=2.0) as driver:
+        assert driver.wait_finished(timeout=1.0)
+    elapsed = time.monotonic() - started_at
+
+    assert driver.state_version == 11
+    assert 0.09 <= elapsed < 0.3
+
+
+def test_close_stops_replay(tmp_path: Path) -> None:
+    path = tmp_path / "serial.ublog"
+    record_states(path, count=3, interval=10.0)
+
+    with ReplayRobotDriver(path) as driver:
+        assert not driver.wait_finished(timeout=0.05)
+
+    assert driver.state_version == 1
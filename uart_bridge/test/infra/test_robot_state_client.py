@@ -0,0 +1,96 @@
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+import zenoh
+
+from uart_bridge.domain.config import ZenohSessionConfig
+from uart_bridge.domain.messages import RobotStateSnapshot
+from uart_bridge.infra.robot_state_client import RobotStateClient, RobotStateUpdate
+from uart_bridge.infra.state_payload import pack_state
+from uart_bridge.infra.zenoh_session import create_zenoh_config
+from uart_bridge.infra.zenoh_transmitter import ZenohTransmitter
+
+
+@pytest.fixture
+def session() -> Iterator[zenoh.Session]:
+    session = zenoh.open(
+        create_zenoh_config(ZenohSessionConfig(multicast_scouting=False))
+    )
+    yield session
+    session.close()  # type: ignore
+
+
+def test_bootstraps_with_a_query(session: zenoh.Session) -> None:
+    transmitter = ZenohTransmitter(prefix="boot", per_field=False, session=session)
+    transmitter.publish(RobotStateSnapshot(reserved=7))
+    transmitter.publish_connection(True)
+
+    with RobotStateClient(prefix="boot", session=session) as client:
+        assert client.latest is not None
+        assert client.latest.state.reserved == 7
+        assert client.latest.seq == 1
+        assert client.version == 1
+        assert client.connected
+
+    transmitter.close()
+
+
+def test_waits_for_updates(session: zenoh.Session) -> None:
+    transmitter = ZenohTransmitter(prefix="wait", per_field=False, session=session)
+    received: list[RobotStateUpdate] = []
+
+    with RobotStateClient(prefix="wait", session=session) as client:
+        client.add_callback(received.append)
+        version = client.version
+        assert client.wait_for_update(timeout=0.05) is None
+
+        transmitter.publish(RobotStateSnapshot(reserved=1))
+        update = client.wait_for_update(version, timeout=1.0)
+        assert update is not None
+        assert update.state.reserved == 1
+        assert update.version == version + 1
+
+        transmitter.publish(RobotStateSnapshot(reserved=2))
+        update = client.wait_for_update(update.version, timeout=1.0)
+        assert update is not None
+        assert update.state.reserved == 2
+
+    assert [u.state.reserved for u in received] == [1, 2]
+    transmitter.close()
+
+
+def test_drops_duplicate_and_stale_states(session: zenoh.Session) -> None:
+    with RobotStateClient(prefix="dup", session=session, bootstrap_timeout=0.1) as c:
+        session.put("dup/robot/state", pack_state(RobotStateSnapshot(), 5, 100.0))
+        assert c.wait_for_update(0, timeout=1.0) is not None
+        # 同じ seq の再送と、より古い返信は読み捨てる
+        session.put("dup/robot/state", pack_state(RobotStateSnapshot(), 5, 101.0))
+        session.put("dup/robot/state", pack_state(RobotStateSnapshot(), 4, 99.0))
+        # uart_bridge を再起動すると seq は戻るが時刻は進む
+        session.put("dup/robot/state", pack_state(RobotStateSnapshot(), 1, 102.0))
+        update = c.wait_for_update(1, timeout=1.0)
+        assert update is not None
+        assert (update.seq, update.version) == (1, 2)
+
+
+def test_iterates_updates_asynchronously(session: zenoh.Session) -> None:
+    transmitter = ZenohTransmitter(prefix="aio", per_field=False, session=session)
+
+    async def collect(client: RobotStateClient) -> list[int]:
+        values: list[int] = []
+        async for update in client.updates():
+            values.append(update.state.reserved)
+            if update.state.reserved == 2:
+                break
+            await asyncio.to_thread(
+                transmitter.publish, RobotStateSnapshot(reserved=len(values))
+            )
+        return values
+
+    with RobotStateClient(prefix="aio", session=session) as client:
+        values = asyncio.run(asyncio.wait_for(collect(client), timeout=5.0))
+
+    # 最初に問い合わせで取得した状態（reserved=0）を返す
+    assert values == [0, 1, 2]
+    transmitter.close()
@@ -0,0 +1,120 @@
+import os
+import time
+
+import pytest
+from conftest import wait_for_bytes, wait_until
+
+from uart_bridge.domain.messages import RobotCommand
+from uart_bridge.infra.codec import BinaryCodec
+from uart_bridge.infra.serial_io_loop import IoChannel, SerialIoLoop
+from uart_bridge.infra.serial_robot_driver import SerialRobotDriver
+
+
+def read_commands(fd: int, codec: BinaryCodec, buffer: bytearray) -> list[RobotCommand]:
+    """届いたバイナリ形式のコマンドを `buffer` に溜め、揃ったものをデコードする"""
+    os.set_blocking(fd, False)
+    try:
+        buffer += os.read(fd, 4096)
+    except BlockingIOError:
+        pass
+    *frames, rest = bytes(buffer).split(b"\0")
+    buffer[:] = rest
+    commands = (codec.decode_command(frame) for frame in frames if frame)
+    return [command for command in commands if command is not None]
+
+
+def test_drivers_share_one_loop(pty_pairs: list[tuple[int, str]]) -> None:
+    (master_a, port_a), (master_b, port_b) = pty_pairs
+    codec = BinaryCodec()
+
+    with (
+        SerialIoLoop() as loop,
+        SerialRobotDriver(port_a, io_loop=loop) as driver_a,
+        SerialRobotDriver(port_b, codec=BinaryCodec(), io_loop=loop) as driver_b,
+    ):
+        os.write(master_a, b"2,100,2000,1,2,0,1,5\n")
+        state = driver_b.get_state_snapshot()._replace(reserved=7)
+        os.write(master_b, codec.pack_state(state, 0))
+
+        assert wait_until(lambda: driver_a.get_robot_state().reserved == 5)
+        assert wait_until(lambda: driver_b.get_robot_state().reserved == 7)
+
+        driver_a.set_send_values(RobotCommand(target_x=1, target_y=2))
+        driver_b.set_send_values(RobotCommand(target_x=3, target_y=4))
+
+        assert wait_for_bytes(master_a, b"1,2,0,0,0,0\n")
+        expected = RobotCommand(target_x=3, target_y=4)
+        buffer = bytearray()
+        assert wait_until(lambda: expected in read_commands(master_b, codec, buffer))
+
+
+def test_close_one_driver_keeps_the_other(pty_pairs: list[tuple[int, str]]) -> None:
+    (master_a, port_a), (master_b, port_b) = pty_pairs
+
+    with SerialIoLoop() as loop, SerialRobotDriver(port_b, io_loop=loop) as driver_b:
+        with SerialRobotDriver(port_a, io_loop=loop):
+            pass
+
+        os.write(master_b, b"2,100,2000,1,2,0,1,9\n")
+
+        assert wait_until(lambda: driver_b.get_robot_state().reserved == 9)
+
+
+class _Channel(IoChannel):
+    def __init__(self, fail: bool) -> None:
+        self.fail = fail
+        self.serviced = 0
+
+    def next_deadline(self) -> float:
+        return time.monotonic() + 0.001
+
+    def service(self, now: float) -> None:
+        self.serviced += 1
+        if self.fail:
+            raise RuntimeError("broken channel")
+
+
+def test_error_in_one_channel_keeps_the_loop_running(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    broken, healthy = _Channel(fail=True), _Channel(fail=False)
+    r, w = os.pipe()
+    received: list[float] = []
+
+    def on_readable(received_at: float) -> None:
+        os.read(r, 4096)
+        received.append(received_at)
+        raise RuntimeError("broken callback")
+
+    with SerialIoLoop() as loop:
+        loop.call(lambda: loop.add(broken))
+        loop.call(lambda: loop.add(healthy))
+        loop.call(lambda: loop.register(r, on_readable))
+        os.write(w, b"x")
+        assert wait_until(lambda: len(received) == 1)
+        os.write(w, b"x")
+        assert wait_until(lambda: len(received) == 2)
+        assert wait_until(lambda: healthy.serviced > 10 and broken.serviced > 10)
+        loop.call(lambda: loop.unregister(r))
+        loop.call(lambda: loop.remove(broken))
+        loop.call(lambda: loop.remove(healthy))
+    os.close(r)
+    os.close(w)
+
+    assert "broken channel" in caplog.text
+    assert "broken callback" in caplog.text
+
+
+def test_error_in_call_is_raised_to_caller(caplog: pytest.LogCaptureFixture) -> None:
+    def broken() -> None:
+        raise RuntimeError("broken call")
+
+    with SerialIoLoop() as loop:
+        with pytest.raises(RuntimeError, match="broken call"):
+            loop.call(broken)
+        # ループのスレッドは止まらない
+        called: list[None] = []
+        loop.call(lambda: called.append(None))
+        assert called
+
+    assert "broken call" in caplog.text
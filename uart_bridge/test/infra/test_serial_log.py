@@ -0,0 +1,89 @@
+import os
+import tty
+from pathlib import Path
+
+import pytest
+from conftest import wait_until
+
+from uart_bridge.domain.messages import RobotCommand
+from uart_bridge.infra.serial_log import (
+    RX,
+    TX,
+    SerialLogRecord,
+    SerialRecorder,
+    read_serial_log,
+)
+from uart_bridge.infra.serial_robot_driver import SerialRobotDriver
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "serial.ublog"
+    with SerialRecorder(path, codec="binary") as recorder:
+        recorder.record_rx(1.0, b"abc")
+        recorder.record_tx(1.5, b"")
+        recorder.record_rx(2.0, b"\x00" * 300)
+
+    codec, records = read_serial_log(path)
+    assert codec == "binary"
+    assert list(records) == [
+        SerialLogRecord(RX, 1.0, b"abc"),
+        SerialLogRecord(TX, 1.5, b""),
+        SerialLogRecord(RX, 2.0, b"\x00" * 300),
+    ]
+    assert recorder.recorded == 3
+    assert recorder.dropped == 0
+
+
+def test_truncated_record_is_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "serial.ublog"
+    with SerialRecorder(path) as recorder:
+        recorder.record_rx(1.0, b"first")
+        recorder.record_rx(2.0, b"second")
+    path.write_bytes(path.read_bytes()[:-3])
+
+    codec, records = read_serial_log(path)
+    assert codec == "csv"
+    assert [r.data for r in records] == [b"first"]
+
+
+def test_overflow_is_counted(tmp_path: Path) -> None:
+    # 閉じるまで書き込まないようにして、キューを溢れさせる
+    path = tmp_path / "serial.ublog"
+    with SerialRecorder(path, flush_interval=60, capacity=2) as recorder:
+        for i in range(5):
+            recorder.record_rx(float(i), b"x")
+
+    assert recorder.dropped == 3
+    assert recorder.recorded == 2
+    _, records = read_serial_log(path)
+    assert [r.timestamp for r in records] == [0.0, 1.0]
+
+
+def test_rejects_other_file(tmp_path: Path) -> None:
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a serial log")
+
+    with pytest.raises(ValueError):
+        read_serial_log(path)
+
+
+def test_driver_records_rx_and_tx(tmp_path: Path) -> None:
+    master, slave = os.openpty()
+    tty.setraw(master)
+    path = tmp_path / "serial.ublog"
+    try:
+        with (
+            SerialRecorder(path, flush_interval=0.01) as recorder,
+            SerialRobotDriver(os.ttyname(slave), recorder=recorder) as driver,
+        ):
+            os.write(master, b"2,100,2000,1,2,0,1,5\n")
+            assert wait_until(lambda: driver.get_robot_state().reserved == 5)
+            driver.set_send_values(RobotCommand(target_x=1))
+            assert wait_until(lambda: recorder.recorded >= 2)
+    finally:
+        os.close(slave)
+        os.close(master)
+
+    _, records = read_serial_log(path)
+    rx = b"".join(r.data for r in records if r.direction == RX)
+    assert rx == b"2,100,2000,1,2,0,1,5\n"
@@ -0,0 +1,128 @@
+import logging
+import os
+import time
+from pathlib import Path
+
+import pytest
+from conftest import wait_for_bytes, wait_until
+
+from uart_bridge.domain.messages import RobotCommand, RobotStateId
+from uart_bridge.infra.app_logging import FrameHistory, TextFormatter
+from uart_bridge.infra.serial_robot_driver import SerialRobotDriver
+from uart_bridge.infra.stats import BridgeStats
+from uart_bridge.infra.tx_scheduler import TxScheduler
+
+
+def test_receive_split_frame(pty_pair: tuple[int, str]) -> None:
+    master, port = pty_pair
+
+    with SerialRobotDriver(port) as driver:
+        os.write(master, b"2,100,2")
+        time.sleep(0.05)
+        os.write(master, b"000,1,2,0,1,5\n")
+
+        assert wait_until(lambda: driver.get_robot_state().reserved == 5)
+        state = driver.get_robot_state()
+        assert state.state_id == RobotStateId.NORMAL
+        assert state.pitch_deg == 10.0
+        assert state.muzzle_velocity == 2.0
+        assert state.ready_to_fire
+
+
+def test_send_command_without_receive(pty_pair: tuple[int, str]) -> None:
+    master, port = pty_pair
+
+    with SerialRobotDriver(port) as driver:
+        assert wait_for_bytes(master, b"640,360,0,0,0,0\n")
+
+        driver.set_send_values(RobotCommand(target_x=1, target_y=2))
+
+        assert wait_for_bytes(master, b"\n1,2,0,0,0,0\n")
+
+
+def test_records_stats(pty_pair: tuple[int, str]) -> None:
+    master, port = pty_pair
+    stats = BridgeStats()
+
+    with SerialRobotDriver(port, stats=stats) as driver:
+        os.write(master, b"2,100,2000,1,2,0,1,5\n")
+        assert wait_until(lambda: driver.get_robot_state().reserved == 5)
+
+        stats.mark_command_received(time.monotonic())
+        driver.set_send_values(RobotCommand(target_x=1, target_y=2))
+        assert wait_for_bytes(master, b"\n1,2,0,0,0,0\n")
+        assert wait_until(lambda: stats.histograms["cmd_tx"].count == 1)
+        # ハートビートの送信の遅れを記録する
+        assert wait_until(lambda: stats.histograms["tx_jitter"].count >= 1)
+
+    assert stats.histograms["rx_parse"].count == 1
+    assert stats.histograms["rx_swap"].count == 1
+    assert stats.state_received_at is not None
+    assert stats.histograms["tx_write"].count >= 2
+    assert stats.histograms["tx_jitter"].count >= 1
+    assert stats.histograms["tx_period"].count >= 1
+    counters = stats.summary()["counters"]
+    assert counters["rx_dropped_frames"] == 0
+    assert counters["rx_corrupt_frames"] == 0
+    assert counters["serial_reconnects"] == 0
+    assert {"tx_overruns", "tx_skipped"} <= counters.keys()
+
+
+def test_jitter_ignores_changed_commands(pty_pair: tuple[int, str]) -> None:
+    master, port = pty_pair
+    stats = BridgeStats()
+    # ハートビートが届かない間隔にし、コマンドの変化による送信だけにする
+    scheduler = TxScheduler(mode="on_change", rate_hz=0.1, min_interval=0.005)
+
+    with SerialRobotDriver(port, tx_scheduler=scheduler, stats=stats) as driver:
+        assert wait_for_bytes(master, b"640,360,0,0,0,0\n")
+        for x in range(1, 4):
+            driver.set_send_values(RobotCommand(target_x=x))
+            assert wait_for_bytes(master, f"{x},360,0,0,0,0\n".encode())
+
+    assert stats.histograms["tx_write"].count == 4
+    assert stats.histograms["tx_period"].count == 3
+    assert stats.histograms["tx_jitter"].count == 0
+
+
+def test_dumps_recent_frames_on_corrupt_frame(
+    pty_pair: tuple[int, str], caplog: pytest.LogCaptureFixture
+) -> None:
+    master, port = pty_pair
+    caplog.set_level(logging.ERROR)
+    caplog.handler.setFormatter(TextFormatter())
+
+    with SerialRobotDriver(port, frame_history=FrameHistory(8)) as driver:
+        os.write(master, b"2,100,2000,1,2,0,1,5\n")
+        assert wait_until(lambda: driver.get_robot_state().reserved == 5)
+        os.write(master, b"2,abc,2000,1,2,0,1,6\n")
+        assert wait_until(lambda: driver.corrupt_frames == 1)
+
+    assert "corrupt frame" in caplog.text
+    assert "rx b'2,100,2000,1,2,0,1,5\\n'" in caplog.text
+    assert "rx b'2,abc,2000,1,2,0,1,6\\n'" in caplog.text
+    assert "tx b'640,360,0,0,0,0\\n'" in caplog.text
+
+
+def test_reconnect_when_device_appears(
+    pty_pair: tuple[int, str], tmp_path: Path
+) -> None:
+    master, port = pty_pair
+    link = tmp_path / "ttyUSB0"
+    updates = 0
+
+    def on_update() -> None:
+        nonlocal updates
+        updates += 1
+
+    # 再接続の間隔が長くても、デバイスが現れたらすぐに接続する
+    with SerialRobotDriver(str(link), timeout=5.0, reconnect_max=5.0) as driver:
+        driver.set_update_callback(on_update)
+        assert not driver.is_connected()
+
+        link.symlink_to(port)
+        assert wait_until(driver.is_connected)
+        assert updates == 1
+
+        os.write(master, b"2,100,2000,1,2,0,1,5\n")
+        assert wait_until(lambda: driver.get_robot_state().reserved == 5)
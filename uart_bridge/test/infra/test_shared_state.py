@@ -0,0 +1,73 @@
+import threading
+from multiprocessing.shared_memory import SharedMemory
+from struct import Struct
+from typing import Iterator
+
+import pytest
+
+from uart_bridge.infra.shared_state import SeqlockSlot
+
+LAYOUT = Struct("<4q")
+
+
+@pytest.fixture
+def shm() -> Iterator[SharedMemory]:
+    shm = SharedMemory(create=True, size=SeqlockSlot.size(LAYOUT) * 2)
+    yield shm
+    shm.close()
+    shm.unlink()
+
+
+def test_write_and_read(shm: SharedMemory) -> None:
+    assert shm.buf is not None
+    writer = SeqlockSlot(shm.buf, 0, LAYOUT)
+    reader = SeqlockSlot(shm.buf, 0, LAYOUT)
+    other = SeqlockSlot(shm.buf, SeqlockSlot.size(LAYOUT), LAYOUT)
+
+    assert reader.read() == (0, 0, 0, 0)
+    assert reader.version == 0
+
+    writer.write((1, 2, 3, 4))
+    writer.write((5, 6, 7, 8))
+
+    assert reader.read() == (5, 6, 7, 8)
+    assert reader.version == 2
+    assert other.read() == (0, 0, 0, 0)
+
+
+def test_read_never_sees_a_torn_value(shm: SharedMemory) -> None:
+    assert shm.buf is not None
+    writer = SeqlockSlot(shm.buf, 0, LAYOUT)
+    reader = SeqlockSlot(shm.buf, 0, LAYOUT)
+    stop = threading.Event()
+
+    def write() -> None:
+        i = 0
+        while not stop.is_set():
+            i += 1
+            writer.write((i, i, i, i))
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    try:
+        for _ in range(20000):
+            values = reader.read()
+            assert len(set(values)) == 1
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_read_gives_up_on_an_abandoned_write(shm: SharedMemory) -> None:
+    assert shm.buf is not None
+    writer = SeqlockSlot(shm.buf, 0, LAYOUT)
+    reader = SeqlockSlot(shm.buf, 0, LAYOUT)
+    writer.write((1, 2, 3, 4))
+    assert reader.read() == (1, 2, 3, 4)
+
+    # 書き込み側が番号を奇数にしたまま終了した
+    shm.buf[0] |= 1
+    reader.MAX_READ_RETRIES = 100
+
+    assert reader.read() == (1, 2, 3, 4)
+    assert reader.stale
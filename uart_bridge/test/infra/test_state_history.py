@@ -0,0 +1,54 @@
+import pytest
+
+from uart_bridge.domain.messages import RobotStateSnapshot
+from uart_bridge.infra.state_history import StateHistory, pack_history, unpack_history
+
+
+def fill(history: StateHistory, n: int) -> None:
+    for i in range(n):
+        history.append(100.0 + i, RobotStateSnapshot(pitch_deg=i * 0.5, reserved=i))
+
+
+def test_keeps_last_states_in_order() -> None:
+    history = StateHistory(4)
+    fill(history, 6)
+
+    columns = history.select()
+
+    assert len(history) == 4
+    assert list(columns["timestamp"]) == [102.0, 103.0, 104.0, 105.0]
+    assert list(columns["reserved"]) == [2, 3, 4, 5]
+    assert list(columns["pitch_deg"]) == [1.0, 1.5, 2.0, 2.5]
+
+
+def test_select_by_time_range_and_last() -> None:
+    history = StateHistory(5)
+    fill(history, 8)  # 103〜107 を保持
+
+    assert list(history.select(start=104.0, end=106.0)["reserved"]) == [4, 5, 6]
+    assert list(history.select(last=2)["reserved"]) == [6, 7]
+    assert list(history.select(last=2, end=105.5)["reserved"]) == [4, 5]
+    assert list(history.select(start=200.0)["reserved"]) == []
+    assert list(history.select(last=0)["reserved"]) == []
+
+
+def test_select_fields() -> None:
+    history = StateHistory(3)
+    fill(history, 2)
+
+    columns = history.select(fields=["reserved"])
+
+    assert list(columns) == ["timestamp", "reserved"]
+    with pytest.raises(ValueError):
+        history.select(fields=["unknown"])
+
+
+def test_pack_roundtrip() -> None:
+    history = StateHistory(8)
+    fill(history, 3)
+
+    columns = unpack_history(pack_history(history.select()))
+
+    assert columns == history.select()
+    assert columns["ready_to_fire"].typecode == "B"
+    assert columns["timestamp"].itemsize == 8
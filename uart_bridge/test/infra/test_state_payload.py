@@ -0,0 +1,20 @@
+import msgpack  # type: ignore[import-untyped]
+
+from uart_bridge.domain.messages import RobotStateSnapshot
+from uart_bridge.infra.state_payload import pack_state, unpack_state
+
+
+def test_pack_state_round_trip() -> None:
+    snapshot = RobotStateSnapshot(state_id=2, pitch_deg=1.5, ready_to_fire=True)
+
+    data = pack_state(snapshot, 10, 1234.5)
+
+    assert unpack_state(data) == (snapshot, 10, 1234.5)
+
+
+def test_pack_state_is_map() -> None:
+    payload = msgpack.unpackb(pack_state(RobotStateSnapshot(reserved=1), 1, 0.0))
+
+    assert payload["reserved"] == 1
+    assert payload["seq"] == 1
+    assert set(payload) == {*RobotStateSnapshot._fields, "seq", "timestamp"}
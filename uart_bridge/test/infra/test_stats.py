@@ -0,0 +1,71 @@
+import pytest
+
+from uart_bridge.infra.stats import BridgeStats, LatencyHistogram
+
+
+def test_histogram_percentiles() -> None:
+    histogram = LatencyHistogram()
+    assert histogram.percentile(0.5) == 0.0
+
+    for _ in range(99):
+        histogram.record(100e-6)
+    histogram.record(10e-3)
+
+    # バケットの上限値で返すため、誤差は約19%以内
+    assert histogram.percentile(0.50) == pytest.approx(100e-6, rel=0.19)
+    assert histogram.percentile(0.99) == pytest.approx(100e-6, rel=0.19)
+    assert histogram.percentile(1.0) == 10e-3
+    assert histogram.summary()["count"] == 100
+    assert histogram.summary()["max_us"] == pytest.approx(10e3)
+
+
+def test_histogram_out_of_range() -> None:
+    histogram = LatencyHistogram()
+    histogram.record(0.0)
+    histogram.record(100.0)
+
+    # 1µs 未満は最初のバケット、約16秒を超えると最後のバケットに入る
+    assert histogram.percentile(0.5) == 1e-6
+    assert histogram.percentile(1.0) == 100.0
+
+
+def test_stats_end_to_end() -> None:
+    stats = BridgeStats()
+
+    # 受信前の配信・コマンドの無い送信は記録しない
+    stats.record_publish(1.0)
+    stats.record_command_sent(1.0)
+    assert stats.histograms["rx_publish"].count == 0
+    assert stats.histograms["cmd_tx"].count == 0
+
+    stats.mark_state_received(1.0)
+    stats.record_publish(1.001)
+    assert stats.histograms["rx_publish"].max == pytest.approx(0.001)
+
+    stats.mark_command_received(2.0)
+    stats.record_command_sent(2.002)
+    stats.record_command_sent(2.010)  # 同じコマンドの再送は記録しない
+    assert stats.histograms["cmd_tx"].count == 1
+    assert stats.histograms["cmd_tx"].max == pytest.approx(0.002)
+
+
+def test_stats_counters() -> None:
+    stats = BridgeStats()
+    values = {"dropped": 0}
+    stats.add_counter("dropped", lambda: values["dropped"])
+
+    values["dropped"] = 3
+
+    summary = stats.summary()
+    assert summary["counters"] == {"dropped": 3}
+    assert set(summary["latency"]) == set(stats.histograms)
+
+
+def test_stats_histogram_source() -> None:
+    stats = BridgeStats()
+    histogram = LatencyHistogram()
+    histogram.record(100e-6)
+    stats.add_histogram("tx_jitter", lambda: histogram)
+
+    assert stats.summary()["latency"]["tx_jitter"]["count"] == 1
+    assert stats.histograms["tx_jitter"].count == 0
@@ -0,0 +1,73 @@
+from uart_bridge.domain.config import TargetPredictionConfig
+from uart_bridge.domain.messages import RobotCommand
+from uart_bridge.infra.target_predictor import AlphaBetaFilter, TargetPredictor
+
+
+def target(x: int, y: int = 360, distance: int = 100) -> RobotCommand:
+    return RobotCommand(target_x=x, target_y=y, target_distance=distance)
+
+
+def test_alpha_beta_tracks_constant_velocity() -> None:
+    axis = AlphaBetaFilter(alpha=0.85, beta=0.3)
+    axis.reset(0.0, 0.0)
+    for i in range(1, 60):
+        axis.update(300.0 * i / 30, i / 30)
+
+    assert abs(axis.velocity - 300.0) < 1.0
+    assert abs(axis.predict(60 / 30) - 600.0) < 1.0
+
+
+def test_extrapolates_between_observations() -> None:
+    predictor = TargetPredictor(TargetPredictionConfig(enabled=True))
+    # 300px/s で右に動く照準を 30fps で観測する
+    for i in range(30):
+        command = target(400 + 10 * i)
+        predictor.observe(command, i / 30)
+
+    predicted = predictor.predict(command, 29 / 30 + 0.02)
+
+    assert abs(predicted.target_x - (690 + 6)) <= 1
+    assert predicted.target_y == 360
+    assert predicted.force_linear == command.force_linear
+
+
+def test_lead_and_horizon() -> None:
+    config = TargetPredictionConfig(enabled=True, lead_ms=20, max_horizon_ms=50)
+    predictor = TargetPredictor(config)
+    for i in range(30):
+        command = target(400 + 10 * i)
+        predictor.observe(command, i / 30)
+    last = 29 / 30
+
+    assert abs(predictor.predict(command, last).target_x - 696) <= 1
+    # 最後の観測から上限を超えたら外挿しない
+    assert predictor.predict(command, last + 0.04) == command
+
+
+def test_resets_on_jump_and_lost_target() -> None:
+    predictor = TargetPredictor(TargetPredictionConfig(enabled=True))
+    for i in range(10):
+        predictor.observe(target(400 + 10 * i), i / 30)
+
+    jumped = target(900)
+    predictor.observe(jumped, 10 / 30)
+    assert predictor.predict(jumped, 10 / 30 + 0.02) == jumped
+
+    lost = RobotCommand()
+    predictor.observe(lost, 11 / 30)
+    assert predictor.predict(lost, 11 / 30 + 0.02) == lost
+
+
+def test_repeated_target_stops_extrapolation() -> None:
+    predictor = TargetPredictor(TargetPredictionConfig(enabled=True))
+    for i in range(30):
+        command = target(400 + 10 * i)
+        predictor.observe(command, i / 30)
+
+    # 止まった照準を届くたびに観測すると、外挿が止まった位置に収まる
+    for i in range(30, 45):
+        assert predictor.observe(command, i / 30)
+    assert abs(predictor.predict(command, 44 / 30 + 0.02).target_x - 690) <= 1
+
+    # 同じ認識結果（同じ時刻）は取り込まない
+    assert not predictor.observe(command, 44 / 30)
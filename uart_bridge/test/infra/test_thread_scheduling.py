@@ -0,0 +1,46 @@
+import os
+import threading
+
+import pytest
+
+from uart_bridge.domain.config import ThreadSchedulingConfig
+from uart_bridge.infra.thread_scheduling import apply_thread_scheduling
+
+
+def test_applies_only_to_calling_thread() -> None:
+    main_nice = os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+    cpus = sorted(os.sched_getaffinity(0))
+    result: dict[str, object] = {}
+
+    def run() -> None:
+        apply_thread_scheduling(
+            ThreadSchedulingConfig(cpu_affinity=cpus[:1], nice=main_nice + 1)
+        )
+        tid = threading.get_native_id()
+        result["nice"] = os.getpriority(os.PRIO_PROCESS, tid)
+        result["affinity"] = os.sched_getaffinity(tid)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+
+    assert result["nice"] == main_nice + 1
+    assert result["affinity"] == set(cpus[:1])
+    assert os.getpriority(os.PRIO_PROCESS, threading.get_native_id()) == main_nice
+    assert os.sched_getaffinity(0) == set(cpus)
+
+
+def test_reports_failure_and_continues(caplog: pytest.LogCaptureFixture) -> None:
+    result: dict[str, int] = {}
+
+    def run() -> None:
+        # 存在しない CPU は指定できないが、nice の設定は続ける
+        apply_thread_scheduling(ThreadSchedulingConfig(cpu_affinity=[4096], nice=19))
+        result["nice"] = os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+
+    assert "failed to set CPU affinity" in caplog.text
+    assert result["nice"] == 19
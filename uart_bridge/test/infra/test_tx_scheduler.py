@@ -0,0 +1,108 @@
+import pytest
+
+from uart_bridge.infra.tx_scheduler import TxScheduler
+
+
+def test_periodic() -> None:
+    scheduler = TxScheduler(mode="periodic", rate_hz=100)
+
+    assert scheduler.is_due(0.0)
+    scheduler.mark_sent(0.0)
+
+    scheduler.notify_changed()
+    assert not scheduler.is_due(0.005)
+    assert scheduler.next_deadline() == pytest.approx(0.01)
+    assert scheduler.is_due(0.01)
+
+
+def test_periodic_keeps_absolute_deadlines() -> None:
+    scheduler = TxScheduler(mode="periodic", rate_hz=100)
+    scheduler.mark_sent(0.0)
+
+    # 遅れて送信しても、次の締め切りは後ろにずれない
+    scheduler.mark_sent(0.013)
+    assert scheduler.next_deadline() == pytest.approx(0.02)
+    scheduler.mark_sent(0.02)
+    assert scheduler.next_deadline() == pytest.approx(0.03)
+    assert scheduler.overruns == 0
+
+
+def test_periodic_overrun_skip() -> None:
+    scheduler = TxScheduler(mode="periodic", rate_hz=100, overrun="skip")
+    scheduler.mark_sent(0.0)
+
+    # 0.01 の締め切りに 0.035 で送信した: 0.02, 0.03 を読み飛ばす
+    scheduler.mark_sent(0.035)
+    assert scheduler.next_deadline() == pytest.approx(0.04)
+    assert scheduler.overruns == 1
+    assert scheduler.skipped == 2
+
+
+def test_periodic_overrun_catch_up() -> None:
+    scheduler = TxScheduler(mode="periodic", rate_hz=100, overrun="catch_up")
+    scheduler.mark_sent(0.0)
+
+    scheduler.mark_sent(0.035)
+    assert scheduler.next_deadline() == pytest.approx(0.02)
+    assert scheduler.is_due(0.035)
+    assert scheduler.overruns == 1
+    assert scheduler.skipped == 0
+
+    # 過ぎた締め切りの分を続けて送信しても、同じオーバーランとして数える
+    scheduler.mark_sent(0.036)
+    assert scheduler.next_deadline() == pytest.approx(0.03)
+    scheduler.mark_sent(0.037)
+    assert scheduler.next_deadline() == pytest.approx(0.04)
+    assert not scheduler.is_due(0.037)
+    assert scheduler.overruns == 1
+
+    # 追いついた後の遅れは新しいオーバーラン。MAX_CATCH_UP 周期を超えた分は読み飛ばす
+    scheduler.mark_sent(1.0)
+    assert scheduler.next_deadline() == pytest.approx(0.96)
+    assert scheduler.overruns == 2
+    assert scheduler.skipped > 0
+
+
+def test_reset_restarts_period() -> None:
+    scheduler = TxScheduler(mode="periodic", rate_hz=100)
+    scheduler.mark_sent(0.0)
+    scheduler.reset()
+
+    assert scheduler.is_due(0.001)
+    scheduler.mark_sent(5.0)
+    assert scheduler.next_deadline() == pytest.approx(5.01)
+    assert scheduler.overruns == 0
+
+
+def test_on_change() -> None:
+    scheduler = TxScheduler(mode="on_change", rate_hz=10, min_interval=0.005)
+
+    scheduler.mark_sent(0.0)
+    assert not scheduler.is_due(0.001)
+
+    scheduler.notify_changed()
+    assert not scheduler.is_due(0.001)
+    assert scheduler.is_due(0.005)
+
+    scheduler.mark_sent(0.005)
+    assert scheduler.next_deadline() == pytest.approx(0.105)
+
+
+def test_scheduled_deadline() -> None:
+    periodic = TxScheduler(mode="periodic", rate_hz=100)
+    periodic.mark_sent(0.0)
+    periodic.notify_changed()
+    assert periodic.scheduled_deadline() == pytest.approx(0.01)
+
+    on_change = TxScheduler(mode="on_change", rate_hz=10, min_interval=0.005)
+    on_change.mark_sent(0.0)
+    # ハートビートの送信時刻
+    assert on_change.scheduled_deadline() == pytest.approx(0.1)
+    # コマンドの変化による送信には決まった時刻が無い
+    on_change.notify_changed()
+    assert on_change.scheduled_deadline() == float("-inf")
+
+
+def test_invalid_rate() -> None:
+    with pytest.raises(ValueError):
+        TxScheduler(rate_hz=0)
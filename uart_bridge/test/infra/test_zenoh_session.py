@@ -0,0 +1,57 @@
+import zenoh
+
+from uart_bridge.domain.config import (
+    PublisherQosConfig,
+    ZenohSessionConfig,
+    default_publish_qos,
+)
+from uart_bridge.infra.zenoh_session import (
+    create_zenoh_config,
+    find_publisher_qos,
+    publisher_options,
+)
+
+
+def test_scouting_disabled_when_endpoints_known() -> None:
+    config = create_zenoh_config(
+        ZenohSessionConfig(mode="client", connect=["tcp/127.0.0.1:7447"])
+    )
+
+    assert config.get_json("mode") == '"client"'
+    assert config.get_json("connect/endpoints") == '["tcp/127.0.0.1:7447"]'
+    assert config.get_json("scouting/multicast/enabled") == "false"
+
+
+def test_scouting_explicit() -> None:
+    config = create_zenoh_config(ZenohSessionConfig(multicast_scouting=False))
+    assert config.get_json("scouting/multicast/enabled") == "false"
+
+    config = create_zenoh_config(
+        ZenohSessionConfig(connect=["tcp/127.0.0.1:7447"], multicast_scouting=True)
+    )
+    assert config.get_json("scouting/multicast/enabled") == "true"
+
+
+def test_find_publisher_qos() -> None:
+    qos = {
+        "robot/state/*": PublisherQosConfig(priority="data_low"),
+        "robot/state/state_id": PublisherQosConfig(priority="real_time"),
+    }
+
+    # 完全一致の設定がワイルドカードより優先される
+    assert find_publisher_qos(qos, "robot/state/state_id").priority == "real_time"
+    assert find_publisher_qos(qos, "robot/state/pitch_deg").priority == "data_low"
+    assert find_publisher_qos(qos, "robot/state") == PublisherQosConfig()
+
+
+def test_default_control_keys_are_express() -> None:
+    qos = default_publish_qos()
+
+    options = publisher_options(find_publisher_qos(qos, "robot/state/ready_to_fire"))
+    assert options["priority"] == zenoh.Priority.INTERACTIVE_HIGH
+    assert options["express"] is True
+
+    options = publisher_options(find_publisher_qos(qos, "robot/state/pitch_deg"))
+    assert options["priority"] == zenoh.Priority.DATA
+    assert options["congestion_control"] == zenoh.CongestionControl.DROP
+    assert options["express"] is False
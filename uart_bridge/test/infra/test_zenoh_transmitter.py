@@ -0,0 +1,170 @@
+import math
+from time import monotonic, sleep
+
+import zenoh
+
+from uart_bridge.domain.config import ZenohSessionConfig
+from uart_bridge.domain.messages import RobotCommand, RobotStateSnapshot
+from uart_bridge.infra.command_payload import FORCE_VECTOR, STRUCT_ENCODING
+from uart_bridge.infra.state_history import StateHistory, unpack_history
+from uart_bridge.infra.state_payload import unpack_state
+from uart_bridge.infra.zenoh_session import create_zenoh_config
+from uart_bridge.infra.zenoh_transmitter import ZenohTransmitter
+
+
+def get_texts(session: zenoh.Session, key: str) -> list[str]:
+    return [
+        reply.ok.payload.to_string()
+        for reply in session.get(key, timeout=1.0)
+        if reply.ok is not None
+    ]
+
+
+def test_transmitters_share_a_session() -> None:
+    session = zenoh.open(
+        create_zenoh_config(ZenohSessionConfig(multicast_scouting=False))
+    )
+    try:
+        left = ZenohTransmitter(prefix="left", per_field=False, session=session)
+        right = ZenohTransmitter(prefix="right", per_field=False, session=session)
+        left.publish_connection(True)
+        right.publish_connection(False)
+
+        assert get_texts(session, "left/robot/connection") == ["connected"]
+        assert get_texts(session, "right/robot/connection") == ["disconnected"]
+
+        left.close()
+
+        assert not session.is_closed()
+        assert get_texts(session, "left/robot/connection") == []
+        assert get_texts(session, "right/robot/connection") == ["disconnected"]
+        right.close()
+    finally:
+        session.close()  # type: ignore
+
+
+def test_serves_history() -> None:
+    session = zenoh.open(
+        create_zenoh_config(ZenohSessionConfig(multicast_scouting=False))
+    )
+    try:
+        transmitter = ZenohTransmitter(
+            prefix="hist", per_field=False, session=session, history=StateHistory(16)
+        )
+        for i in range(20):
+            transmitter.publish(RobotStateSnapshot(reserved=i))
+
+        replies = list(
+            session.get("hist/robot/history?last=3;fields=reserved", timeout=1.0)
+        )
+        assert replies[0].ok is not None
+        columns = unpack_history(replies[0].ok.payload.to_bytes())
+        assert list(columns) == ["timestamp", "reserved"]
+        assert list(columns["reserved"]) == [17, 18, 19]
+
+        replies = list(session.get("hist/robot/history?last=x", timeout=1.0))
+        assert replies[0].err is not None
+        transmitter.close()
+    finally:
+        session.close()  # type: ignore
+
+
+def test_non_finite_force_vector_is_counted_invalid() -> None:
+    session = zenoh.open(
+        create_zenoh_config(ZenohSessionConfig(multicast_scouting=False))
+    )
+    try:
+        transmitter = ZenohTransmitter(prefix="nan", per_field=False, session=session)
+        session.put(
+            "nan/lidar/force_vector",
+            FORCE_VECTOR.pack(math.nan, 0.0),
+            encoding=STRUCT_ENCODING,
+        )
+        deadline = monotonic() + 1.0
+        while transmitter.force_vector.received_samples == 0 and monotonic() < deadline:
+            transmitter.subscribe()
+
+        assert transmitter.force_vector.invalid_samples == 1
+        assert transmitter.subscribe() == RobotCommand()
+        transmitter.close()
+    finally:
+        session.close()  # type: ignore
+
+
+def test_devices_share_force_vector_input() -> None:
+    session = zenoh.open(
+        create_zenoh_config(ZenohSessionConfig(multicast_scouting=False))
+    )
+    try:
+        transmitters = [
+            ZenohTransmitter(
+                prefix=f"app/{name}",
+                input_prefix="app",
+                per_field=False,
+                session=session,
+            )
+            for name in ("left", "right")
+        ]
+        session.put(
+            "app/lidar/force_vector",
+            FORCE_VECTOR.pack(3.0, 0.5),
+            encoding=STRUCT_ENCODING,
+        )
+        for transmitter in transmitters:
+            deadline = monotonic() + 1.0
+            while transmitter.subscribe().force_linear == 0 and monotonic() < deadline:
+                pass
+            assert transmitter.robot_command.force_linear == 3
+            assert transmitter.robot_command.force_angular == 5
+            transmitter.close()
+    finally:
+        session.close()  # type: ignore
+
+
+def test_request_resends_cached_state_only() -> None:
+    session = zenoh.open(
+        create_zenoh_config(ZenohSessionConfig(multicast_scouting=False))
+    )
+    try:
+        history = StateHistory(16)
+        transmitter = ZenohTransmitter(
+            prefix="req", per_field=True, session=session, history=history
+        )
+        for i in range(3):
+            transmitter.publish(RobotStateSnapshot(reserved=i))
+        received: list[tuple[RobotStateSnapshot, int, float]] = []
+        fields: list[str] = []
+        subscribers = [
+            session.declare_subscriber(
+                "req/robot/state",
+                lambda s: received.append(unpack_state(s.payload.to_bytes())),
+            ),
+            session.declare_subscriber(
+                "req/robot/state/reserved",
+                lambda s: fields.append(s.payload.to_string()),
+            ),
+        ]
+
+        session.put("req/robot/state/request", "")
+        deadline = monotonic() + 1.0
+        while not (received and fields) and monotonic() < deadline:
+            sleep(0.001)
+
+        assert [(state.reserved, seq) for state, seq, _ in received] == [(2, 3)]
+        # 配信し直しても、状態を受け取った時刻のまま送る
+        timestamp = history.select(last=1)["timestamp"][0]
+        assert received[0][2] == timestamp
+        replies = [
+            unpack_state(reply.ok.payload.to_bytes())
+            for reply in session.get("req/robot/state", timeout=1.0)
+            if reply.ok is not None
+        ]
+        assert [stamp for _, _, stamp in replies] == [timestamp]
+        assert fields == ["2"]
+        assert transmitter.state_seq == 3
+        assert len(history) == 3
+        for subscriber in subscribers:
+            subscriber.undeclare()  # type: ignore[no-untyped-call]
+        transmitter.close()
+    finally:
+        session.close()  # type: ignore
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pytest
+from conftest import wait_until
+
+from uart_bridge.domain.messages import RobotCommand, RobotStateId
+from uart_bridge.infra.codec import CodecName, create_codec
+from uart_bridge.infra.serial_robot_driver import SerialRobotDriver
+from uart_bridge.tools.mcu_emulator import McuEmulator
+
+
+@pytest.mark.parametrize("codec", ["csv", "binary"])
+def test_driver_talks_to_emulator(codec: CodecName) -> None:
+    with (
+        McuEmulator(codec=codec, rate_hz=500) as emulator,
+        SerialRobotDriver(emulator.port, codec=create_codec(codec)) as driver,
+    ):
+        assert wait_until(lambda: driver.state_version >= 10)
+        assert driver.get_robot_state().state_id == RobotStateId.NORMAL
+
+        driver.set_send_values(RobotCommand(target_x=1, target_y=2))
+        assert wait_until(lambda: emulator.last_command.target_x == 1)
+
+    assert emulator.invalid_commands == 0
+    assert driver.corrupt_frames == 0
+
+
+def test_garbage_is_counted_as_corrupt() -> None:
+    with (
+        McuEmulator(rate_hz=500, garbage_rate=1.0, seed=0) as emulator,
+        SerialRobotDriver(emulator.port) as driver,
+    ):
+        assert wait_until(lambda: driver.corrupt_frames >= 10)
+        assert driver.state_version > 0
+
+
+def test_reconnect_after_disconnect(tmp_path: Path) -> None:
+    link = tmp_path / "uart"
+
+    with (
+        McuEmulator(
+            rate_hz=500,
+            disconnect_interval=0.2,
+            disconnect_duration=0.1,
+            link=str(link),
+        ) as emulator,
+        SerialRobotDriver(str(link)) as driver,
+    ):
+        assert wait_until(lambda: emulator.disconnects >= 1)
+        version = driver.state_version
+        assert wait_until(lambda: driver.state_version > version + 10)
+
+    assert not link.exists()
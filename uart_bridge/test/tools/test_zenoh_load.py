@@ -0,0 +1,87 @@
+import time
+from collections.abc import Iterator
+
+import pytest
+import zenoh
+
+from uart_bridge.domain.config import ZenohSessionConfig
+from uart_bridge.infra.stats import BridgeStats
+from uart_bridge.infra.zenoh_session import create_zenoh_config
+from uart_bridge.infra.zenoh_transmitter import ZenohTransmitter
+from uart_bridge.tools.zenoh_load import (
+    LoadProfile,
+    TrafficModel,
+    ZenohLoadGenerator,
+    bridge_counter_deltas,
+)
+
+
+@pytest.fixture
+def session() -> Iterator[zenoh.Session]:
+    session = zenoh.open(
+        create_zenoh_config(ZenohSessionConfig(multicast_scouting=False))
+    )
+    yield session
+    session.close()  # type: ignore
+
+
+def test_traffic_model_stays_in_range() -> None:
+    model = TrafficModel(seed=0)
+    lost = 0
+    for i in range(2000):
+        t = i * 0.01
+        d = model.damagepanel(t)
+        assert 0 <= d.target_x <= 1280 and 0 <= d.target_y <= 720
+        lost += d.target_distance == 0
+        state = model.state(i, t)
+        assert 0 <= state.reloaded_left_disks <= 10
+        assert 0 <= state.reloaded_right_disks <= 10
+    assert 0 < lost < 2000
+
+
+@pytest.mark.parametrize("encoding", ["json", "msgpack", "struct"])
+def test_feeds_transmitter_at_the_requested_rate(
+    session: zenoh.Session, encoding: str
+) -> None:
+    stats = BridgeStats()
+    transmitter = ZenohTransmitter(
+        prefix="load", per_field=False, session=session, stats=stats
+    )
+    generator = ZenohLoadGenerator(
+        profile=LoadProfile(damagepanel_hz=200, force_vector_hz=100, state_hz=100),
+        encoding=encoding,  # type: ignore[arg-type]
+        state_per_field=True,
+        watch=["robot/state/pitch_deg"],
+        prefix="load",
+        session=session,
+        seed=0,
+    )
+    before = generator.query_bridge_counters()
+    assert before is not None
+    with generator:
+        # uart_bridge のメインループと同じく、届いた入力を取り込む
+        deadline = time.monotonic() + 0.5
+        while time.monotonic() < deadline:
+            transmitter.subscribe()
+            time.sleep(0.001)
+    time.sleep(0.05)
+    transmitter.subscribe()
+
+    result = generator.summary()
+    streams = result["streams"]
+    assert set(streams) == {"damagepanel", "force_vector", "state"}
+    assert streams["damagepanel"]["key"] == "damagepanel"
+    assert streams["force_vector"]["key"] == "load/lidar/force_vector"
+    for stream in streams.values():
+        assert stream["sent_hz"] == pytest.approx(stream["target_hz"], rel=0.2)
+        assert stream["lost"] == 0
+    watched = result["watch"]["load/robot/state/pitch_deg"]
+    assert watched["received"] == streams["state"]["sent"]
+
+    after = generator.query_bridge_counters()
+    assert after is not None
+    deltas = bridge_counter_deltas(before, after, result["elapsed_s"])
+    assert 0 < deltas["damagepanel"]["received"] <= streams["damagepanel"]["sent"]
+    assert deltas["damagepanel"]["invalid"] == 0
+    assert deltas["force_vector"]["invalid"] == 0
+    transmitter.close()